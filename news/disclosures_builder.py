@@ -4,7 +4,10 @@ from __future__ import annotations
 import hashlib
 import json
 import ast
+import sqlite3
+from contextlib import closing
 from dataclasses import dataclass
+from functools import lru_cache
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -15,8 +18,14 @@ import logging
 
 import argparse
 import re
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选加速依赖，缺失时回退到标准库json
+    orjson = None  # type: ignore
+
 
 import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -24,10 +33,12 @@ sys.path.insert(0, project_root)
 
 from utlity import SymbolInfo, get_stock_data_dir, parse_symbol
 from configs.stock_pool import TRACKED_A_STOCKS
-from openai import OpenAI
+import httpx
+from openai import DefaultHttpxClient, OpenAI
 from shared_data_access.cache_registry import CacheKind, build_cache_dir
 from shared_data_access.data_access import SharedDataAccess
-from news.gemini_utility import basic_convert
+from news.gemini_utility import basic_convert, get_converter_process_pool
+from news import llm_cache, semantic_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -45,6 +56,42 @@ LOGGER.propagate = False
 _CLIENTS_CACHE: Dict[str, OpenAI] = {}
 _CLIENT_LOCK = threading.Lock()
 
+
+def _env_positive_int(name: str, default: int) -> int:
+    """读取正整数环境变量，未设置或无法解析时回退到默认值。"""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        LOGGER.warning("环境变量 %s=%r 不是整数，使用默认值 %d", name, raw, default)
+        return default
+
+
+# 同时在途的模型请求上限（按服务商限流调整，环境变量 LLM_MAX_CONCURRENCY）；
+# 模型客户端的HTTP连接池按同一上限设置，在途请求都能复用keep-alive连接
+_LLM_MAX_CONCURRENCY = _env_positive_int("LLM_MAX_CONCURRENCY", 16)
+_LLM_SEMAPHORE = threading.BoundedSemaphore(_LLM_MAX_CONCURRENCY)
+# 每个线程一个 requests.Session（Session 本身不保证线程安全）
+_HTTP_LOCAL = threading.local()
+# 用途 -> (API KEY 环境变量, BASE URL 环境变量)
+_CLIENT_ENV_VARS: Dict[str, Tuple[str, str]] = {
+    "extraction": ("EXTRACTION_MODEL_API_KEY", "EXTRACTION_MODEL_BASE_URL"),
+    "audit": ("AUDIT_MODEL_API_KEY", "AUDIT_MODEL_BASE_URL"),
+}
+
+# 索引库（按路径）：常驻连接、该连接上次读取时的 data_version、已落盘内容的内存镜像；
+# save_index_merge 据此只写入有变化的行，其他进程写入后 data_version 变化即重新加载
+_INDEX_CACHE: Dict[Path, Tuple[sqlite3.Connection, int, Dict[str, Any]]] = {}
+_INDEX_LOCK = threading.Lock()
+# news.items.jsonl 追加与合并共用的写锁
+_NEWS_WRITE_LOCK = threading.Lock()
+
+# PDF转Markdown的独立进程数：版面/OCR推理持有GIL，放到子进程中以免阻塞模型调用线程。
+# 每个子进程各自加载一份marker模型（CPU上约数GB内存，GPU上各占一份显存），调大前先确认内存余量
+_PDF_POOL_WORKERS = 2
+
 # =================模型与配置=================
 # 支持直接上传PDF进行分析的模型列表
 SUPPORTED_DIRECT_PDF_MODELS = ["qwen-doc-turbo", "qwen-long"]
@@ -111,6 +158,26 @@ NORMAL_ANNOUNCEMENT_PROMPT = """
 5.  整体必须可被 `json.loads` 直接解析，严禁结果结尾额外加个逗号、额外空行、换行符或多余文本，这样会导致json.loads解析不了
 """
 
+# 单条公告Markdown的截断长度（根据模型上下文调整），批量与逐条摘要一致
+SUMMARY_MAX_LENGTH = 50000
+# 批量摘要：每次调用合并的公告条数上限，以及合并后Markdown总字符数上限
+BATCH_SUMMARY_SIZE = 5
+BATCH_MAX_TOTAL_CHARS = 100000
+
+BATCH_ANNOUNCEMENT_PROMPT = """
+本次输入是同一家公司的多条公告，格式为JSON数组，每个元素包含 index、title、markdown 三个字段。
+请对每一条公告分别按上述要求提取字段，输出格式以本条说明为准：
+1.  整个回复只能是一个JSON对象：{"results": [ {...}, {...} ]}，不得附带任何其他文字。
+2.  results 中每个元素包含上述5个字段，并额外包含与输入一致的 "index" 字段；元素个数与输入相同，顺序一致。
+"""
+
+# 语义近似缓存命中时使用的改写 Prompt（配合 news.semantic_cache）
+SEMANTIC_REWRITE_PROMPT = """
+下面给出一份结构高度相似的历史公告的已提取JSON，以及一份新公告的Markdown内容。
+请保持JSON的字段与结构完全不变，仅根据新公告更新其中的日期、金额、比例、数量、人名、公司名和标题等事实；
+新公告中不存在的信息必须删除，不得沿用旧值。整个回复只能是更新后的JSON对象，不要输出任何其他文字。
+"""
+
 AUDIT_AND_REFINE_PROMPT = """
 你是一位**拥有联网能力的华尔街资深法务会计师**和**尽职调查(Due Diligence)专家**。
 你的任务是处理由初级AI提取的上市公司公告，结合**联网搜索**获取的背景信息，为量化回测系统输出一份**极简、高保真、去伪存真**的结构化数据。
@@ -348,7 +415,7 @@ class AnnouncementMeta:
         file_id: 模型云盘fileId（可为空）
         downloaded: 是否已下载PDF
         summarized: 是否已生成摘要并写入news.json
-        summary_json_path: 单条摘要文件路径
+        summary_json_path: 单条摘要文件路径（仅已废弃的 fundamental_research 使用；公告摘要统一写入 news.json）
         category: 公告类别（简单枚举或规则识别）
         is_financial_report: 是否为财报类公告
         dedupe_key: 去重键（如标题+日期哈希）
@@ -375,8 +442,11 @@ class AnnouncementMeta:
     audit_timestamp: Optional[str] = None
 
 
+_SLUG_RE = re.compile(r"\W")
+
+
 def _slugify(text: str) -> str:
-    return "".join(ch if ch.isalnum() else "_" for ch in text).strip("_")[:80]
+    return _SLUG_RE.sub("_", text).strip("_")[:80]
 
 
 def _hash_key(*parts: str) -> str:
@@ -384,15 +454,30 @@ def _hash_key(*parts: str) -> str:
     return h[:16]
 
 
+@lru_cache(maxsize=16384)
+def _meta_key_impl(announcement_id: str, dedupe_key: Optional[str], title: str, date: str) -> str:
+    return announcement_id or dedupe_key or _hash_key(title, date)
+
+
 def _meta_key(meta: AnnouncementMeta) -> str:
-    return meta.announcement_id or meta.dedupe_key or _hash_key(meta.title, meta.date)
+    return _meta_key_impl(meta.announcement_id, meta.dedupe_key, meta.title, meta.date)
 
 
-def _item_key(item: Dict[str, Any]) -> str:
-    key = item.get("announcement_id") or item.get("dedupe_key")
+@lru_cache(maxsize=16384)
+def _item_key_impl(announcement_id: Any, dedupe_key: Any, title: str, datetime_str: str) -> str:
+    key = announcement_id or dedupe_key
     if key:
         return str(key)
-    return _hash_key(str(item.get("title") or ""), str(item.get("datetime") or ""))
+    return _hash_key(title, datetime_str)
+
+
+def _item_key(item: Dict[str, Any]) -> str:
+    return _item_key_impl(
+        item.get("announcement_id"),
+        item.get("dedupe_key"),
+        str(item.get("title") or ""),
+        str(item.get("datetime") or ""),
+    )
 
 
 def _chunk_list(seq: List[Any], size: int):
@@ -401,17 +486,37 @@ def _chunk_list(seq: List[Any], size: int):
         yield seq[i : i + step]
 
 
-def _sort_items_desc(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    def _key(it: Dict[str, Any]) -> datetime:
-        raw = it.get("datetime") or it.get("date")
-        if not raw:
-            return datetime.min
+def _date_sort_key(raw: Any) -> int:
+    """将 YYYY-MM-DD 前缀解析为 YYYYMMDD 整数；补零格式走切片快速路径，其余（如 2024-1-5）回退到 strptime，无法解析时返回0。"""
+    if not raw:
+        return 0
+    text = str(raw)[:10]
+    if len(text) == 10 and text[4] == "-" and text[7] == "-":
         try:
-            return datetime.strptime(str(raw)[:10], "%Y-%m-%d")
-        except Exception:
-            return datetime.min
+            return int(text[:4]) * 10000 + int(text[5:7]) * 100 + int(text[8:10])
+        except ValueError:
+            pass
+    try:
+        parsed = datetime.strptime(str(raw).split(" ", 1)[0], "%Y-%m-%d")
+    except ValueError:
+        return 0
+    return parsed.year * 10000 + parsed.month * 100 + parsed.day
+
 
-    return sorted(items, key=_key, reverse=True)
+# 超过该条数时改用 NumPy argsort 排序
+_VECTOR_SORT_THRESHOLD = 1000
+
+
+def _sort_items_desc(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _key(it: Dict[str, Any]) -> int:
+        return _date_sort_key(it.get("datetime") or it.get("date"))
+
+    if len(items) <= _VECTOR_SORT_THRESHOLD:
+        return sorted(items, key=_key, reverse=True)
+    keys = np.fromiter((_key(it) for it in items), dtype=np.int64, count=len(items))
+    # 对取负后的键做稳定排序，与 sorted(reverse=True) 的同日期相对顺序一致
+    order = np.argsort(-keys, kind="stable")
+    return [items[i] for i in order]
 
 
 def _log(msg: str) -> None:
@@ -449,19 +554,145 @@ def parse_announcement_row(row: Dict[str, Any]) -> Tuple[str, str, str, str, Opt
     return stock_code, title, date, url, announcement_id
 
 
+def _dumps_json_bytes(obj: Any) -> bytes:
+    """序列化为带缩进的UTF-8 JSON字节串，优先使用orjson。"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _dumps_json_line(obj: Any) -> bytes:
+    """序列化为单行UTF-8 JSON字节串（不含换行符），优先使用orjson。"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """先写同目录临时文件再 os.replace，避免进程中断留下截断的JSON。"""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _loads_json_bytes(data: Union[bytes, str]) -> Any:
+    """解析UTF-8 JSON字节串（或字符串），优先使用orjson。"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _index_connect(index_path: Path) -> sqlite3.Connection:
+    """打开索引库（WAL模式，autocommit，可跨线程使用，调用方需持有 _INDEX_LOCK），首次打开时建表。"""
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(index_path), timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, data BLOB NOT NULL)")
+    return conn
+
+
+def _write_index_rows(conn: sqlite3.Connection, rows: Dict[str, Dict[str, Any]], replace_all: bool = False) -> None:
+    """在一个事务内 upsert 索引行；replace_all 时先清空旧数据。"""
+    try:
+        conn.execute("BEGIN")
+        if replace_all:
+            conn.execute("DELETE FROM meta")
+        conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, data) VALUES (?, ?)",
+            [(k, _dumps_json_line(v)) for k, v in rows.items()],
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def _select_index_rows(conn: sqlite3.Connection) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    """
+    摘要: 读取索引库的全部行及读取前的 data_version
+    Args:
+        conn: 索引库连接
+    Returns:
+        (data_version, key -> AnnouncementMeta 字段字典)；无法解析的行跳过
+    """
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    rows: Dict[str, Dict[str, Any]] = {}
+    for key, data in conn.execute("SELECT key, data FROM meta"):
+        try:
+            rows[key] = _loads_json_bytes(data)
+        except Exception:
+            _log(f"索引行无法解析，已跳过: key={key}")
+    return version, rows
+
+
+def _migrate_legacy_index(index_path: Path, conn: sqlite3.Connection) -> None:
+    """新建索引库时，把同目录旧版 index.json 一次性迁移进来；旧文件损坏时按空索引处理。"""
+    legacy_path = index_path.with_suffix(".json")
+    if not legacy_path.exists():
+        return
+    try:
+        legacy = _loads_json_bytes(legacy_path.read_bytes())
+    except Exception:
+        _log(f"旧版索引无法解析，按空索引处理: {legacy_path}")
+        return
+    rows = legacy if isinstance(legacy, dict) else {}
+    _write_index_rows(conn, rows)
+    _log(f"旧版索引已迁移: {legacy_path} -> {index_path}, 条数={len(rows)}")
+
+
+def _index_state(index_path: Path) -> Tuple[sqlite3.Connection, Dict[str, Any]]:
+    """
+    摘要: 返回索引库的常驻连接与已落盘内容的内存镜像（调用方需持有 _INDEX_LOCK）
+    Args:
+        index_path: 索引库路径
+    Returns:
+        (连接, 镜像字典)
+    说明:
+        本连接自身的提交不会改变 data_version；其他连接（包括其他进程）提交后该值变化，
+        此时重新从库中读取，保证镜像不落后于磁盘。
+    """
+    entry = _INDEX_CACHE.get(index_path)
+    if entry is not None:
+        conn, version, payload = entry
+        if index_path.exists():
+            if conn.execute("PRAGMA data_version").fetchone()[0] == version:
+                return conn, payload
+            version, payload = _select_index_rows(conn)
+            _INDEX_CACHE[index_path] = (conn, version, payload)
+            return conn, payload
+        # 索引库被删除（例如缓存清理），丢弃指向旧文件的连接
+        _INDEX_CACHE.pop(index_path, None)
+        conn.close()
+
+    fresh = not index_path.exists()
+    conn = _index_connect(index_path)
+    try:
+        if fresh:
+            _migrate_legacy_index(index_path, conn)
+        version, payload = _select_index_rows(conn)
+    except Exception:
+        conn.close()
+        raise
+    _INDEX_CACHE[index_path] = (conn, version, payload)
+    return conn, payload
+
+
 def load_index(index_path: Path) -> Dict[str, AnnouncementMeta]:
     """
     摘要: 读取公告索引为字典
     Args:
-        index_path: 索引文件路径
+        index_path: 索引库路径
     Returns:
         以announcement_id或dedupe_key为键的字典
     """
-    if not index_path.exists():
-        _log(f"索引不存在，返回空: {index_path}")
-        return {}
     try:
-        raw = json.loads(index_path.read_text(encoding="utf-8"))
+        with _INDEX_LOCK:
+            raw = dict(_index_state(index_path)[1])
+        if not raw:
+            _log(f"索引不存在，返回空: {index_path}")
+            return {}
         out: Dict[str, AnnouncementMeta] = {}
         for key, meta in raw.items():
             out[key] = AnnouncementMeta(**meta)
@@ -472,42 +703,69 @@ def load_index(index_path: Path) -> Dict[str, AnnouncementMeta]:
         return {}
 
 
+def _drop_index_state(index_path: Path) -> None:
+    """丢弃某个索引库的连接与镜像（读写出错后调用，下次访问时重新打开，调用方需持有 _INDEX_LOCK）。"""
+    entry = _INDEX_CACHE.pop(index_path, None)
+    if entry is not None:
+        try:
+            entry[0].close()
+        except Exception:
+            pass
+
+
 def save_index(index_path: Path, items: Dict[str, AnnouncementMeta]) -> None:
     """
-    摘要: 保存公告索引
+    摘要: 保存公告索引（整体替换）
     Args:
-        index_path: 索引文件路径
+        index_path: 索引库路径
         items: 索引字典
     Returns:
         None
     """
-    payload = {k: vars(v) for k, v in items.items()}
-    index_path.parent.mkdir(parents=True, exist_ok=True)
-    index_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    payload = {k: dict(vars(v)) for k, v in items.items()}
+    with _INDEX_LOCK:
+        try:
+            conn, merged = _index_state(index_path)
+        except Exception as exc:
+            _log(f"索引库读取失败，将直接覆盖写入: {index_path}, {exc}")
+            _drop_index_state(index_path)
+            conn, merged = _index_connect(index_path), {}
+            _INDEX_CACHE[index_path] = (conn, conn.execute("PRAGMA data_version").fetchone()[0], merged)
+        _write_index_rows(conn, payload, replace_all=True)
+        merged.clear()
+        merged.update(payload)
     _log(f"索引已保存: {index_path}, 条数={len(items)}")
 
 
 def save_index_merge(index_path: Path, items: Dict[str, AnnouncementMeta]) -> None:
     """
-    摘要: 以追加合并方式保存公告索引（保留旧数据并覆盖同键新数据）
+    摘要: 以追加合并方式保存公告索引（保留旧数据并覆盖同键新数据），只写入相对已落盘内容有变化的行
     Args:
-        index_path: 索引文件路径
+        index_path: 索引库路径
         items: 当前内存中的索引字典
     Returns:
         None
     """
-    existing: Dict[str, Any] = {}
-    if index_path.exists():
+    with _INDEX_LOCK:
         try:
-            existing = json.loads(index_path.read_text(encoding="utf-8"))
-        except Exception:
-            existing = {}
-    merged: Dict[str, Any] = dict(existing)
-    for k, v in items.items():
-        merged[k] = vars(v)
-    index_path.parent.mkdir(parents=True, exist_ok=True)
-    index_path.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
-    _log(f"索引已合并保存: {index_path}, 旧条数={len(existing)}, 新条数={len(items)}, 合并后={len(merged)}")
+            conn, merged = _index_state(index_path)
+        except Exception as exc:
+            # 与旧版读取损坏 index.json 时一致：按空索引处理，写入当前全部条目
+            _log(f"索引库读取失败，按空索引合并: {index_path}, {exc}")
+            _drop_index_state(index_path)
+            conn, merged = _index_connect(index_path), {}
+            _INDEX_CACHE[index_path] = (conn, conn.execute("PRAGMA data_version").fetchone()[0], merged)
+        existing_count = len(merged)
+        changed: Dict[str, Dict[str, Any]] = {}
+        for k, v in items.items():
+            row = vars(v)
+            if merged.get(k) != row:
+                changed[k] = dict(row)
+        if changed:
+            _write_index_rows(conn, changed)
+            merged.update(changed)
+        merged_count = len(merged)
+    _log(f"索引已合并保存: {index_path}, 旧条数={existing_count}, 变更={len(changed)}, 合并后={merged_count}")
 
 
 def disclosures_cache_dir(symbol_info: SymbolInfo) -> Path:
@@ -523,7 +781,56 @@ def md_dir(symbol_info: SymbolInfo) -> Path:
 
 
 def index_path(symbol_info: SymbolInfo) -> Path:
-    return disclosures_cache_dir(symbol_info) / "index.json"
+    return disclosures_cache_dir(symbol_info) / "index.db"
+
+
+def pdf_url_cache_path(symbol_info: SymbolInfo) -> Path:
+    return disclosures_cache_dir(symbol_info) / "pdf_url_cache.sqlite"
+
+
+def _lookup_cached_pdf_url(cache_path: Optional[Path], announcement_id: str) -> Optional[str]:
+    """读取已解析的公告PDF直链，未命中或读取失败返回None。"""
+    if cache_path is None or not announcement_id or not cache_path.exists():
+        return None
+    try:
+        with closing(sqlite3.connect(str(cache_path), timeout=10)) as conn:
+            row = conn.execute(
+                "SELECT file_url FROM pdf_urls WHERE announcement_id = ?", (announcement_id,)
+            ).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error as exc:
+        _log(f"读取PDF直链缓存失败: {cache_path}, 错误: {exc}")
+        return None
+
+
+def _store_cached_pdf_url(cache_path: Optional[Path], announcement_id: str, file_url: str) -> None:
+    """记录公告PDF直链（cninfo直链稳定，不设过期时间）。"""
+    if cache_path is None or not announcement_id or not file_url:
+        return
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # closing 负责关闭连接，内层 with conn 负责提交事务
+        with closing(sqlite3.connect(str(cache_path), timeout=10)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pdf_urls (announcement_id TEXT PRIMARY KEY, file_url TEXT NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO pdf_urls (announcement_id, file_url) VALUES (?, ?)",
+                (announcement_id, file_url),
+            )
+    except sqlite3.Error as exc:
+        _log(f"写入PDF直链缓存失败: {cache_path}, 错误: {exc}")
+
+
+def _drop_cached_pdf_url(cache_path: Optional[Path], announcement_id: str) -> None:
+    """删除失效的公告PDF直链缓存。"""
+    if cache_path is None or not announcement_id or not cache_path.exists():
+        return
+    try:
+        with closing(sqlite3.connect(str(cache_path), timeout=10)) as conn, conn:
+            conn.execute("DELETE FROM pdf_urls WHERE announcement_id = ?", (announcement_id,))
+    except sqlite3.Error as exc:
+        _log(f"删除PDF直链缓存失败: {cache_path}, 错误: {exc}")
 
 
 def news_json_path(symbol_info: SymbolInfo) -> Path:
@@ -531,16 +838,32 @@ def news_json_path(symbol_info: SymbolInfo) -> Path:
     return root / "news" / "news.json"
 
 
-def download_pdf(url: str, out_path: Path) -> bool:
+def news_items_jsonl_path(symbol_info: SymbolInfo) -> Path:
+    """增量新闻项的追加日志，compact_news_json 时合并进 news.json。"""
+    return news_json_path(symbol_info).with_name("news.items.jsonl")
+
+
+def _http_session() -> Any:
+    """返回当前线程复用的 requests.Session，使巨潮接口与PDF下载共享keep-alive连接池。"""
+    session = getattr(_HTTP_LOCAL, "session", None)
+    if session is None:
+        import requests
+
+        session = requests.Session()
+        _HTTP_LOCAL.session = session
+    return session
+
+
+def download_pdf(url: str, out_path: Path, url_cache_path: Optional[Path] = None) -> bool:
     """
     摘要: 下载公告PDF，优先通过公告详情接口获取真实直链，必要时回退到静态路径规则。
     Args:
         url: 公告详情URL
         out_path: PDF输出路径
+        url_cache_path: 可选的PDF直链缓存库路径；命中时跳过公告详情接口请求
     Returns:
         是否下载成功
     """
-    import requests
     from urllib.parse import parse_qs, unquote, urlparse
 
     user_agent = (
@@ -562,6 +885,7 @@ def download_pdf(url: str, out_path: Path) -> bool:
         "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
         "Connection": "keep-alive",
     }
+    session = _http_session()
     out_path.parent.mkdir(parents=True, exist_ok=True)
     _log(f"尝试下载PDF: {url} -> {out_path}")
 
@@ -570,12 +894,12 @@ def download_pdf(url: str, out_path: Path) -> bool:
             return False
         _log(f"尝试PDF直链: {pdf_url}")
         try:
-            resp = requests.get(pdf_url, headers=download_headers, timeout=60, stream=True)
-            resp.raise_for_status()
-            with open(out_path, "wb") as f:
-                for chunk in resp.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            with session.get(pdf_url, headers=download_headers, timeout=60, stream=True) as resp:
+                resp.raise_for_status()
+                with open(out_path, "wb") as f:
+                    for chunk in resp.iter_content(chunk_size=8192):
+                        if chunk:
+                            f.write(chunk)
             ok = out_path.exists() and out_path.stat().st_size > 0
             _log(f"PDF下载{'成功' if ok else '失败'}: {pdf_url}")
             return ok
@@ -596,6 +920,15 @@ def download_pdf(url: str, out_path: Path) -> bool:
     announcement_time = _extract_param("announcementTime")
     plate = _extract_param("plate").lower()
 
+    cached_url = _lookup_cached_pdf_url(url_cache_path, announcement_id)
+    if cached_url:
+        _log(f"命中PDF直链缓存: announcement_id={announcement_id}")
+        if _save_from_url(cached_url):
+            return True
+        # 缓存的直链已失效：删除后重新走公告详情接口解析
+        _log(f"缓存的PDF直链下载失败，重新解析: announcement_id={announcement_id}")
+        _drop_cached_pdf_url(url_cache_path, announcement_id)
+
     if announcement_id and announcement_time:
         detail_api = "https://www.cninfo.com.cn/new/announcement/bulletin_detail"
         detail_params = {
@@ -604,9 +937,12 @@ def download_pdf(url: str, out_path: Path) -> bool:
             "announceTime": announcement_time,
         }
         try:
-            resp = requests.post(detail_api, params=detail_params, headers=api_headers, timeout=20)
+            resp = session.post(detail_api, params=detail_params, headers=api_headers, timeout=20)
             resp.raise_for_status()
-            payload = resp.json()
+            # 直接解析原始字节，跳过 resp.json() 的编码探测，只取两个URL字段
+            payload = _loads_json_bytes(resp.content)
+            if not isinstance(payload, dict):
+                payload = {}
             file_url = payload.get("fileUrl")
             if not file_url:
                 announcement = payload.get("announcement") or {}
@@ -614,6 +950,8 @@ def download_pdf(url: str, out_path: Path) -> bool:
                 if adjunct_url:
                     base = "https://static.cninfo.com.cn/"
                     file_url = base.rstrip("/") + "/" + adjunct_url.lstrip("/")
+            if file_url:
+                _store_cached_pdf_url(url_cache_path, announcement_id, file_url)
             if file_url and _save_from_url(file_url):
                 return True
             _log("公告详情接口未返回有效PDF地址，尝试静态路径")
@@ -638,25 +976,35 @@ def download_pdf(url: str, out_path: Path) -> bool:
     return False
 
 
+# 关键词列表编译为单个交替正则，一次扫描即可判断是否命中任一关键词
+_FINAL_REPORT_RE = re.compile("|".join(map(re.escape, FINAL_REPORT_KEYS)))
+_BLACKLIST_RE = re.compile("|".join(map(re.escape, BLACKLIST)))
+
+
+@lru_cache(maxsize=16384)
 def is_financial_report(title: str) -> bool:
-    return any(k in title for k in FINAL_REPORT_KEYS)
+    return _FINAL_REPORT_RE.search(title) is not None
+
 
+# 每个分支是锚定在开头的前瞻，按书写顺序尝试，保持“合同 > 诉讼 > 股东大会 > 回购”的优先级
+_CATEGORY_RE = re.compile(
+    r"^(?:(?=.*?(?P<Contract>合同))"
+    r"|(?=.*?(?P<Litigation>诉讼))"
+    r"|(?=.*?(?P<Governance>股东大会))"
+    r"|(?=.*?(?P<Capital>回购)))",
+    re.DOTALL,
+)
 
+
+@lru_cache(maxsize=16384)
 def simple_category(title: str) -> str:
     if is_financial_report(title):
         return "Financial"
-    keys = {
-        "合同": "Contract",
-        "诉讼": "Litigation",
-        "股东大会": "Governance",
-        "回购": "Capital",
-    }
-    for k, v in keys.items():
-        if k in title:
-            return v
-    return "Others"
+    m = _CATEGORY_RE.search(title)
+    return m.lastgroup if m else "Others"
 
 
+@lru_cache(maxsize=16384)
 def should_skip_announcement(title: str) -> bool:
     """
     摘要: 判断公告是否为低价值/冗余，进行过滤
@@ -665,7 +1013,7 @@ def should_skip_announcement(title: str) -> bool:
     Returns:
         是否应跳过该公告
     """
-    return any(k in title for k in BLACKLIST)
+    return _BLACKLIST_RE.search(title) is not None
 
 
 def _get_openai_client(purpose: str, model_name_for_logging: str) -> OpenAI:
@@ -682,21 +1030,21 @@ def _get_openai_client(purpose: str, model_name_for_logging: str) -> OpenAI:
         ValueError: 如果相关的环境变量未在.env文件中设置。
     """
     client_key = purpose
-    
+    # 双重检查：客户端构建完成后的热路径无需加锁
+    cached = _CLIENTS_CACHE.get(client_key)
+    if cached is not None:
+        return cached
+
     with _CLIENT_LOCK:
         if client_key in _CLIENTS_CACHE:
             return _CLIENTS_CACHE[client_key]
 
-        if purpose == "audit":
-            api_key_env = "AUDIT_MODEL_API_KEY"
-            base_url_env = "AUDIT_MODEL_BASE_URL"
-        elif purpose == "extraction":
-            api_key_env = "EXTRACTION_MODEL_API_KEY"
-            base_url_env = "EXTRACTION_MODEL_BASE_URL"
-        else:
+        env_names = _CLIENT_ENV_VARS.get(purpose)
+        if env_names is None:
             error_message = f"内部错误: 调用客户端时提供了未知的用途: {purpose}"
             _log(error_message)
             raise ValueError(error_message)
+        api_key_env, base_url_env = env_names
 
         api_key = os.getenv(api_key_env)
         base_url = os.getenv(base_url_env)
@@ -711,12 +1059,45 @@ def _get_openai_client(purpose: str, model_name_for_logging: str) -> OpenAI:
             _log(error_message)
             raise ValueError(error_message)
         
-        client = OpenAI(api_key=api_key, base_url=base_url)
+        client = OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=_LLM_MAX_CONCURRENCY,
+                    max_keepalive_connections=_LLM_MAX_CONCURRENCY,
+                )
+            ),
+        )
         _CLIENTS_CACHE[client_key] = client
         _log(f"为 {purpose} ({model_name_for_logging}) 的OpenAI兼容客户端已初始化 (base_url: {base_url})")
         return client
 
 
+def _preconnect_clients() -> None:
+    """
+    摘要: 导入时为已配置环境变量的用途预先构建客户端，避免并发任务首次调用时集中争抢锁
+    Returns:
+        None
+    """
+    for purpose, (api_key_env, base_url_env) in _CLIENT_ENV_VARS.items():
+        if not (os.getenv(api_key_env) and os.getenv(base_url_env)):
+            continue
+        try:
+            _get_openai_client(purpose, "preconnect")
+        except Exception as exc:
+            _log(f"预构建 {purpose} 客户端失败，将在首次调用时重试: {exc}")
+
+
+_preconnect_clients()
+
+
+def _chat_completion(client: OpenAI, **kwargs: Any) -> Any:
+    """在全局并发上限内调用 chat.completions.create，避免高并发时触发服务商限流。"""
+    with _LLM_SEMAPHORE:
+        return client.chat.completions.create(**kwargs)
+
+
 def upload_file_to_dashscope(file_path: Path) -> Optional[str]:
     """
     摘要: 上传本地文件到百炼并返回 file_id
@@ -763,6 +1144,8 @@ def _build_financial_prompt(stock_name: str, symbol: str, meta: AnnouncementMeta
 JSON_DECODER = json.JSONDecoder()
 _BACKTICK_KEY_PATTERN = re.compile(r"`([^`]+)`")
 _BROKEN_KEY_PATTERN = re.compile(r'"([^"\n]+):')
+# ```json/``` 围栏块（非贪婪，线性扫描）；{...} / [...] 片段用 find/rfind 切取，不走正则回溯
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```", re.IGNORECASE)
 
 
 def _normalize_json_like(snippet: str) -> str:
@@ -829,7 +1212,7 @@ def _parse_json_response_text(text: str) -> Optional[Union[Dict[str, Any], List[
 
         for candidate in candidates:
             try:
-                return json.loads(candidate)
+                return _loads_json_bytes(candidate)
             except Exception:
                 pass
             try:
@@ -848,37 +1231,45 @@ def _parse_json_response_text(text: str) -> Optional[Union[Dict[str, Any], List[
     if parsed is not None:
         return parsed
 
-    fence_patterns = [
-        (r"```json\s*([\s\S]*?)```", re.IGNORECASE),
-        (r"```\s*([\s\S]*?)```", 0),
-    ]
-    for pattern, flags in fence_patterns:
-        for match in re.finditer(pattern, t, flags):
-            parsed = _attempt(match.group(1))
-            if parsed is not None:
-                return parsed
-
-    first_brace_idx = next((i for i, ch in enumerate(t) if ch in "{["), -1)
-    if first_brace_idx != -1:
-        parsed = _attempt(t[first_brace_idx:])
-        if parsed is not None:
-            return parsed
-
-    list_match = re.search(r"(\[[\s\S]*?\])", t)
-    if list_match:
-        parsed = _attempt(list_match.group(1))
+    # 各候选独立尝试：围栏块 → 第一个'{'到最后一个'}' → 第一个'['到最后一个']'
+    for match in _JSON_FENCE_RE.finditer(t):
+        parsed = _attempt(match.group(1))
         if parsed is not None:
             return parsed
 
-    obj_match = re.search(r"(\{[\s\S]*\})", t)
-    if obj_match:
-        parsed = _attempt(obj_match.group(1))
-        if parsed is not None:
-            return parsed
+    for open_ch, close_ch in (("{", "}"), ("[", "]")):
+        start = t.find(open_ch)
+        end = t.rfind(close_ch)
+        if start != -1 and end > start:
+            parsed = _attempt(t[start : end + 1])
+            if parsed is not None:
+                return parsed
 
     return None
 
 
+def _summary_item_from_data(meta: AnnouncementMeta, data: Dict[str, Any]) -> Dict[str, Any]:
+    """将模型返回的结构化字段整理为 news.json 中的新闻项。"""
+    raw_facts = str(data.get("raw_facts") or data.get("summary") or meta.title).strip()
+    category = data.get("category") or "Others"
+    quantitative_data = data.get("quantitative_data")
+    if not isinstance(quantitative_data, dict):
+        quantitative_data = {}
+    timestamp = data.get("timestamp") or data.get("date") or meta.date
+    title = data.get("title") or meta.title
+    return {
+        "announcement_id": meta.announcement_id or meta.dedupe_key,
+        "dedupe_key": meta.dedupe_key,
+        "title": title,
+        "datetime": timestamp,
+        "summary": raw_facts,
+        "raw_facts": raw_facts,
+        "category": category,
+        "quantitative_data": quantitative_data,
+        "source": "公告",
+    }
+
+
 def qwen_doc_summarize_with_fileid(stock_name: str, symbol: str, meta: AnnouncementMeta) -> Optional[Dict[str, Any]]:
     """
     摘要: 使用 Qwen-Doc-Turbo 基于 file_id 生成公告结构化摘要
@@ -896,7 +1287,8 @@ def qwen_doc_summarize_with_fileid(stock_name: str, symbol: str, meta: Announcem
     prompt = NORMAL_ANNOUNCEMENT_PROMPT
     try:
         _log(f"调用Qwen摘要: stock_name={stock_name}, file_id={meta.file_id}, title={meta.title[:40]}")
-        completion = client.chat.completions.create(
+        completion = _chat_completion(
+            client,
             model="qwen-doc-turbo",
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -909,24 +1301,7 @@ def qwen_doc_summarize_with_fileid(stock_name: str, symbol: str, meta: Announcem
         if not isinstance(data, dict):
             raise RuntimeError(f"Qwen摘要返回无法解析为字典: {content}")
         _log("Qwen摘要解析成功，返回结构化字段")
-        raw_facts = (data.get("raw_facts") or data.get("summary") or meta.title).strip()
-        category = data.get("category") or "Others"
-        quantitative_data = data.get("quantitative_data")
-        if not isinstance(quantitative_data, dict):
-            quantitative_data = {}
-        timestamp = data.get("timestamp") or data.get("date") or meta.date
-        title = data.get("title") or meta.title
-        return {
-            "announcement_id": meta.announcement_id or meta.dedupe_key,
-            "dedupe_key": meta.dedupe_key,
-            "title": title,
-            "datetime": timestamp,
-            "summary": raw_facts,
-            "raw_facts": raw_facts,
-            "category": category,
-            "quantitative_data": quantitative_data,
-            "source": "公告",
-        }
+        return _summary_item_from_data(meta, data)
     except Exception as exc:
         _log("调用Qwen摘要异常")
         if isinstance(exc, RuntimeError):
@@ -949,7 +1324,7 @@ def convert_pdf_to_markdown(pdf_path: Path, md_path: Path) -> Optional[str]:
 
     _log(f"开始将PDF转换为Markdown: {pdf_path}")
     try:
-        markdown_content = basic_convert(str(pdf_path), output_dir=str(md_path.parent))
+        markdown_content = get_converter_process_pool(_PDF_POOL_WORKERS).submit(basic_convert, str(pdf_path), str(md_path.parent)).result()
         if markdown_content:
             if md_path.exists() and md_path.stat().st_size == 0:
                 md_path.write_text(markdown_content, encoding="utf-8")
@@ -962,6 +1337,54 @@ def convert_pdf_to_markdown(pdf_path: Path, md_path: Path) -> Optional[str]:
         return None
 
 
+def _semantic_rewrite_summary(
+    client: OpenAI, symbol: str, meta: AnnouncementMeta, truncated_content: str
+) -> Tuple[Optional[np.ndarray], Optional[str]]:
+    """
+    摘要: 语义近似缓存（DISCLOSURE_SEMANTIC_CACHE=1 时启用），命中时用廉价模型改写缓存摘要
+    Args:
+        client: OpenAI兼容客户端
+        symbol: 股票代码
+        meta: 公告元数据
+        truncated_content: 截断后的公告Markdown
+    Returns:
+        (查询向量, 改写后的模型输出)；未启用或向量计算失败时向量为None，未命中或改写失败时输出为None
+    """
+    if not semantic_cache.is_enabled():
+        return None, None
+    try:
+        # 向量接口与对话接口共用全局并发上限
+        with _LLM_SEMAPHORE:
+            vector = semantic_cache.embed_text(client, truncated_content)
+    except Exception as exc:
+        _log(f"计算公告向量失败，跳过语义缓存: {exc}")
+        return None, None
+    hit = semantic_cache.get_semantic_cache().lookup(symbol, vector)
+    if hit is None:
+        return vector, None
+    score, cached_item = hit
+    _log(f"命中语义近似缓存(相似度={score:.3f})，使用{semantic_cache.REWRITE_MODEL}改写: title={meta.title[:40]}")
+    try:
+        completion = _chat_completion(
+            client,
+            model=semantic_cache.REWRITE_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": SEMANTIC_REWRITE_PROMPT},
+                {"role": "user", "content": f"历史公告JSON:\n{json.dumps(cached_item, ensure_ascii=False)}"},
+                {"role": "user", "content": f"新公告的Markdown内容:\n\n{truncated_content}"},
+            ],
+        )
+        content = completion.choices[0].message.content
+    except Exception as exc:
+        _log(f"语义缓存改写调用失败，回退到完整摘要: {exc}")
+        return vector, None
+    if not isinstance(_parse_json_response_text(content), dict):
+        _log("语义缓存改写结果无法解析，回退到完整摘要")
+        return vector, None
+    return vector, content
+
+
 def qwen_summarize_with_markdown(stock_name: str, symbol: str, meta: AnnouncementMeta, markdown_content: str, model: str) -> Optional[Dict[str, Any]]:
     """
     摘要: 使用Qwen模型基于Markdown文本生成公告结构化摘要
@@ -981,42 +1404,38 @@ def qwen_summarize_with_markdown(stock_name: str, symbol: str, meta: Announcemen
 
     prompt = NORMAL_ANNOUNCEMENT_PROMPT
     # 为了避免超长，对markdown内容进行截断
-    max_length = 50000  # 根据模型上下文调整
-    truncated_content = markdown_content[:max_length]
+    truncated_content = markdown_content[:SUMMARY_MAX_LENGTH]
 
     try:
-        _log(f"调用模型({model})基于Markdown进行摘要: title={meta.title[:40]}")
-        completion = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": f"这是公告的Markdown内容:\n\n{truncated_content}\n\n请根据以上内容完成任务。"},
-                {"role": "user", "content": prompt},
-            ],
-        )
-        content = completion.choices[0].message.content
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"这是公告的Markdown内容:\n\n{truncated_content}\n\n请根据以上内容完成任务。"},
+            {"role": "user", "content": prompt},
+        ]
+        cache_key = llm_cache.make_key(model, messages)
+        content = llm_cache.get(cache_key)
+        from_cache = content is not None
+        vector: Optional[np.ndarray] = None
+        rewritten = False
+        if from_cache:
+            _log(f"命中模型响应缓存: title={meta.title[:40]}")
+        else:
+            vector, content = _semantic_rewrite_summary(client, symbol, meta, truncated_content)
+            rewritten = content is not None
+            if not rewritten:
+                _log(f"调用模型({model})基于Markdown进行摘要: title={meta.title[:40]}")
+                completion = _chat_completion(client, model=model, messages=messages)
+                content = completion.choices[0].message.content
         data = _parse_json_response_text(content)
         if not isinstance(data, dict):
             raise RuntimeError(f"模型({model})返回无法解析为字典: {content}")
+        # 语义改写只是近似结果，不能写入长文档模型的精确缓存键
+        if not from_cache and not rewritten:
+            llm_cache.put(cache_key, content)
+        if vector is not None and not rewritten:
+            semantic_cache.get_semantic_cache().insert(symbol, vector, data)
         _log("模型摘要解析成功，返回结构化字段")
-        raw_facts = (data.get("raw_facts") or data.get("summary") or meta.title).strip()
-        category = data.get("category") or "Others"
-        quantitative_data = data.get("quantitative_data")
-        if not isinstance(quantitative_data, dict):
-            quantitative_data = {}
-        timestamp = data.get("timestamp") or data.get("date") or meta.date
-        title = data.get("title") or meta.title
-        return {
-            "announcement_id": meta.announcement_id or meta.dedupe_key,
-            "dedupe_key": meta.dedupe_key,
-            "title": title,
-            "datetime": timestamp,
-            "summary": raw_facts,
-            "raw_facts": raw_facts,
-            "category": category,
-            "quantitative_data": quantitative_data,
-            "source": "公告",
-        }
+        return _summary_item_from_data(meta, data)
     except Exception as exc:
         _log(f"调用模型({model})摘要异常")
         if isinstance(exc, RuntimeError):
@@ -1024,46 +1443,217 @@ def qwen_summarize_with_markdown(stock_name: str, symbol: str, meta: Announcemen
         return None
 
 
+def qwen_summarize_batch_with_markdown(
+    stock_name: str,
+    symbol: str,
+    batch: List[Tuple[AnnouncementMeta, str]],
+    model: str,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    摘要: 将多条公告的Markdown合并到一次模型调用中生成结构化摘要，命中语义近似缓存的条目先行改写，解析失败的条目回退到逐条摘要
+    Args:
+        stock_name (str): 股票名称
+        symbol (str): 股票代码
+        batch (List[Tuple[AnnouncementMeta, str]]): (公告元数据, Markdown内容) 列表
+        model (str): 使用的AI模型
+    Returns:
+        与输入一一对应的新闻项列表；无法生成的条目为 None
+    """
+    if len(batch) == 1:
+        meta, markdown_content = batch[0]
+        return [qwen_summarize_with_markdown(stock_name, symbol, meta, markdown_content, model)]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+    client = _get_openai_client("extraction", model)
+    if client is None:
+        _log("无法调用批量摘要：客户端未初始化")
+        return results
+
+    # 先逐条查语义近似缓存，命中的条目不进入合并调用
+    vectors: Dict[int, np.ndarray] = {}
+    pending: List[int] = []
+    for i, (meta, markdown_content) in enumerate(batch):
+        vector, rewritten = _semantic_rewrite_summary(client, symbol, meta, markdown_content[:SUMMARY_MAX_LENGTH])
+        if rewritten is not None:
+            results[i] = _summary_item_from_data(meta, _parse_json_response_text(rewritten))
+            continue
+        if vector is not None:
+            vectors[i] = vector
+        pending.append(i)
+    if not pending:
+        return results
+
+    payload = [
+        {"index": pos, "title": batch[i][0].title, "markdown": batch[i][1][:SUMMARY_MAX_LENGTH]}
+        for pos, i in enumerate(pending)
+    ]
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": NORMAL_ANNOUNCEMENT_PROMPT},
+        {"role": "user", "content": BATCH_ANNOUNCEMENT_PROMPT},
+        {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+    ]
+    try:
+        cache_key = llm_cache.make_key(model, messages)
+        content = llm_cache.get(cache_key)
+        from_cache = content is not None
+        if not from_cache:
+            _log(f"调用模型({model})批量摘要: {len(pending)} 条公告")
+            completion = _chat_completion(client, model=model, messages=messages)
+            content = completion.choices[0].message.content
+        parsed = _parse_json_response_text(content)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("results")
+        if isinstance(parsed, list):
+            for pos, data in enumerate(parsed):
+                if not isinstance(data, dict):
+                    continue
+                idx = data.get("index", pos)
+                if not (isinstance(idx, int) and 0 <= idx < len(pending)):
+                    continue
+                i = pending[idx]
+                if results[i] is None:
+                    results[i] = _summary_item_from_data(batch[i][0], data)
+                    if i in vectors:
+                        semantic_cache.get_semantic_cache().insert(symbol, vectors[i], data)
+            if not from_cache and all(results[i] is not None for i in pending):
+                llm_cache.put(cache_key, content)
+        else:
+            _log(f"批量摘要返回无法解析，回退到逐条摘要: {content}")
+    except Exception as exc:
+        _log(f"批量摘要调用异常，回退到逐条摘要: {exc}")
+
+    for i, (meta, markdown_content) in enumerate(batch):
+        if results[i] is None:
+            results[i] = qwen_summarize_with_markdown(stock_name, symbol, meta, markdown_content, model)
+    return results
+
+
 def write_news_json(symbol_info: SymbolInfo, items: List[Dict[str, Any]]) -> None:
     """
-    摘要: 追加写入 news/news.json（保留已存在内容并追加新项）
+    摘要: 追加写入 news/news.items.jsonl（每条新闻一行，不重写 news.json）
     Args:
-        stock_name: 股票名称
-        symbol: 股票代码
+        symbol_info: 股票信息对象
         items: 新增的新闻项列表（仅追加，不覆盖已有项）
     Returns:
         None
     """
-    target = news_json_path(symbol_info)
-    target.parent.mkdir(parents=True, exist_ok=True)
     if not items:
         _log("无新增新闻项，跳过写入")
         return
-    existing: Dict[str, Any] = {}
-    if target.exists():
-        try:
-            existing = json.loads(target.read_text(encoding="utf-8"))
-        except Exception:
-            existing = {}
-    prev_items = list(existing.get("news_items", []))
-    merged_raw = prev_items + items
-    seen = set()
-    merged: List[Dict[str, Any]] = []
-    for it in merged_raw:
-        key = _item_key(it)
-        if key in seen:
-            continue
-        seen.add(key)
-        merged.append(it)
-    merged = _sort_items_desc(merged)
-    _log(f"写入news.json: {target}, 旧条数={len(prev_items)}, 新增={len(items)}, 合并后={len(merged)}")
-    payload = {
-        "stock": existing.get("stock") or f"{symbol_info.stock_name} ({symbol_info.symbol})",
-        "today": datetime.now().strftime("%Y-%m-%d"),
-        "news_items": merged,
-        "diagnostics": existing.get("diagnostics", []),
-    }
-    target.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    target = news_items_jsonl_path(symbol_info)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    lines = b"".join(_dumps_json_line(it) + b"\n" for it in items)
+    with _NEWS_WRITE_LOCK:
+        with open(target, "ab") as f:
+            f.write(lines)
+    _log(f"追加新闻项: {target}, 新增={len(items)}")
+
+
+def compact_news_json(symbol_info: SymbolInfo) -> None:
+    """
+    摘要: 将 news.items.jsonl 中的增量新闻项合并进 news.json（去重、按日期倒序），完成后删除追加日志
+    Args:
+        symbol_info: 股票信息对象
+    Returns:
+        None
+    """
+    sidecar = news_items_jsonl_path(symbol_info)
+    target = news_json_path(symbol_info)
+    with _NEWS_WRITE_LOCK:
+        if not sidecar.exists():
+            return
+        items: List[Dict[str, Any]] = []
+        with open(sidecar, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    items.append(_loads_json_bytes(line))
+                except ValueError:
+                    # 进程中断可能留下半行，忽略即可
+                    _log(f"跳过损坏的新闻项行: {line[:80]!r}")
+        existing: Dict[str, Any] = {}
+        if target.exists():
+            try:
+                existing = _loads_json_bytes(target.read_bytes())
+            except Exception:
+                existing = {}
+        prev_items = list(existing.get("news_items", []))
+        seen = set()
+        merged: List[Dict[str, Any]] = []
+        for it in prev_items + items:
+            key = _item_key(it)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(it)
+        merged = _sort_items_desc(merged)
+        _log(f"合并news.json: {target}, 旧条数={len(prev_items)}, 新增={len(items)}, 合并后={len(merged)}")
+        payload = {
+            "stock": existing.get("stock") or f"{symbol_info.stock_name} ({symbol_info.symbol})",
+            "today": datetime.now().strftime("%Y-%m-%d"),
+            "news_items": merged,
+            "diagnostics": existing.get("diagnostics", []),
+        }
+        _atomic_write_bytes(target, _dumps_json_bytes(payload))
+        sidecar.unlink()
+
+
+def _prefilter_disclosures(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    摘要: 在逐行处理前用向量化字符串匹配剔除黑名单与财报公告
+    Args:
+        df: akshare 公告列表
+    Returns:
+        过滤后的公告列表（逐行流程中的同名判断仍会兜底）
+    """
+    title_col = next((c for c in ("公告标题", "title") if c in df.columns), None)
+    if title_col is None or df.empty:
+        return df
+    titles = df[title_col].fillna("").astype(str)
+    drop = titles.str.contains(_BLACKLIST_RE, na=False) | titles.str.contains(_FINAL_REPORT_RE, na=False)
+    dropped = int(drop.sum())
+    if dropped:
+        _log(f"预过滤黑名单/财报公告: {dropped} 条，剩余 {len(df) - dropped} 条")
+    return df.loc[~drop]
+
+
+# 单只股票内并发下载PDF的线程数（每线程复用各自的HTTP会话）
+_PDF_DOWNLOAD_WORKERS = 8
+
+
+def _prefetch_pdfs(symbol_info: SymbolInfo, targets: List[Tuple[AnnouncementMeta, Path]]) -> None:
+    """
+    摘要: 并发下载一批公告PDF，成功后回写 meta.pdf_path / meta.downloaded
+    Args:
+        symbol_info: 股票信息对象
+        targets: (公告元数据, PDF输出路径) 列表
+    Returns:
+        None
+    """
+    if not targets:
+        return
+    url_cache = pdf_url_cache_path(symbol_info)
+    _log(f"并发预下载PDF: {len(targets)} 个")
+    workers = min(_PDF_DOWNLOAD_WORKERS, len(targets))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(download_pdf, meta.url, out, url_cache_path=url_cache): (meta, out)
+            for meta, out in targets
+        }
+        for future in concurrent.futures.as_completed(futures):
+            meta, out = futures[future]
+            try:
+                ok = future.result()
+            except Exception as exc:
+                _log(f"PDF下载异常: {meta.url}, 错误: {exc}")
+                continue
+            if ok:
+                meta.pdf_path = str(out)
+                meta.downloaded = True
+                _log(f"PDF下载完成: {out}")
 
 
 def update_disclosures_for_stock(
@@ -1099,13 +1689,44 @@ def update_disclosures_for_stock(
     if disclosure_bundle is None or disclosure_bundle.frame.empty:
         _log("公告列表为空，返回")
         return 0
-    df = disclosure_bundle.frame
+    df = _prefilter_disclosures(disclosure_bundle.frame)
 
     items: List[Dict[str, Any]] = []
     batch_items: List[Dict[str, Any]] = []
     processed_since_flush = 0
-    for _, row in df.iterrows():
-        row_dict = row.to_dict()
+    # 等待合并摘要的 (key, meta, markdown)
+    pending_markdown: List[Tuple[str, AnnouncementMeta, str]] = []
+
+    def _record_summary(key: str, meta: AnnouncementMeta, summary_item: Dict[str, Any]) -> None:
+        nonlocal batch_items, processed_since_flush
+        items.append(summary_item)
+        batch_items.append(summary_item)
+        meta.summarized = True
+        idx[key] = meta
+        processed_since_flush += 1
+        if processed_since_flush >= 5:
+            save_index_merge(idx_path, idx)
+            write_news_json(symbol_info, batch_items)
+            _log(f"批次落盘：已处理5条，索引与news已保存")
+            batch_items = []
+            processed_since_flush = 0
+
+    def _summarize_pending() -> None:
+        if not pending_markdown:
+            return
+        results = qwen_summarize_batch_with_markdown(
+            stock_name, symbol, [(meta, md) for _, meta, md in pending_markdown], model
+        )
+        for (key, meta, _), summary_item in zip(pending_markdown, results):
+            if summary_item is None:
+                _log(f"无法为公告 {meta.announcement_id} 生成摘要，跳过")
+                continue
+            _record_summary(key, meta, summary_item)
+        pending_markdown.clear()
+
+    # 第一遍：过滤并建立待处理计划 (key, meta, stock_code, title, date)
+    plan: List[Tuple[str, AnnouncementMeta, str, str, str]] = []
+    for row_dict in df.to_dict(orient="records"):
         stock_code, title, date, url, ann_id = parse_announcement_row(row_dict)
         _log(f"处理公告: {date} {title[:40]}... ann_id={ann_id}")
         if should_skip_announcement(title):
@@ -1134,16 +1755,20 @@ def update_disclosures_for_stock(
                 dedupe_key=key,
             )
             _log(f"加入索引: key={key}")
+        plan.append((key, meta, stock_code, title, date))
 
-        if not meta.downloaded:
-            file_name = f"{date}__{stock_code}__{meta.announcement_id}__{_slugify(title)}.pdf"
-            out = pdfs_dir(symbol_info) / file_name
-            ok = download_pdf(url, out)
-            if ok:
-                meta.pdf_path = str(out)
-                meta.downloaded = True
-                _log(f"PDF下载完成: {out}")
+    # 第二遍：并发预下载所有缺失的PDF
+    _prefetch_pdfs(
+        symbol_info,
+        [
+            (meta, pdfs_dir(symbol_info) / f"{date}__{stock_code}__{meta.announcement_id}__{_slugify(title)}.pdf")
+            for _, meta, stock_code, title, date in plan
+            if not meta.downloaded
+        ],
+    )
 
+    # 第三遍：转换与摘要
+    for key, meta, stock_code, title, date in plan:
         if not meta.summarized and meta.downloaded:
             summary_item = None
             use_direct_pdf = model in SUPPORTED_DIRECT_PDF_MODELS
@@ -1158,38 +1783,40 @@ def update_disclosures_for_stock(
                 if meta.file_id:
                     summary_item = qwen_doc_summarize_with_fileid(stock_name, symbol, meta)
             else:
-                # PDF -> Markdown -> LLM 流程
+                # PDF -> Markdown，攒够一批后合并调用模型
                 md_file_name = f"{date}__{stock_code}__{meta.announcement_id}__{_slugify(title)}.md"
                 md_path_obj = md_dir(symbol_info) / md_file_name
                 markdown_content = convert_pdf_to_markdown(Path(meta.pdf_path), md_path_obj)
                 if markdown_content:
                     meta.md_path = str(md_path_obj)
-                    summary_item = qwen_summarize_with_markdown(stock_name, symbol, meta, markdown_content, model)
+                    idx[key] = meta
+                    # 按截断后的总字符数控制批次大小，避免单次调用输入过长
+                    item_chars = min(len(markdown_content), SUMMARY_MAX_LENGTH)
+                    pending_chars = sum(min(len(md), SUMMARY_MAX_LENGTH) for _, _, md in pending_markdown)
+                    if pending_markdown and pending_chars + item_chars > BATCH_MAX_TOTAL_CHARS:
+                        _summarize_pending()
+                    pending_markdown.append((key, meta, markdown_content))
+                    if len(pending_markdown) >= BATCH_SUMMARY_SIZE:
+                        _summarize_pending()
+                    continue
 
             if summary_item is None:
                 _log(f"无法为公告 {meta.announcement_id} 生成摘要，跳过")
                 continue
 
-            if summary_item is not None:
-                items.append(summary_item)
-                batch_items.append(summary_item)
-                meta.summarized = True
-                processed_since_flush += 1
-                if processed_since_flush >= 5:
-                    idx[key] = meta
-                    save_index_merge(idx_path, idx)
-                    write_news_json(symbol_info, batch_items)
-                    _log(f"批次落盘：已处理5条，索引与news已保存")
-                    batch_items = []
-                    processed_since_flush = 0
+            _record_summary(key, meta, summary_item)
         idx[key] = meta
 
+    _summarize_pending()
     if batch_items:
         save_index_merge(idx_path, idx)
         write_news_json(symbol_info, batch_items)
         _log(f"末批次落盘：剩余{len(batch_items)}条已保存")
     else:
         save_index_merge(idx_path, idx)
+    compact_news_json(symbol_info)
+    if semantic_cache.is_enabled():
+        semantic_cache.get_semantic_cache().flush()
     if not items:
         _log("本次无新增项，跳过写入news.json")
         return 0
@@ -1197,6 +1824,36 @@ def update_disclosures_for_stock(
     return len(items)
 
 
+# 批量流程中同时处理的股票数：单只股票内部已并发下载PDF，模型调用另受 _LLM_SEMAPHORE 限制，
+# 股票级并发再多只会让线程排队等待同一批资源
+_STOCK_CONCURRENCY = 8
+
+
+def _run_for_all_stocks(tracked: List[SymbolInfo], func: Any, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+    """
+    摘要: 在有界线程池中对每只股票执行同步流程
+    Args:
+        tracked: SymbolInfo 列表
+        func: 单股流程，首个参数为 SymbolInfo
+        *args, **kwargs: 透传给 func 的其余参数
+    Returns:
+        股票代码 -> 返回值或抛出的异常
+    """
+    out: Dict[str, Any] = {}
+    if not tracked:
+        return out
+    workers = max(1, min(_STOCK_CONCURRENCY, len(tracked)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        future_to_stock = {executor.submit(func, info, *args, **kwargs): info for info in tracked}
+        for future in concurrent.futures.as_completed(future_to_stock):
+            stock_symbol = future_to_stock[future].symbol
+            try:
+                out[stock_symbol] = future.result()
+            except Exception as exc:
+                out[stock_symbol] = exc
+    return out
+
+
 def update_all_tracked_stocks(tracked: List[SymbolInfo], model: str, lookback_days: int = 365) -> Dict[str, int]:
     """
     摘要: 批量更新股票公告新闻（并发版）
@@ -1209,31 +1866,43 @@ def update_all_tracked_stocks(tracked: List[SymbolInfo], model: str, lookback_da
     """
     _log(f"开始批量并发更新 {len(tracked)} 只股票")
     out: Dict[str, int] = {}
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-        future_to_stock = {
-            executor.submit(
-                update_disclosures_for_stock,
-                symbol_info,
-                model=model,
-                lookback_days=lookback_days,
-            ): symbol_info for symbol_info in tracked
-        }
-        
-        for future in concurrent.futures.as_completed(future_to_stock):
-            stock_info = future_to_stock[future]
-            stock_symbol = stock_info.symbol
-            try:
-                cnt = future.result()
-                out[stock_symbol] = cnt
-                _log(f"批量更新完成: {stock_info.stock_name}({stock_symbol}) 新增={cnt}")
-            except Exception as exc:
-                _log(f"股票 {stock_symbol} 在并发更新中产生异常: {exc}")
-                out[stock_symbol] = -1  # 标记为失败
+    results = _run_for_all_stocks(tracked, update_disclosures_for_stock, lookback_days=lookback_days, model=model)
+    for stock_info in tracked:
+        stock_symbol = stock_info.symbol
+        result = results.get(stock_symbol)
+        if isinstance(result, BaseException):
+            _log(f"股票 {stock_symbol} 在并发更新中产生异常: {result}")
+            out[stock_symbol] = -1  # 标记为失败
+            continue
+        out[stock_symbol] = result
+        _log(f"批量更新完成: {stock_info.stock_name}({stock_symbol}) 新增={result}")
 
     return out
 
 
+def audit_all_tracked_stocks(tracked: List[SymbolInfo], audit_model: str) -> None:
+    """
+    摘要: 批量并发审计股票的 news.json
+    Args:
+        tracked: SymbolInfo 列表
+        audit_model: 审计模型
+    Returns:
+        None
+    """
+    results = _run_for_all_stocks(tracked, audit_news_json, audit_model)
+    for stock_info in tracked:
+        stock_symbol = stock_info.symbol
+        result = results.get(stock_symbol)
+        if isinstance(result, BaseException):
+            _log(f"股票 {stock_symbol} 在并发审计中产生异常: {result}")
+        else:
+            _log(f"股票 {stock_symbol} 的审计任务完成")
+
+
+def _audited_sort_key(item: Dict[str, Any]) -> Any:
+    return item.get("datetime", "")
+
+
 def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
     """
     摘要: 对 news.json 中新增的公告摘要执行增量审计，只处理尚未审计的记录。
@@ -1241,6 +1910,8 @@ def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
     stock_name = symbol_info.stock_name
     symbol = symbol_info.symbol
     _log(f"开始对 {stock_name}({symbol}) 的news.json进行增量审计，模型: {audit_model}")
+    # 上次更新若中途退出，先把遗留的追加日志合并进 news.json
+    compact_news_json(symbol_info)
     news_path = news_json_path(symbol_info)
     audited_news_path = news_path.with_name("news_audited.json")
     idx_path = index_path(symbol_info)
@@ -1250,8 +1921,7 @@ def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
         _log(f"源新闻文件不存在，跳过审计: {news_path}")
         return
 
-    with open(news_path, "r", encoding="utf-8") as f:
-        src_payload = json.load(f)
+    src_payload = _loads_json_bytes(news_path.read_bytes())
     src_items = list(src_payload.get("news_items") or [])
     if not src_items:
         _log("news.json为空，无需审计")
@@ -1259,24 +1929,26 @@ def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
 
     news_lookup = {_item_key(it): it for it in src_items}
     news_modified = False
+    # (标题, 日期) -> 首个匹配的news项，供旧版摘要对齐时O(1)查找
+    alignment_index: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for item in src_items:
+        align_key = (
+            (item.get("title") or "").strip(),
+            str(item.get("datetime") or item.get("date") or "").split(" ")[0],
+        )
+        alignment_index.setdefault(align_key, item)
 
     def _align_summary_item(meta: AnnouncementMeta) -> Optional[Dict[str, Any]]:
         """根据标题+日期对齐旧news项，并补写缺失字段。"""
-        title = (meta.title or "").strip()
+        item = alignment_index.get(((meta.title or "").strip(), meta.date))
+        if item is None:
+            return None
         ann_id = meta.announcement_id or meta.dedupe_key
-        for item in src_items:
-            item_title = (item.get("title") or "").strip()
-            if item_title != title:
-                continue
-            raw_date = str(item.get("datetime") or item.get("date") or "").split(" ")[0]
-            if raw_date != meta.date:
-                continue
-            if ann_id:
-                item.setdefault("announcement_id", ann_id)
-            if meta.dedupe_key:
-                item.setdefault("dedupe_key", meta.dedupe_key)
-            return item
-        return None
+        if ann_id:
+            item.setdefault("announcement_id", ann_id)
+        if meta.dedupe_key:
+            item.setdefault("dedupe_key", meta.dedupe_key)
+        return item
     pending_meta = [
         meta for meta in idx.values()
         if meta.summarized and not meta.audited
@@ -1303,8 +1975,7 @@ def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
 
     if news_modified:
         src_payload["news_items"] = src_items
-        with open(news_path, "w", encoding="utf-8") as f:
-            json.dump(src_payload, f, ensure_ascii=False, indent=2)
+        _atomic_write_bytes(news_path, _dumps_json_bytes(src_payload))
         _log("已修复 news.json 中缺失 announcement_id 的记录")
 
     client = _get_openai_client("audit", audit_model)
@@ -1317,8 +1988,7 @@ def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
     audited_seen: set[str] = set()
     if audited_news_path.exists():
         try:
-            with open(audited_news_path, "r", encoding="utf-8") as f:
-                audited_payload = json.load(f)
+            audited_payload = _loads_json_bytes(audited_news_path.read_bytes())
             audited_items = list(audited_payload.get("news_items") or [])
             for item in audited_items:
                 audited_seen.add(_item_key(item))
@@ -1327,6 +1997,39 @@ def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
             audited_items = []
             audited_seen = set()
 
+    # 审计结果按批追加到 JSONL，结束时统一合并写回 news_audited.json；上次中断遗留的记录在此恢复
+    audited_sidecar = audited_news_path.with_name("news_audited.items.jsonl")
+    recovered = 0
+    if audited_sidecar.exists():
+        with open(audited_sidecar, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = _loads_json_bytes(line)
+                except ValueError:
+                    continue
+                key = _item_key(item)
+                if key in audited_seen:
+                    continue
+                audited_seen.add(key)
+                audited_items.append(item)
+                recovered += 1
+        _log(f"从审计追加日志恢复 {recovered} 条记录")
+
+    def _write_audited() -> None:
+        audited_items.sort(key=_audited_sort_key, reverse=True)
+        out_payload = {
+            "stock": audited_payload.get("stock") or src_payload.get("stock") or f"{stock_name} ({symbol})",
+            "today": datetime.now().strftime("%Y-%m-%d"),
+            "news_items": audited_items,
+            "diagnostics": audited_payload.get("diagnostics") or src_payload.get("diagnostics") or [],
+        }
+        _atomic_write_bytes(audited_news_path, _dumps_json_bytes(out_payload))
+        if audited_sidecar.exists():
+            audited_sidecar.unlink()
+
     if audited_seen:
         filtered_pairs: List[Tuple[AnnouncementMeta, Dict[str, Any]]] = []
         skipped = 0
@@ -1347,22 +2050,18 @@ def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
     if not pending_pairs:
         if news_modified:
             save_index_merge(idx_path, idx)
+        if recovered:
+            _write_audited()
         _log("无可审计的公告摘要，退出")
         return
 
-    def _flush_audited() -> None:
-        audited_items.sort(key=lambda x: x.get("datetime", ""), reverse=True)
-        out_payload = {
-            "stock": audited_payload.get("stock") or src_payload.get("stock") or f"{stock_name} ({symbol})",
-            "today": datetime.now().strftime("%Y-%m-%d"),
-            "news_items": audited_items,
-            "diagnostics": audited_payload.get("diagnostics") or src_payload.get("diagnostics") or [],
-        }
-        with open(audited_news_path, "w", encoding="utf-8") as f:
-            json.dump(out_payload, f, ensure_ascii=False, indent=2)
+    def _flush_audited(new_items: List[Dict[str, Any]]) -> None:
+        lines = b"".join(_dumps_json_line(it) + b"\n" for it in new_items)
+        with open(audited_sidecar, "ab") as f:
+            f.write(lines)
 
     def _merge_audited(new_items: List[Dict[str, Any]]) -> int:
-        added = 0
+        fresh: List[Dict[str, Any]] = []
         for it in new_items:
             if not isinstance(it, dict):
                 continue
@@ -1370,37 +2069,50 @@ def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
             if key in audited_seen:
                 continue
             audited_seen.add(key)
-            audited_items.append(it)
-            added += 1
+            fresh.append(it)
+        added = len(fresh)
         if added:
-            _flush_audited()
+            audited_items.extend(fresh)
+            _flush_audited(fresh)
             _log(f"审计结果新增 {added} 条")
         return added
 
     total_processed = 0
     batch_size = 7
+    # 审计强制联网搜索，结果随日期变化：缓存键带上运行日期，只在当天重跑时复用
+    run_date = datetime.now().strftime("%Y-%m-%d")
     for batch in _chunk_list(pending_pairs, batch_size):
         payload = [item for _, item in batch]
         result_list: List[Dict[str, Any]] = []
         try:
-            completion = client.chat.completions.create(
-                model=audit_model,
-                messages=[
-                    {"role": "user", "content": AUDIT_AND_REFINE_PROMPT},
-                    {"role": "user", "content": json.dumps(payload, ensure_ascii=False, indent=2)},
-                ],
-                extra_body={
-                        "enable_search": True, 
-                        "search_options": {
-                            "forced_search": True,  # 强制联网搜索
-                            "search_strategy": "max"  # 配置搜索策略为高性能模式
-                        },
-                },
-            )
-            audited_content = completion.choices[0].message.content
+            messages = [
+                {"role": "user", "content": AUDIT_AND_REFINE_PROMPT},
+                {"role": "user", "content": json.dumps(payload, ensure_ascii=False, indent=2)},
+            ]
+            cache_key = llm_cache.make_key(f"{audit_model}@{run_date}", messages)
+            audited_content = llm_cache.get(cache_key)
+            from_cache = audited_content is not None
+            if from_cache:
+                _log("命中审计模型响应缓存")
+            else:
+                completion = _chat_completion(
+                    client,
+                    model=audit_model,
+                    messages=messages,
+                    extra_body={
+                            "enable_search": True, 
+                            "search_options": {
+                                "forced_search": True,  # 强制联网搜索
+                                "search_strategy": "max"  # 配置搜索策略为高性能模式
+                            },
+                    },
+                )
+                audited_content = completion.choices[0].message.content
             parsed = _parse_json_response_text(audited_content)
             if parsed is None:
                 raise RuntimeError(f"审计模型输出无法解析: {audited_content}")
+            if not from_cache:
+                llm_cache.put(cache_key, audited_content)
             if isinstance(parsed, dict):
                 found_list = None
                 for v in parsed.values():
@@ -1427,7 +2139,7 @@ def audit_news_json(symbol_info: SymbolInfo, audit_model: str) -> None:
         _log(f"批次审计完成：处理 {len(batch)} 条公告")
 
     if audited_items:
-        _flush_audited()
+        _write_audited()
     _log(f"审计完成，共处理 {total_processed} 条公告，输出文件: {audited_news_path}")
 
 
@@ -1456,23 +2168,7 @@ def main() -> int:
         
         if args.audit_model:
             _log(f"开始对所有跟踪的股票进行并发审计，使用模型: {args.audit_model}")
-            with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-                future_to_stock = {
-                    executor.submit(
-                        audit_news_json,
-                        info,
-                        args.audit_model
-                    ): info for info in tracked_infos
-                }
-                
-                for future in concurrent.futures.as_completed(future_to_stock):
-                    stock_info = future_to_stock[future]
-                    stock_symbol = stock_info.symbol
-                    try:
-                        future.result()  # 检查是否有异常
-                        _log(f"股票 {stock_symbol} 的审计任务完成")
-                    except Exception as exc:
-                        _log(f"股票 {stock_symbol} 在并发审计中产生异常: {exc}")
+            audit_all_tracked_stocks(tracked_infos, args.audit_model)
             _log("--- 并发审计阶段完成 ---")
         return 0
 
@@ -1,6 +1,11 @@
 # @title Define some helpers (run this cell)
+import atexit
+import concurrent.futures
 import json
+import multiprocessing
 import os
+import queue
+import threading
 import filetype
 import time
 from pathlib import Path
@@ -11,6 +16,40 @@ from marker.models import create_model_dict
 from marker.output import save_output, text_from_rendered
 from marker.config.parser import ConfigParser
 
+# basic_convert 使用的转换器池：多线程调用时最多 CONVERTER_POOL_SIZE 个并发转换，其余排队等待
+CONVERTER_POOL_SIZE = min(4, os.cpu_count() or 1)
+_CONVERTER_POOL = None
+_POOL_LOCK = threading.Lock()
+_MODEL_LOCK = threading.Lock()
+# 进程内共享的 PDF 转换进程池（见 get_converter_process_pool）
+_PROCESS_POOL = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+def _create_model_dict_fast():
+    """
+    加载 marker 模型，默认使用 marker 自身的精度。
+
+    设置环境变量 MARKER_HALF_PRECISION=1 且有 CUDA 时改用半精度（支持则用 bfloat16，否则 float16），
+    推理更快且显存减半，但版面/OCR 结果可能与默认精度略有差异（表格与数字识别尤其要核对），
+    开启前应抽样对比两种精度下的 Markdown 输出。无 GPU 或 marker 版本不支持 dtype 参数时回退到默认加载。
+    """
+    if os.getenv("MARKER_HALF_PRECISION", "").strip() in {"", "0"}:
+        return create_model_dict()
+    try:
+        import torch
+    except ImportError:
+        return create_model_dict()
+    if not torch.cuda.is_available():
+        return create_model_dict()
+    dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    try:
+        model_dict = create_model_dict(device="cuda", dtype=dtype)
+    except TypeError:
+        return create_model_dict()
+    print(f"marker模型以 {dtype} 精度加载到GPU")
+    return model_dict
+
+
 # 创建一个单例模式的PDF转Markdown转换器类
 class PDFMarkdownConverter:
     _instance = None
@@ -40,12 +79,8 @@ class PDFMarkdownConverter:
             print("加载模型...")
             start_time = time.time()
             
-            if not PDFMarkdownConverter._models_loaded:
-                PDFMarkdownConverter._model_dict = create_model_dict()
-                PDFMarkdownConverter._models_loaded = True
-            
             self.converter = PdfConverter(
-                artifact_dict=PDFMarkdownConverter._model_dict,
+                artifact_dict=PDFMarkdownConverter.get_model_dict(),
                 config={"output_format": "markdown"}
             )
             
@@ -53,6 +88,15 @@ class PDFMarkdownConverter:
             print(f"模型加载完成，耗时: {load_time:.2f}秒")
             self.initialized = True
     
+    @classmethod
+    def get_model_dict(cls):
+        """加载一次模型权重，供所有 PdfConverter 共享"""
+        with _MODEL_LOCK:
+            if not cls._models_loaded:
+                cls._model_dict = _create_model_dict_fast()
+                cls._models_loaded = True
+        return cls._model_dict
+
     def _check_models_exist(self, cache_dir):
         """检查必要的模型是否已经存在于缓存目录中"""
         if not os.path.exists(cache_dir):
@@ -92,30 +136,35 @@ class PDFMarkdownConverter:
         Returns:
             str: 转换后的Markdown文本
         """
-        # 执行转换
-        print(f"处理: {file_path}")
-        start_time = time.time()
-        rendered = self.converter(file_path)
-        process_time = time.time() - start_time
-        
-        # 获取文本内容
-        text, metadata, images = text_from_rendered(rendered)
-        
-        # 保存输出
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-            base_filename = Path(file_path).stem
-            output_path = os.path.join(output_dir, f"{base_filename}.md")
-            
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(text)
-            
-            print(f"已保存到: {output_path}")
+        return _render_markdown(self.converter, file_path, output_dir)
+
+
+def _render_markdown(converter, file_path, output_dir=None):
+    """用指定的 PdfConverter 转换PDF，并按需保存Markdown"""
+    # 执行转换
+    print(f"处理: {file_path}")
+    start_time = time.time()
+    rendered = converter(file_path)
+    process_time = time.time() - start_time
+
+    # 获取文本内容
+    text, metadata, images = text_from_rendered(rendered)
+    
+    # 保存输出
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        base_filename = Path(file_path).stem
+        output_path = os.path.join(output_dir, f"{base_filename}.md")
         
-        print(f"处理时间: {process_time:.2f}秒")
-        print(f"文件大小: {len(text)/1024:.2f} KB")
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(text)
         
-        return text
+        print(f"已保存到: {output_path}")
+    
+    print(f"处理时间: {process_time:.2f}秒")
+    print(f"文件大小: {len(text)/1024:.2f} KB")
+    
+    return text
 
 
 def basic_convert(file_path, output_dir=None, use_llm=False):
@@ -127,8 +176,62 @@ def basic_convert(file_path, output_dir=None, use_llm=False):
         output_dir: 输出目录
         use_llm: 是否使用LLM（暂未实现）
     """
-    converter = PDFMarkdownConverter()
-    return converter.convert(file_path, output_dir)
+    pool = _get_converter_pool()
+    converter = pool.get()
+    try:
+        return _render_markdown(converter, file_path, output_dir)
+    finally:
+        pool.put(converter)
+
+
+def _get_converter_pool():
+    """懒加载转换器池：模型权重只加载一次，每个 PdfConverter 持有独立的运行时状态"""
+    global _CONVERTER_POOL
+    if _CONVERTER_POOL is None:
+        with _POOL_LOCK:
+            if _CONVERTER_POOL is None:
+                model_dict = PDFMarkdownConverter.get_model_dict()
+                pool = queue.Queue(maxsize=CONVERTER_POOL_SIZE)
+                for _ in range(CONVERTER_POOL_SIZE):
+                    pool.put(PdfConverter(artifact_dict=model_dict, config={"output_format": "markdown"}))
+                _CONVERTER_POOL = pool
+    return _CONVERTER_POOL
+
+
+def init_converter_process():
+    """进程池 initializer：子进程内只保留一个转换器，并在启动时预加载模型"""
+    global CONVERTER_POOL_SIZE
+    CONVERTER_POOL_SIZE = 1
+    _get_converter_pool()
+
+
+def get_converter_process_pool(max_workers):
+    """
+    懒加载进程内共享的 PDF 转换进程池，子进程启动时各加载一次模型，之后跨调用复用
+
+    使用 spawn 启动子进程：调用方通常已开启多个线程，fork 会把其他线程持有的锁一并复制到子进程。
+    max_workers 只在首次创建时生效；进程退出时经 atexit 关闭，也可调用 shutdown_converter_process_pool 提前释放。
+    """
+    global _PROCESS_POOL
+    if _PROCESS_POOL is None:
+        with _PROCESS_POOL_LOCK:
+            if _PROCESS_POOL is None:
+                _PROCESS_POOL = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_converter_process,
+                )
+    return _PROCESS_POOL
+
+
+@atexit.register
+def shutdown_converter_process_pool():
+    """关闭共享的 PDF 转换进程池，释放子进程中的模型内存"""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        pool, _PROCESS_POOL = _PROCESS_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
 
 
 def show_json(obj):
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+大模型响应的持久化缓存。
+
+以 SHA-256(PROMPT_VERSION + model + messages) 为键，把模型返回的文本写入
+`CacheKind.LLM_RESPONSES` 目录（TTL 由缓存注册表统一管理）。重跑/重试时相同
+输入直接命中缓存，省去重复的模型调用。修改 prompt 时递增 PROMPT_VERSION 即可
+让旧缓存整体失效。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import sys
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utlity import resolve_base_dir
+from shared_data_access.cache_registry import CacheKind, get_cache_spec
+
+PROMPT_VERSION = "v1"
+
+
+def cache_dir() -> Path:
+    """返回缓存根目录（data/llm_cache）。"""
+    return resolve_base_dir() / get_cache_spec(CacheKind.LLM_RESPONSES).subdir
+
+
+def make_key(model: str, messages: List[Dict[str, Any]]) -> str:
+    """
+    摘要: 根据模型与完整 messages 计算缓存键
+    Args:
+        model: 模型名称
+        messages: 传给 chat.completions.create 的消息列表
+    Returns:
+        十六进制 SHA-256 字符串
+    """
+    raw = json.dumps(
+        {"version": PROMPT_VERSION, "model": model, "messages": messages},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return cache_dir() / key[:2] / f"{key}.json"
+
+
+def get(key: str) -> Optional[str]:
+    """
+    摘要: 读取未过期的缓存响应
+    Args:
+        key: make_key 生成的缓存键
+    Returns:
+        缓存的响应文本；未命中、过期或损坏时返回 None
+    """
+    path = _entry_path(key)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    ttl_days = get_cache_spec(CacheKind.LLM_RESPONSES).ttl_days
+    if ttl_days is not None and time.time() - stat.st_mtime > ttl_days * 86400:
+        return None
+    try:
+        content = json.loads(path.read_text(encoding="utf-8")).get("content")
+    except Exception:
+        return None
+    return content if isinstance(content, str) else None
+
+
+def put(key: str, content: str) -> None:
+    """
+    摘要: 原子写入响应文本（先写临时文件再 os.replace）
+    Args:
+        key: make_key 生成的缓存键
+        content: 模型返回的文本
+    Returns:
+        None
+    """
+    path = _entry_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps({"content": content}, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
@@ -8,24 +8,47 @@ Progressive News Summarizer
 
 import io
 import os
+import hashlib
+import random
+import threading
 import sys
 import time
 import json
 import akshare as ak
 import pandas as pd
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from google import genai
 from datetime import datetime, timedelta
 import logging
 import re
+import textwrap
 import urllib.request
 from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from dotenv import load_dotenv
 import argparse
-from google.genai.types import Tool, GenerateContentConfig, GoogleSearch
-from gemini_utility import basic_convert  # 导入PDF转Markdown函数
+from google.genai.types import Tool, GenerateContentConfig, GoogleSearch, FinishReason
+from gemini_utility import basic_convert, get_converter_process_pool  # 导入PDF转Markdown函数
+import llm_cache  # 大模型响应持久化缓存（与公告摘要共用）
+import numpy as np
+import semantic_cache
 from google.genai import errors
 
+try:
+    import pyarrow
+except ImportError:  # pyarrow 为可选依赖，缺失时公告列表缓存回退到CSV
+    pyarrow = None
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:  # lxml 为可选依赖，缺失时使用内置的 html.parser
+    HTML_PARSER = "html.parser"
+
 # 加载.env文件中的环境变量
 load_dotenv()
 
@@ -72,6 +95,8 @@ def setup_logging(stock_code, stock_name, start_date=None, end_date=None):
     # 创建处理器
     file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
     console_handler = logging.StreamHandler(sys.stdout)
+    # 控制台默认只输出WARNING及以上，完整的INFO日志写入文件；交互调试时可通过环境变量调低
+    console_handler.setLevel(os.environ.get("NEWS_CONSOLE_LOG_LEVEL", "WARNING").upper())
     
     # 设置格式
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -102,8 +127,355 @@ elif not is_test_mode:  # 只有在非测试模式下才对API密钥缺失报错
     logger.error("未设置GOOGLE_API_KEY环境变量，请设置后再运行。")
     sys.exit(1)
 
+# 公告PDF并发下载的线程数（同一主机，控制在巨潮可接受的并发内）
+ANNOUNCEMENT_DOWNLOAD_WORKERS = 10
+# 公告PDF大小上限（超过则跳过），以及流式下载的分块大小
+MAX_ANNOUNCEMENT_PDF_BYTES = 3 * 1024 * 1024
+PDF_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# 公告列表缓存格式：优先Parquet（需要pyarrow），否则回退CSV；以及空表标记使用的列
+ANNOUNCEMENT_CACHE_SUFFIX = ".parquet" if pyarrow is not None else ".csv"
+ANNOUNCEMENT_CACHE_COLUMNS = ["代码", "简称", "公告标题", "公告时间", "公告链接"]
+# 巨潮公告详情链接中的公告ID/日期，以及文件名中需要替换的非法字符
+_ANN_ID_RE = re.compile(r"announcementId=(\d+)")
+_ANN_TIME_RE = re.compile(r"announcementTime=(\d{4}-\d{2}-\d{2})")
+_TITLE_SANITIZE_RE = re.compile(r'[\\/:*?"<>|]')
+# 短期总结文件名/正文中的日期范围，以及在正文中查找日期范围的字符数
+_DATE_RANGE_FN_RE = re.compile(r'(\d{8})_(\d{8})')
+_DATE_RANGE_CN_RE = re.compile(r'(\d{4}年\d{1,2}月\d{1,2}日).*?至.*?(\d{4}年\d{1,2}月\d{1,2}日)')
+DATE_RANGE_SCAN_CHARS = 2048
+# 短期总结中每篇公告截取的Markdown字符数（多读1个字符，用于判断是否需要追加截断提示）
+SUMMARY_MARKDOWN_READ_CHARS = 5001
+# 公告专项总结中每篇公告截取的Markdown字符数（同样多读1个字符）
+ANNOUNCEMENT_SUMMARY_READ_CHARS = 50001
+# 拼接公告Markdown时共用的截断提示与分隔符
+_MARKDOWN_TRUNCATION_MARK = "...(内容已截断)"
+_MARKDOWN_SECTION_SEP = "\n\n---\n\n"
+# 短期总结提示词中公告Markdown与新闻内容的字符上限（超出时保留首尾、省略中间）
+MAX_PDF_MARKDOWN_CHARS = 120_000
+MAX_NEWS_CONTENT_CHARS = 120_000
+# PDF转Markdown的并行进程数（整个运行共用一个进程池，每个进程加载一份转换模型，注意内存占用）
+PDF_CONVERT_WORKERS = min(4, os.cpu_count() or 1)
+# Gemini总结调用的最大尝试次数与单次退避上限（秒）
+GEMINI_MAX_RETRIES = 3
+GEMINI_MAX_BACKOFF_SECONDS = 60
+# Gemini总结调用按异常类型决定重试的起始等待秒数：服务端错误、超时、连接断开等暂时性故障等待更长
+_RETRY_BASE_WAIT = {
+    errors.ServerError: 15,
+    httpx.TimeoutException: 15,
+    httpx.ConnectError: 15,
+    httpx.RemoteProtocolError: 15,
+}
+RETRY_BASE_WAIT_DEFAULT = 8
+# 视为Gemini API或网络故障的异常类型（长时期模式遇到时终止程序）
+_GEMINI_NETWORK_ERRORS = (errors.APIError, httpx.TransportError, requests.RequestException)
+# 长时期模式下同时处理的时间段数（受Gemini RPM限制）
+LONG_PERIOD_SEGMENT_WORKERS = 4
+# 批量模式下同时处理的股票数（各股票互不依赖，主要耗时在网络请求；PDF转换仍共用一个进程池）
+BATCH_STOCK_WORKERS = 4
+# 长时期模式下合并为一次调用的相邻时间段：材料总字符数与时间段数上限（受输入窗口与输出长度限制）
+SEGMENT_BATCH_MAX_CHARS = 500_000
+SEGMENT_BATCH_MAX_SEGMENTS = 4
+# 批量总结输出中各时间段的标题行，如"## Segment 20240101-20240331"
+_SEGMENT_HEADER_RE = re.compile(r'^##\s*Segment\s+(\d{8})\s*-\s*(\d{8})\s*$', re.M)
+# 总结语义近似缓存（可选）：同一股票、同一时间段、相同公告内容下，新闻/短期总结文本高度相似时复用已有输出
+PROGRESSIVE_SEMANTIC_CACHE = os.environ.get("PROGRESSIVE_SEMANTIC_CACHE", "").strip().lower() in {"1", "true", "yes"}
+
+
+def _env_similarity_threshold(name, default):
+    """读取 (0, 1] 范围内的相似度阈值环境变量，未设置、无法解析或越界时回退到默认值并告警"""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        value = None
+    if value is None or not 0 < value <= 1:
+        logging.getLogger(__name__).warning("环境变量 %s=%r 不是 (0, 1] 内的数值，使用默认值 %s", name, raw, default)
+        return default
+    return value
+
+
+PROGRESSIVE_SEMANTIC_THRESHOLD = _env_similarity_threshold(
+    "PROGRESSIVE_SEMANTIC_THRESHOLD", semantic_cache.SIMILARITY_THRESHOLD
+)
+GEMINI_EMBEDDING_MODEL = "text-embedding-004"
+# 新闻搜索与各类总结使用的Gemini模型
+GEMINI_MODEL = "gemini-2.5-pro"
+
+# 总结提示词中固定不变的分析要求。放在提示词最前面、可变内容放在后面，
+# 使同类调用共享相同前缀，命中Gemini的隐式提示词前缀缓存
+DATE_RANGE_SUMMARY_INSTRUCTIONS = """你是一位专业的股票分析师，需要对指定公司在指定时间段内的信息进行总结分析。
+
+我将提供这段时间内与该公司相关的公司公告和新闻信息。请详细分析这些信息。
+
+这份总结重点是捕捉这段时间内的关键信息：
+
+1. 公司公告分析：提取公司公告中的关键信息，如财务数据、重大事项、管理层变动、风险提示等；
+2. 新闻舆情分析：总结市场新闻对公司的报道和评价，以及可能对股价产生的影响；
+3. 时间线分析：按时间顺序标注重要事件，突出其对公司发展路径的影响；
+4. 关键指标分析：分析这段时间内关键指标的状况；
+5. 综合评估：基于以上信息，对公司在这段时间内的表现进行全面评估。
+
+请注意：
+- 保持客观，突出这段时间内的关键信息；
+- 提供有据可依的分析，特别关注时间序列上的变化；
+- 突出重点信息和数据，剔除冗余内容；
+- 适当引用原文中的关键数据和观点；
+- 使用专业的金融术语；
+- 详细分析所有文档中的重要数据。
+"""
+
+SHORT_TERM_SUMMARY_INSTRUCTIONS = """你是一位专业的股票分析师，需要对指定公司在最近一段时间内的信息进行短期渐进式总结(Ns,τ)。
+
+我将提供这段时间内与该公司相关的公司公告和新闻信息。请详细分析这些信息。
+
+这份短期总结(Ns,τ)将作为渐进式总结系统的第一步，重点是捕捉这段时间内的关键信息变化：
+
+1. 公司公告分析：提取公司公告中的关键信息，如财务数据、重大事项、管理层变动、风险提示等；
+2. 新闻舆情分析：总结市场新闻对公司的报道和评价，以及可能对股价产生的影响；
+3. 时间线分析：按时间顺序标注重要事件，突出其对公司发展路径的影响；
+4. 短期关键指标变化：对比分析这段时间内关键指标的变化趋势；
+5. 综合评估：基于以上信息，对公司短期表现进行全面评估。
+
+请注意：
+- 保持客观，突出这段时间内的新变化和新信息；
+- 提供有据可依的分析，特别关注时间序列上的变化；
+- 突出重点信息和数据，剔除冗余内容；
+- 适当引用原文中的关键数据和观点；
+- 使用专业的金融术语；
+- 详细分析所有文档中的重要数据。
+"""
+
+FUSION_SUMMARY_INSTRUCTIONS = """你是一位专业的股票分析师，需要将指定公司的两部分信息融合为一份完整的长期历史渐进式总结：
+
+1. 上个月的渐进式总结：包含截至上个月末的历史累积信息
+2. 当前短期总结：包含最近一段时间内的最新信息
+
+请执行以下渐进式融合任务：
+
+1. 时间序列集成：将不同时间段的信息按照时间顺序组织，形成完整的历史时间线
+2. 趋势分析：识别关键指标和事件在整个时间范围内的长期变化趋势和重要转折点
+3. 信息去重与整合：移除重复信息，合并相似内容，用最新信息更新过时内容，也要重点分析一下近期发生的事件的整体影响。除确定判断已过时信息外，要尽量保证事件描述详细完整，不要省略任何细节。
+4. 事件分析：对关键事件进行深度分析，包括事件发生的时间、原因、影响、影响范围、影响程度、影响后果
+5. 历史关联性分析：分析不同时期事件之间的关联和影响
+6. 完整发展轨迹：展现公司从历史信息到近期的完整发展轨迹
+7. 综合评估：基于完整历史信息，对公司的长期表现和投资价值进行全面评估
+"""
+
+# Gemini新闻搜索提示词模板（模块加载时构建一次，调用时只填入股票名称与日期）
+_NEWS_SEARCH_PROMPT_TEMPLATE = textwrap.dedent("""\
+    请帮我搜集并汇总关于{stock_name}在{start}至{end}期间的所有可能影响公司股价的新闻和传闻，严格按以下要求执行：
+
+    【数据来源要求】
+    覆盖以下渠道：主流财经媒体、行业垂直平台、社交媒体（股吧/雪球/微博）、监管文件、公司公告、供应链信源。对于社交媒体传闻，需满足以下条件之一才收录：
+    - 相关话题阅读量＞10万次 
+    - 被5个以上财经领域大V转发
+    - 与近期股价异动时间吻合
+
+    【核心信息维度】
+    按顺序处理以下内容（无结果则跳过该部分）：
+    1. 重大合同/订单变动（需对比合同金额与上季度营收）
+    2. 产品与服务动态（注明是否突破现有技术路线）
+    3. 业务增长与扩张（区分有机增长与并购）
+    4. 治理与人事（高管变动需对比任期剩余时间）
+    5. 法律监管事件（标注处罚金额/整改成本预估）
+    6. 资本运作（如股票发行与回购、大股东套现、大股东变更、信用评级调整等，需关注大股东行为一致性）
+    7. 突发事件（标注是否涉及核心业务）
+    8. 国际制裁/政策（区分直接影响与情绪影响）
+    9. 行业生态变化（技术突破/替代品威胁）
+    10. 政策动态（草案/试点/国际联盟）
+
+    【传闻处理规则】
+    对非官方消息必须：
+    - 添加【待核实】前缀 
+    - 标注传播路径（如：微博→雪球→财经媒体）
+    - 记录最早出现时间与传播峰值时间
+    - 注明："该信息尚未证实，请谨慎参考"
+
+    【财务关联规则】
+    当涉及以下新闻类型时，关联最近季度财报数据：
+    ■ 投资/并购 → 对比现金持有量与投资总额
+    ■ 价格调整 → 注明历史毛利率波动范围
+    ■ 诉讼/处罚 → 计算占净利润比例
+    （具体数值计算由其他模块处理）
+
+    【可信度标注系统】
+    每条信息头部添加：
+    ✅ 官方证实 - 公司/监管正式文件
+    🅰️ 多方印证 - ≥3家权威媒体独立报道
+    🅱️ 单方信源 - 未获公司回应的媒体报道
+    ⚠️ 传闻预警 - 社交平台传播未验证
+
+    【压制信息监测】 
+    重点捕捉：
+    • 突发密集负面后快速删除（记录网页存档链接）
+    • 高管异常离职（任期内+无继任者+未发感谢信）
+    • 供应链异动（多个合作方同时变更信息）
+    • 财报关键模糊表述（对比往期同类表述变化）
+
+    【输出格式】
+    ≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡
+    标题：【可信度图标】标题文本
+    日期：YYYY-MM-DD HH:MM
+    来源：媒体名称/社交平台+传播热度
+    财务关联：可能影响的财报科目/指标
+    摘要：事件核心事实+潜在影响逻辑
+    压制迹象：［若有则填］删除时间/限流范围
+    时间轴标记：［事件阶段］发酵期/消退期/反复期
+    ≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡
+
+    【特别规范】
+    1. 不收录明显诽谤或违法信息
+    2. 同一事件多信源报道需合并处理
+    3. 涉及政策草案需注明立法概率评估
+    4. 每页最多呈现25条关键信息
+    4. 用中文输出，无需解释分析逻辑
+""")
+
+
+# 公告专项总结提示词：公告内容之前的可变开头（只填入股票与时间描述），以及公告内容之后固定不变的分类规则与示例
+_ANNOUNCEMENT_PROMPT_HEAD_TEMPLATE = """
+            下述内容是{stock_name}({stock_code}){time_description}发布公告Markdown内容：
+            
+            ===========================================公告内容开始==========================================
+            """
+ANNOUNCEMENT_SUMMARY_RULES = """
+            ===========================================公告内容结束==========================================
+            
+            请将上述公告内容，按以下规则处理：
+
+            【分类处理规则】
+            1. 常规公告（分红/日常交易）：
+               - 提取：执行日期、金额基准、对比往期变化率
+               - 模板：■ 年度分红预案：每股X元（同比+Y%），股权登记日date
+
+            2. 重大事项公告（并购/诉讼/重组）：
+               - 必须解析：
+                 a. 事项进展阶段（筹划/实施/完成）
+                 b. 对资产负债表的具体影响科目
+                 c. 风险提示中的关键参数（如赔偿上限）
+               - 模板：⚠️ 重大诉讼进展：涉诉金额amount（占Q3净利润ratio%），预计计提负债科目"account"
+
+            3. 财务报告公告：
+               - 联动财报模块分析结果，仅保留：
+                 a. 关键指标超预期幅度（vs 分析师共识预期）
+                 b. 管理层指引变化（用diff算法比对往期表述）
+                 c. 审计意见类型变更
+
+            【输出要求】
+            - 按时间倒序排列
+            - 每条公告添加影响系数标签：
+               🔵 短期操作影响（涉及交易日期） 
+               🟠 中期财务影响（影响未来1-2季报）
+               🔴 长期战略影响（改变业务模式）
+                
+            【示例】
+            🔴 **长期战略影响**
+                *   **公告日期:** 2021-02-02
+                *   **事项:** 子公司xxxIPO申请进展。
+                *   **摘要:** ⚠️ 子公司IPO进展：控股子公司xx首发申请获上海证券交易所科创板上市委员会审议通过（实施阶段）。此举可能影响公司资产结构和估值，但尚需证监会注册，存在不确定性。
+            """
+
+
+@lru_cache(maxsize=1024)
+def _pdf_content_key_cached(pdf_path, size, mtime_ns):
+    h = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+def _pdf_content_key(pdf_path, stat=None):
+    """PDF内容的SHA-256前16位，作为Markdown缓存键（按路径+大小+修改时间记忆，避免重复读取；可传入已有的stat结果）"""
+    if stat is None:
+        stat = os.stat(pdf_path)
+    return _pdf_content_key_cached(str(pdf_path), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _get_genai_client():
+    """
+    进程内共享的Gemini客户端：使用环境变量的API密钥并设置HTTP超时选项。
+    批量处理多只股票、长时期模式处理多个时间段时复用同一连接池，避免每个实例重新建立TLS连接。
+    """
+    return genai.Client(
+        api_key=GOOGLE_API_KEY,
+        http_options={"timeout": 600000}
+    )
+
+
+def _truncate_middle(text, max_chars):
+    """
+    超过 max_chars 时保留前后各一半，中间替换为省略标记。
+
+    返回:
+        (处理后的文本, 省略的字符数)
+    """
+    if len(text) <= max_chars:
+        return text, 0
+    half = max_chars // 2
+    omitted = len(text) - 2 * half
+    return f"{text[:half]}\n\n[...已省略{omitted}字符...]\n\n{text[-half:]}", omitted
+
+
+def _retry_base_wait(exc):
+    """按异常类型（沿MRO查表）返回重试的起始等待秒数；限流(429)按暂时性故障处理"""
+    if isinstance(exc, errors.ClientError) and getattr(exc, "code", None) == 429:
+        return _RETRY_BASE_WAIT[errors.ServerError]
+    for cls in type(exc).__mro__:
+        if cls in _RETRY_BASE_WAIT:
+            return _RETRY_BASE_WAIT[cls]
+    return RETRY_BASE_WAIT_DEFAULT
+
+
+def _text_digest(text):
+    """文本的SHA-256前16位，用于语义缓存的作用域划分"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+_PROGRESSIVE_SEMANTIC_CACHE = None
+_PROGRESSIVE_SEMANTIC_CACHE_LOCK = threading.Lock()
+
+
+def _get_progressive_semantic_cache():
+    """进程内共享的总结语义缓存（与公告摘要的向量维度不同，单独存放在 semantic_progressive 目录）"""
+    global _PROGRESSIVE_SEMANTIC_CACHE
+    if _PROGRESSIVE_SEMANTIC_CACHE is None:
+        with _PROGRESSIVE_SEMANTIC_CACHE_LOCK:
+            if _PROGRESSIVE_SEMANTIC_CACHE is None:
+                _PROGRESSIVE_SEMANTIC_CACHE = semantic_cache.SemanticSummaryCache(
+                    llm_cache.cache_dir() / "semantic_progressive", threshold=PROGRESSIVE_SEMANTIC_THRESHOLD
+                )
+    return _PROGRESSIVE_SEMANTIC_CACHE
+
+
+@lru_cache(maxsize=256)
+def _load_markdown(md_path, mtime_ns, size, max_chars=None):
+    """
+    读取缓存的Markdown；同一进程内重复使用同一文件时直接命中内存（以路径+mtime+大小为键，文件被改写即失效）。
+    指定 max_chars 时只读取文件开头足够解码出 max_chars 个字符的字节（UTF-8每字符至多4字节）。
+    """
+    if max_chars is None:
+        # 一次读取全部字节再整体解码，绕过文本流的分块解码与换行转换
+        return Path(md_path).read_bytes().decode('utf-8')
+    with open(md_path, 'rb') as f:
+        raw = f.read(max_chars * 4)
+    return raw.decode('utf-8', errors='ignore')[:max_chars]
+
+
+class OversizedPDFError(Exception):
+    """公告PDF超过 MAX_ANNOUNCEMENT_PDF_BYTES，下载已中止"""
+
+
 class ProgressiveNewsSummarizer:
     """Progressive News Summarizer类，用于收集和总结股票相关新闻"""
+
+    # 公告标题过滤关键词，编译为单个交替正则，每条标题只扫描一次
+    _SKIP_TITLE_RE = re.compile("|".join(map(re.escape, [
+        "翌日披露报表", "申请表格","申请版本", "聆讯後资料集", "法律意见书", " 核查意见", "股东大会的通知", "股东大会通知"
+    ])))
     
     def __init__(self, stock_code, stock_name, market="A股", days=30, start_date=None, end_date=None):
         """
@@ -121,14 +493,31 @@ class ProgressiveNewsSummarizer:
         self.stock_name = stock_name
         self.market = market
         self.days = days
-        # 使用环境变量的API密钥，并设置HTTP超时选项
-        self.client = genai.Client(
-            api_key=GOOGLE_API_KEY,
-            http_options={"timeout": 600000}
-        )
+        # 使用进程内共享的Gemini客户端（底层连接池在各实例、各次调用间复用）
+        self.client = _get_genai_client()
         
         # 设置日志记录器
         self.logger = setup_logging(stock_code, stock_name, start_date, end_date)
+
+        # 巨潮下载共用一个会话：keep-alive复用TCP/TLS连接；429/5xx由urllib3指数退避重试，并遵循Retry-After
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=ANNOUNCEMENT_DOWNLOAD_WORKERS,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=1.0,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "HEAD"],
+                respect_retry_after_header=True,
+            ),
+        )
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        
+        # 提示词文件仅用于调试，交给后台线程写入，不阻塞随后的API调用
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prompt-io")
+        self._pending_writes = set()
         
         # 创建存储目录
         self.base_dir = Path(f"data/{self.stock_name}_{self.stock_code}")
@@ -138,6 +527,8 @@ class ProgressiveNewsSummarizer:
         self.short_term_summary_dir = self.base_dir / "short_term_summary"
         self.long_term_summary_dir = self.base_dir / "long_term_summary"
         
+        # 已确认存在的目录，避免每次生成总结都重复mkdir
+        self._ensured_dirs = set()
         self._create_directories()
         
         # 设置日期范围
@@ -153,23 +544,68 @@ class ProgressiveNewsSummarizer:
             except ValueError as e:
                 self.logger.error(f"日期格式错误: {e}，将使用默认日期范围")
                 
-        self.start_date_str = self.start_date.strftime("%Y%m%d")
-        self.end_date_str = self.end_date.strftime("%Y%m%d")
+        self._refresh_date_strings()
         
         # 标记是否为指定日期范围模式
         self.is_date_range_mode = bool(start_date and end_date)
         # 标记是否为多短期总结合并模式
         self.is_multiple_summary_mode = False
         
+    def close(self):
+        """等待后台写入完成并释放巨潮下载会话的连接（共享的Gemini客户端在进程内继续复用）"""
+        self._io_pool.shutdown(wait=True)
+        self._http.close()
+
+    def _save_prompt_async(self, path, text, label):
+        """
+        在后台线程中把提示词写入文件，写完后记录日志
+
+        参数:
+            path: 目标文件路径(Path)
+            text: 提示词内容
+            label: 日志中的提示词名称，如"总结提示"
+        """
+        def on_done(future):
+            self._pending_writes.discard(future)
+            error = future.exception()
+            if error is not None:
+                self.logger.error(f"保存{label}失败: {error}")
+            else:
+                self.logger.info(f"{label}已保存到: {path}")
+
+        future = self._io_pool.submit(path.write_text, text, encoding='utf-8')
+        self._pending_writes.add(future)
+        future.add_done_callback(on_done)
+
+    def _wait_pending_writes(self):
+        """等待已提交的提示词文件写入完成"""
+        if self._pending_writes:
+            wait(list(self._pending_writes))
+
+    def _refresh_date_strings(self):
+        """按当前日期范围预先格式化常用的日期字符串（日期范围变化时需重新调用）"""
+        self.start_date_str = self.start_date.strftime("%Y%m%d")
+        self.end_date_str = self.end_date.strftime("%Y%m%d")
+        self._start_cn = self.start_date.strftime("%Y年%m月%d日")
+        self._end_cn = self.end_date.strftime("%Y年%m月%d日")
+        self._month_ym = self.end_date.strftime("%Y%m")
+        self._month_cn = self.end_date.strftime("%Y年%m月")
+
     def _create_directories(self):
         """创建存储目录结构"""
         self.announcement_summary_dir = self.base_dir / "announcement_summary"
         for directory in [self.reports_dir, self.news_dir, self.announcements_dir, 
                           self.short_term_summary_dir, self.long_term_summary_dir, 
                           self.announcement_summary_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(directory)
         self.logger.info(f"为{self.stock_name}({self.stock_code})创建目录结构")
 
+    def _ensure_dir(self, directory):
+        """确保目录存在；同一实例内每个目录只mkdir一次"""
+        if directory not in self._ensured_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(directory)
+
     def collect_stock_research_reports(self):
         """
         收集个股研报 - 该功能已被禁用
@@ -178,10 +614,14 @@ class ProgressiveNewsSummarizer:
         self.logger.info(f"研报功能已被禁用，不再收集研报")
         return []
 
-    def collect_stock_announcements(self):
+    def collect_stock_announcements(self, start_date=None, end_date=None):
         """
         收集股票公告
         使用akshare获取公告列表，并下载对应的PDF文件
+
+        参数:
+            start_date: 开始日期(datetime)，默认使用 self.start_date
+            end_date: 结束日期(datetime)，默认使用 self.end_date
         """
         self.logger.info(f"正在获取{self.stock_name}({self.stock_code})的公告...")
         try:
@@ -196,8 +636,8 @@ class ProgressiveNewsSummarizer:
                 return []
             
             # 使用巨潮资讯接口获取公告
-            start_date = self.start_date.strftime("%Y%m%d")
-            end_date = self.end_date.strftime("%Y%m%d")
+            start_date = (start_date or self.start_date).strftime("%Y%m%d")
+            end_date = (end_date or self.end_date).strftime("%Y%m%d")
             
             # 确保存在chromedriver
             chromedriver_path = "C:\\Windows\\System32\\chromedriver.exe"
@@ -207,17 +647,20 @@ class ProgressiveNewsSummarizer:
             
             # 创建缓存目录
             cache_dir = self.base_dir / "cache" / "announcements"
-            cache_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(cache_dir)
 
-            # 构建缓存文件路径
-            cache_file = cache_dir / f"{self.stock_code}_{start_date}_{end_date}_公告.csv"
+            # 构建缓存文件路径（有pyarrow时用Parquet，兼容读取旧的CSV缓存）
+            cache_stem = f"{self.stock_code}_{start_date}_{end_date}_公告"
+            cache_file = cache_dir / f"{cache_stem}{ANNOUNCEMENT_CACHE_SUFFIX}"
+            if not cache_file.exists() and (cache_dir / f"{cache_stem}.csv").exists():
+                cache_file = cache_dir / f"{cache_stem}.csv"
             
             try:
                 # 检查是否存在缓存文件
                 if cache_file.exists():
                     self.logger.info(f"使用缓存的公告数据: {cache_file}")
                     try:
-                        df = pd.read_csv(cache_file, encoding='utf-8')
+                        df = self._read_announcement_cache(cache_file)
                         if df.empty:
                             self.logger.info(f"缓存文件为空，未找到公告")
                     except Exception as cache_err:
@@ -233,7 +676,7 @@ class ProgressiveNewsSummarizer:
                         
                         # 保存到缓存文件
                         if not df.empty:
-                            df.to_csv(cache_file, encoding='utf-8', index=False)
+                            cache_file = self._write_announcement_cache(df, cache_dir / cache_stem)
                             self.logger.info(f"已将公告数据保存到缓存: {cache_file}")
                 else:
                     # 获取公告数据
@@ -246,111 +689,86 @@ class ProgressiveNewsSummarizer:
                         end_date=end_date
                     )
                     
-                    # 保存到缓存文件
+                    # 保存到缓存文件；无公告时同样写入（空表作为标记，避免下次仍然调用API）
+                    cache_file = self._write_announcement_cache(df, cache_dir / cache_stem)
                     if not df.empty:
-                        df.to_csv(cache_file, encoding='utf-8', index=False)
                         self.logger.info(f"已将公告数据保存到缓存: {cache_file}")
                     else:
-                        # 创建空文件作为标记，避免下次仍然调用API
-                        with open(cache_file, 'w', encoding='utf-8') as f:
-                            f.write("")
                         self.logger.info(f"未找到公告，创建空缓存文件")
                 
                 # 处理查询结果
+                records = []
                 if df.empty:
                     self.logger.info(f"未找到公告")
-                    
-                # 处理每条公告
-                for _, row in df.iterrows():
-                    title = re.sub(r'[\\/:*?"<>|]', '_', row['公告标题'])
-                    
+                else:
+                    # 过滤、标题清洗与日期处理整列完成，循环内只处理已清洗的记录
                     # 过滤与财报相关的公告
-                    # if any(keyword in row['公告标题'] for keyword in [
-                    #     "年度报告", "半年度报告", "季度报告", "财务报告", "财务会计报告",
-                    #     "财务报表", "审计报告", "年报", "半年报", "季报", "财报",
-                    #     "业绩报告", "季度财务","公司资料报表", "翌日披露报表", "申请表格","申请版本", "聆讯後资料集"
-                    # ]):
-                    #     self.logger.info(f"跳过财报相关公告: {row['公告标题']}")
-                    #     continue
+                    titles = df['公告标题'].astype(str)
+                    skip_mask = titles.str.contains(self._SKIP_TITLE_RE, na=False)
+                    for skipped_title in titles[skip_mask]:
+                        self.logger.info("跳过财报相关公告: %s", skipped_title)
+                    kept = df.loc[~skip_mask]
+                    announcement_times = kept['公告时间'].astype(str)
+                    records = zip(
+                        titles[~skip_mask].str.replace(_TITLE_SANITIZE_RE, '_', regex=True),
+                        # 处理日期，移除可能存在的时间部分
+                        announcement_times.str.split(' ').str[0].str.replace('-', '', regex=False),
+                        kept['公告链接'],
+                        announcement_times,
+                    )
 
-                    # 过滤与财报相关的公告
-                    if any(keyword in row['公告标题'] for keyword in [
-                        "翌日披露报表", "申请表格","申请版本", "聆讯後资料集", "法律意见书", " 核查意见", "股东大会的通知", "股东大会通知"
-                    ]):
-                        self.logger.info(f"跳过财报相关公告: {row['公告标题']}")
-                        continue
-                    
-                    # 处理日期，移除可能存在的时间部分
-                    announcement_date = row['公告时间']
-                    if ' ' in announcement_date:  # 检查是否包含时间
-                        announcement_date = announcement_date.split(' ')[0]  # 只保留日期部分
-                    date = announcement_date.replace('-', '')
-                    
-                    link = row['公告链接']
-                    
+                # 一次扫描目录得到已下载的PDF，缺失的公告无需逐个检查文件是否存在
+                existing_pdfs = {p.name for p in self.announcements_dir.glob("*.pdf")}
+
+                # 处理每条公告：已存在的PDF直接收录，需要下载的先登记，稍后并发下载
+                download_tasks = []
+                for title, date, link, announcement_time in records:
                     # 设置文件路径
-                    pdf_file_path = self.announcements_dir / f"{date}_{title}.pdf"
+                    pdf_name = f"{date}_{title}.pdf"
+                    pdf_file_path = self.announcements_dir / pdf_name
                     
                     # 如果PDF已存在，检查其大小并跳过下载
-                    if pdf_file_path.exists():
+                    if pdf_name in existing_pdfs:
+                        file_size = pdf_file_path.stat().st_size
                         # 检查文件大小是否超过3MB
-                        file_size = os.path.getsize(pdf_file_path)
-                        if file_size > 3 * 1024 * 1024:  # 3MB = 3 * 1024 * 1024 bytes
-                            self.logger.info(f"跳过大文件公告(大小: {file_size/1024/1024:.2f}MB): {pdf_file_path}")
+                        if file_size > MAX_ANNOUNCEMENT_PDF_BYTES:
+                            self.logger.info("跳过大文件公告(大小: %.2fMB): %s", file_size / 1024 / 1024, pdf_file_path)
                             continue
                         
-                        self.logger.info(f"公告PDF已存在: {pdf_file_path}")
+                        self.logger.info("公告PDF已存在: %s", pdf_file_path)
                         announcement_files.append(str(pdf_file_path))
                         continue
                     
-                    # 先创建临时TXT文件记录公告信息
+                    # 下载失败时才写入的TXT记录路径
                     txt_file_path = self.announcements_dir / f"{date}_{title}.txt"
-                    try:
-                        with open(txt_file_path, 'w', encoding='utf-8') as f:
-                            f.write(f"标题: {title}\n")
-                            f.write(f"日期: {row['公告时间']}\n")
-                            f.write(f"链接: {link}\n\n")
-                        self.logger.info(f"已创建临时记录: {txt_file_path}")
-                    except Exception as txt_err:
-                        self.logger.error(f"创建临时记录失败: {txt_err}")
-                    
-                    # 下载PDF文件
-                    self.logger.info(f"下载公告PDF: {title}")
-                    try:
-                        # 尝试下载PDF
-                        self._download_announcement_pdf(link, pdf_file_path)
-                        
-                        # 检查下载文件的大小是否超过3MB
-                        if os.path.exists(pdf_file_path):
-                            file_size = os.path.getsize(pdf_file_path)
-                            if file_size > 3 * 1024 * 1024:  # 3MB = 3 * 1024 * 1024 bytes
-                                self.logger.info(f"删除大文件公告(大小: {file_size/1024/1024:.2f}MB): {pdf_file_path}")
-                                os.remove(pdf_file_path)
-                                continue
-                        
-                        self.logger.info(f"PDF下载成功: {pdf_file_path}")
-                        announcement_files.append(str(pdf_file_path))
-                        
-                        # 删除临时TXT文件
-                        if os.path.exists(txt_file_path):
-                            try:
-                                os.remove(txt_file_path)
-                                self.logger.info(f"已删除临时记录: {txt_file_path}")
-                            except Exception as rm_err:
-                                self.logger.error(f"删除临时记录失败: {rm_err}")
-                    except Exception as pdf_err:
-                        self.logger.error(f"下载PDF失败: {title}, 错误: {pdf_err}")
-                        # 下载失败时，保留TXT文件作为记录
-                        if os.path.exists(txt_file_path):
-                            announcement_files.append(str(txt_file_path))
-                
-                # 防止请求过快
-                time.sleep(1)
+
+                    # 占位，下载完成后按原顺序回填
+                    download_tasks.append(
+                        (len(announcement_files), title, link, announcement_time, pdf_file_path, txt_file_path)
+                    )
+                    announcement_files.append(None)
+
+                # 并发下载PDF，同时在途的请求数受 ANNOUNCEMENT_DOWNLOAD_WORKERS 限制
+                if download_tasks:
+                    workers = min(ANNOUNCEMENT_DOWNLOAD_WORKERS, len(download_tasks))
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = {
+                            executor.submit(
+                                self._fetch_announcement_pdf, title, link, announcement_time, pdf_file_path, txt_file_path
+                            ): slot
+                            for slot, title, link, announcement_time, pdf_file_path, txt_file_path in download_tasks
+                        }
+                        for future in as_completed(futures):
+                            announcement_files[futures[future]] = future.result()
                 
             except Exception as cat_err:
                 self.logger.error(f"获取公告失败: {cat_err}")
             
-            # 清理多余的TXT文件
+            # 去掉未回填的下载占位（下载失败，或占位后中途出错）
+            announcement_files = [f for f in announcement_files if f]
+            
+            # 下载全部结束后统一清理一次残留文件
+            self._clean_crdownload_files()
             self._clean_announcement_txt_files(announcement_files)
             
             # 返回结果
@@ -363,6 +781,83 @@ class ProgressiveNewsSummarizer:
             self.logger.error(f"获取公告时出错: {e}")
             return []
 
+    def _read_announcement_cache(self, cache_file):
+        """读取公告列表缓存（.parquet 或旧版 .csv）"""
+        if cache_file.suffix == ".parquet":
+            return pd.read_parquet(cache_file)
+        return pd.read_csv(cache_file, encoding='utf-8')
+
+    def _write_announcement_cache(self, df, cache_base):
+        """
+        写入公告列表缓存，有pyarrow时写zstd压缩的Parquet（保留列类型），否则写CSV
+
+        Args:
+            df: 公告列表；为空时写入只有列定义的空表作为“无公告”标记
+            cache_base: 不含扩展名的缓存文件路径
+
+        Returns:
+            Path: 实际写入的缓存文件路径
+        """
+        if df.empty and len(df.columns) == 0:
+            df = pd.DataFrame({col: pd.Series(dtype="string") for col in ANNOUNCEMENT_CACHE_COLUMNS})
+        cache_file = cache_base.with_name(f"{cache_base.name}{ANNOUNCEMENT_CACHE_SUFFIX}")
+        if pyarrow is not None:
+            df.to_parquet(cache_file, engine='pyarrow', compression='zstd', index=False)
+        else:
+            df.to_csv(cache_file, encoding='utf-8', index=False)
+        return cache_file
+
+    def _fetch_announcement_pdf(self, title, link, announcement_time, pdf_file_path, txt_file_path):
+        """
+        下载单条公告PDF（供线程池并发调用）
+
+        Args:
+            title: 公告标题
+            link: 公告页面URL
+            announcement_time: 公告时间
+            pdf_file_path: PDF保存路径
+            txt_file_path: 下载失败时写入的TXT记录路径
+
+        Returns:
+            str | None: 成功返回PDF路径，下载失败返回TXT记录路径，超过3MB被删除时返回None
+        """
+        self.logger.info("下载公告PDF: %s", title)
+        try:
+            # 尝试下载PDF（之前失败留下的TXT记录由 _clean_announcement_txt_files 统一清理）
+            self._download_announcement_pdf(link, pdf_file_path)
+
+            self.logger.info("PDF下载成功: %s", pdf_file_path)
+            return str(pdf_file_path)
+        except OversizedPDFError as big_err:
+            # 超过3MB的公告在下载途中已被中止并删除
+            self.logger.info("跳过大文件公告: %s", big_err)
+            return None
+        except Exception as pdf_err:
+            self.logger.error(f"下载PDF失败: {title}, 错误: {pdf_err}")
+            # 下载失败时，才写入TXT文件作为记录
+            try:
+                txt_file_path.write_text(f"标题: {title}\n日期: {announcement_time}\n链接: {link}\n\n", encoding='utf-8')
+                self.logger.info("已创建公告记录: %s", txt_file_path)
+            except Exception as txt_err:
+                self.logger.error(f"创建公告记录失败: {txt_err}")
+                return None
+            return str(txt_file_path)
+
+    def _clean_crdownload_files(self):
+        """清理工作目录中残留的.crdownload文件（在一批下载结束后调用一次）"""
+        try:
+            with os.scandir(os.getcwd()) as entries:
+                leftovers = [entry.path for entry in entries if entry.name.lower().endswith(".crdownload")]
+        except Exception as e:
+            self.logger.error(f"清理残留下载文件出错: {e}")
+            return
+        for file_path in leftovers:
+            try:
+                os.remove(file_path)
+                self.logger.info(f"已删除残留的下载文件: {file_path}")
+            except Exception as e:
+                self.logger.error(f"删除残留文件失败: {e}")
+
     def _clean_announcement_txt_files(self, announcement_files):
         """
         清理announcements目录中的TXT文件
@@ -373,21 +868,15 @@ class ProgressiveNewsSummarizer:
         """
         try:
             # 获取所有已下载的PDF文件名
-            pdf_filenames = [os.path.basename(f) for f in announcement_files if f.lower().endswith('.pdf')]
+            pdf_filenames = {os.path.basename(f) for f in announcement_files if f.lower().endswith('.pdf')}
             
             # 遍历目录中的所有TXT文件
-            for file in os.listdir(self.announcements_dir):
-                if not file.lower().endswith('.txt'):
-                    continue
-                    
-                txt_path = os.path.join(self.announcements_dir, file)
-                
+            for txt_path in self.announcements_dir.glob('*.txt'):
                 # 检查是否有对应的PDF文件
-                pdf_name = file.replace('.txt', '.pdf')
-                if pdf_name in pdf_filenames:
+                if txt_path.with_suffix('.pdf').name in pdf_filenames:
                     # 如果有对应的PDF，删除TXT
                     try:
-                        os.remove(txt_path)
+                        txt_path.unlink(missing_ok=True)
                         self.logger.info(f"清理: 删除临时TXT文件 {txt_path}")
                     except Exception as e:
                         self.logger.error(f"删除TXT文件失败: {e}")
@@ -404,10 +893,7 @@ class ProgressiveNewsSummarizer:
             url: 公告页面URL
             output_path: PDF保存路径
         """
-        import urllib.request
-        from bs4 import BeautifulSoup
-        import requests
-        import time
+        from bs4 import BeautifulSoup, SoupStrainer
         import os
         
         # 确保目标目录存在
@@ -422,9 +908,8 @@ class ProgressiveNewsSummarizer:
             # 推导为http://static.cninfo.com.cn/finalpage/2024-11-26/1221835007.PDF
             
             # 从URL中提取announcementId
-            import re
-            announcement_id = re.search(r"announcementId=(\d+)", url)
-            announcement_time = re.search(r"announcementTime=(\d{4}-\d{2}-\d{2})", url)
+            announcement_id = _ANN_ID_RE.search(url)
+            announcement_time = _ANN_TIME_RE.search(url)
             
             if announcement_id and announcement_time:
                 ann_id = announcement_id.group(1)
@@ -432,7 +917,7 @@ class ProgressiveNewsSummarizer:
                 
                 # 构建静态PDF链接
                 pdf_url = f"http://static.cninfo.com.cn/finalpage/{announcement_time.group(1)}/{ann_id}.PDF"
-                self.logger.info(f"通过规则推导得到PDF链接: {pdf_url}")
+                self.logger.info("通过规则推导得到PDF链接: %s", pdf_url)
                 
                 # 设置请求头
                 headers = {
@@ -440,20 +925,20 @@ class ProgressiveNewsSummarizer:
                     "Referer": url
                 }
                 
-                # 创建请求对象
-                req = urllib.request.Request(pdf_url, headers=headers)
-                
                 try:
-                    # 下载文件
-                    self.logger.info(f"开始下载PDF: {pdf_url}")
-                    with urllib.request.urlopen(req) as response, open(output_path, "wb") as out_file:
-                        out_file.write(response.read())
+                    # 下载文件（复用会话的keep-alive连接）
+                    self.logger.info("开始下载PDF: %s", pdf_url)
+                    with self._http.get(pdf_url, headers=headers, timeout=30, stream=True) as response:
+                        response.raise_for_status()
+                        written = self._stream_pdf_to_file(response, output_path)
                     
-                    # 验证下载结果
-                    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                        self.logger.info(f"下载成功，文件大小: {os.path.getsize(output_path)} 字节")
+                    # 验证下载结果（直接使用写入的字节数，无需再stat文件）
+                    if written > 0:
+                        self.logger.info("下载成功，文件大小: %d 字节", written)
                         success = True
                         return True
+                except OversizedPDFError:
+                    raise
                 except Exception as direct_err:
                     self.logger.error(f"直接下载PDF失败: {direct_err}")
             
@@ -461,24 +946,24 @@ class ProgressiveNewsSummarizer:
             if not success:
                 self.logger.info("尝试解析页面获取PDF链接")
                 
-                response = requests.get(url, headers={
+                response = self._http.get(url, headers={
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                })
+                }, timeout=30)
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, "html.parser")
-                    
-                    # 尝试查找页面中的PDF链接
-                    pdf_links = []
-                    for a_tag in soup.find_all("a", href=True):
-                        if ".pdf" in a_tag["href"].lower():
-                            pdf_links.append(a_tag["href"])
+                    # 只解析a/embed标签，直接交给解析器原始字节，省去整页解析和解码
+                    soup = BeautifulSoup(
+                        response.content, HTML_PARSER, parse_only=SoupStrainer(["a", "embed"])
+                    )
                     
-                    # 也查找embed标签的src属性
-                    for embed_tag in soup.find_all("embed"):
-                        src = embed_tag.get("src", "")
-                        if ".pdf" in src.lower():
-                            pdf_links.append(src)
+                    # 一次遍历收集PDF链接，a标签的href优先于embed标签的src
+                    anchor_links, embed_links = [], []
+                    for tag in soup.find_all(["a", "embed"]):
+                        is_anchor = tag.name == "a"
+                        link = tag.get("href" if is_anchor else "src")
+                        if link and ".pdf" in link.lower():
+                            (anchor_links if is_anchor else embed_links).append(link)
+                    pdf_links = anchor_links + embed_links
                     
                     self.logger.info(f"通过解析页面找到{len(pdf_links)}个PDF链接")
                     
@@ -491,31 +976,14 @@ class ProgressiveNewsSummarizer:
                             pdf_url = f"http://www.cninfo.com.cn/{pdf_url}"
                         
                         self.logger.info(f"尝试下载PDF链接: {pdf_url}")
-                        pdf_response = requests.get(pdf_url, headers={
+                        with self._http.get(pdf_url, headers={
                             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
                             "Referer": url
-                        })
-                        
-                        if pdf_response.status_code == 200:
-                            with open(output_path, "wb") as f:
-                                f.write(pdf_response.content)
-                            self.logger.info(f"通过直接下载链接成功保存PDF: {output_path}")
-                            success = True
-                            return True
-            
-            # 清理根目录残留的.crdownload文件
-            try:
-                root_dir = os.getcwd()
-                for file in os.listdir(root_dir):
-                    if file.lower().endswith(".crdownload"):
-                        file_path = os.path.join(root_dir, file)
-                        try:
-                            os.remove(file_path)
-                            self.logger.info(f"已删除残留的下载文件: {file_path}")
-                        except Exception as e:
-                            self.logger.error(f"删除残留文件失败: {e}")
-            except Exception as e:
-                self.logger.error(f"清理残留下载文件出错: {e}")
+                        }, timeout=30, stream=True) as pdf_response:
+                            if pdf_response.status_code == 200 and self._stream_pdf_to_file(pdf_response, output_path) > 0:
+                                self.logger.info(f"通过直接下载链接成功保存PDF: {output_path}")
+                                success = True
+                                return True
             
             # 检查文件是否成功下载
             if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
@@ -524,23 +992,65 @@ class ProgressiveNewsSummarizer:
             else:
                 raise Exception("下载PDF失败")
                 
+        except OversizedPDFError:
+            raise
         except Exception as e:
             self.logger.error(f"下载PDF出错: {e}")
             raise
+
+    def _stream_pdf_to_file(self, response, output_path):
+        """
+        以64KiB分块把响应写入临时文件，完整读完且非空后才替换为 output_path；
+        超过 MAX_ANNOUNCEMENT_PDF_BYTES 或读取中途出错时删除半成品，不会留下截断的PDF
+
+        Args:
+            response: 以 stream=True 发起的 requests 响应
+            output_path: PDF保存路径
+
+        Returns:
+            int: 写入的字节数（为0时不生成文件）
+
+        Raises:
+            OversizedPDFError: PDF超过大小上限
+        """
+        written = 0
+        part_path = f"{output_path}.part"
+        try:
+            with open(part_path, "wb") as out_file:
+                for chunk in response.iter_content(chunk_size=PDF_DOWNLOAD_CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    written += len(chunk)
+                    if written > MAX_ANNOUNCEMENT_PDF_BYTES:
+                        raise OversizedPDFError(
+                            f"PDF超过{MAX_ANNOUNCEMENT_PDF_BYTES // (1024 * 1024)}MB，已中止下载: {output_path}"
+                        )
+                    out_file.write(chunk)
+            if written > 0:
+                os.replace(part_path, output_path)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        return written
     
-    def search_stock_news_with_gemini(self):
+    def search_stock_news_with_gemini(self, start_date=None, end_date=None):
         """
         使用Gemini的Google搜索功能获取股票相关新闻
         如果已存在相同日期范围的新闻文件，则直接复用
+
+        参数:
+            start_date: 开始日期(datetime)，默认使用 self.start_date
+            end_date: 结束日期(datetime)，默认使用 self.end_date
         """
+        start_date = start_date or self.start_date
+        end_date = end_date or self.end_date
 
         # 检查是否已存在相同日期范围的新闻文件
-        news_file = self.news_dir / f"{self.stock_code}_news_{self.start_date_str}_{self.end_date_str}.md"
+        news_file = self.news_dir / f"{self.stock_code}_news_{start_date:%Y%m%d}_{end_date:%Y%m%d}.md"
         if news_file.exists():
             self.logger.info(f"已存在日期范围内的新闻文件，直接复用: {news_file}")
             return str(news_file)
 
-        MODEL = "gemini-2.5-pro"
         self.logger.info(f"正在使用Gemini搜索{self.stock_name}({self.stock_code})的新闻...")
 
         google_search_tool = Tool(
@@ -548,77 +1058,12 @@ class ProgressiveNewsSummarizer:
         )
 
         # 构建搜索提示
-        start_date_formatted = self.start_date.strftime("%Y年%m月%d日")
-        end_date_formatted = self.end_date.strftime("%Y年%m月%d日")
-        
-        prompt = f"""
-                    请帮我搜集并汇总关于{self.stock_name}在{start_date_formatted}至{end_date_formatted}期间的所有可能影响公司股价的新闻和传闻，严格按以下要求执行：
-
-                    【数据来源要求】
-                    覆盖以下渠道：主流财经媒体、行业垂直平台、社交媒体（股吧/雪球/微博）、监管文件、公司公告、供应链信源。对于社交媒体传闻，需满足以下条件之一才收录：
-                    - 相关话题阅读量＞10万次 
-                    - 被5个以上财经领域大V转发
-                    - 与近期股价异动时间吻合
-
-                    【核心信息维度】
-                    按顺序处理以下内容（无结果则跳过该部分）：
-                    1. 重大合同/订单变动（需对比合同金额与上季度营收）
-                    2. 产品与服务动态（注明是否突破现有技术路线）
-                    3. 业务增长与扩张（区分有机增长与并购）
-                    4. 治理与人事（高管变动需对比任期剩余时间）
-                    5. 法律监管事件（标注处罚金额/整改成本预估）
-                    6. 资本运作（如股票发行与回购、大股东套现、大股东变更、信用评级调整等，需关注大股东行为一致性）
-                    7. 突发事件（标注是否涉及核心业务）
-                    8. 国际制裁/政策（区分直接影响与情绪影响）
-                    9. 行业生态变化（技术突破/替代品威胁）
-                    10. 政策动态（草案/试点/国际联盟）
-
-                    【传闻处理规则】
-                    对非官方消息必须：
-                    - 添加【待核实】前缀 
-                    - 标注传播路径（如：微博→雪球→财经媒体）
-                    - 记录最早出现时间与传播峰值时间
-                    - 注明："该信息尚未证实，请谨慎参考"
-
-                    【财务关联规则】
-                    当涉及以下新闻类型时，关联最近季度财报数据：
-                    ■ 投资/并购 → 对比现金持有量与投资总额
-                    ■ 价格调整 → 注明历史毛利率波动范围
-                    ■ 诉讼/处罚 → 计算占净利润比例
-                    （具体数值计算由其他模块处理）
-
-                    【可信度标注系统】
-                    每条信息头部添加：
-                    ✅ 官方证实 - 公司/监管正式文件
-                    🅰️ 多方印证 - ≥3家权威媒体独立报道
-                    🅱️ 单方信源 - 未获公司回应的媒体报道
-                    ⚠️ 传闻预警 - 社交平台传播未验证
-
-                    【压制信息监测】 
-                    重点捕捉：
-                    • 突发密集负面后快速删除（记录网页存档链接）
-                    • 高管异常离职（任期内+无继任者+未发感谢信）
-                    • 供应链异动（多个合作方同时变更信息）
-                    • 财报关键模糊表述（对比往期同类表述变化）
-
-                    【输出格式】
-                    ≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡
-                    标题：【可信度图标】标题文本
-                    日期：YYYY-MM-DD HH:MM
-                    来源：媒体名称/社交平台+传播热度
-                    财务关联：可能影响的财报科目/指标
-                    摘要：事件核心事实+潜在影响逻辑
-                    压制迹象：［若有则填］删除时间/限流范围
-                    时间轴标记：［事件阶段］发酵期/消退期/反复期
-                    ≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡≡
-
-                    【特别规范】
-                    1. 不收录明显诽谤或违法信息
-                    2. 同一事件多信源报道需合并处理
-                    3. 涉及政策草案需注明立法概率评估
-                    4. 每页最多呈现25条关键信息
-                    4. 用中文输出，无需解释分析逻辑
-                """
+        start_date_formatted = start_date.strftime("%Y年%m月%d日")
+        end_date_formatted = end_date.strftime("%Y年%m月%d日")
+        
+        prompt = _NEWS_SEARCH_PROMPT_TEMPLATE.format(
+            stock_name=self.stock_name, start=start_date_formatted, end=end_date_formatted
+        )
         
         # 设置重试参数
         max_retries = 5
@@ -629,24 +1074,24 @@ class ProgressiveNewsSummarizer:
             try:
                 self.logger.info(f"尝试搜索新闻 (尝试 {attempt}/{max_retries})...")
                 
-                # 发送请求并等待响应
-                response_text = ""
-                for chunk in self.client.models.generate_content_stream(
-                    model=MODEL,
-                    contents=prompt,
-                    config=GenerateContentConfig(
-                        tools=[google_search_tool],
-                        http_options = {"timeout": 600000},
-                    ),
-                ):
-                    if chunk.text:
-                        response_text += chunk.text
-
-                # 保存搜索结果
-                with open(news_file, "w", encoding="utf-8") as f:
+                # 边接收边写入临时文件（连接中断时保留已收到的部分），完成后再替换为正式文件，
+                # 避免不完整的结果被当作缓存复用
+                partial_file = news_file.with_name(f"{news_file.name}.partial")
+                with open(partial_file, "w", encoding="utf-8") as f:
                     f.write(f"# {self.stock_name}({self.stock_code}) 新闻报道\n\n")
                     f.write(f"时间范围: {start_date_formatted} 至 {end_date_formatted}\n\n")
-                    f.write(response_text)
+                    for chunk in self.client.models.generate_content_stream(
+                        model=GEMINI_MODEL,
+                        contents=prompt,
+                        config=GenerateContentConfig(
+                            tools=[google_search_tool],
+                            http_options = {"timeout": 600000},
+                        ),
+                    ):
+                        if chunk.text:
+                            f.write(chunk.text)
+                            f.flush()
+                os.replace(partial_file, news_file)
                     
                 self.logger.info(f"新闻搜索结果已保存至: {news_file}")
                 return str(news_file)
@@ -665,7 +1110,298 @@ class ProgressiveNewsSummarizer:
                 self.logger.info(f"等待 {wait_time} 秒后重试...")
                 time.sleep(wait_time)
 
-    def generate_progressive_summary(self, news_content, announcement_pdfs=None, research_pdfs=None):
+    def _convert_pdfs_to_markdown(self, pdf_paths, markdown_dir, max_chars=None):
+        """
+        将一批PDF转换为Markdown：已有缓存的直接读取，其余在进程池中并行转换
+
+        参数:
+            pdf_paths: PDF文件路径列表
+            markdown_dir: Markdown缓存目录
+            max_chars: 调用方只使用前 max_chars 个字符时传入，缓存命中时只读取文件开头
+
+        返回:
+            dict: PDF路径 -> Markdown文本（转换失败的PDF不在结果中）
+        """
+        results = {}
+        need_convert = []
+        cache_paths = {}
+        # 一次扫描缓存目录，代替逐个PDF的exists检查（Windows上DirEntry自带stat信息）
+        try:
+            with os.scandir(markdown_dir) as entries:
+                cached_md = {entry.name: entry for entry in entries if entry.name.endswith(".md")}
+        except FileNotFoundError:
+            cached_md = {}
+        for pdf_path in pdf_paths:
+            if pdf_path in results or pdf_path in cache_paths:
+                continue
+            # 每个PDF只stat一次：同时用于存在性检查与内容哈希的记忆键
+            try:
+                pdf_stat = os.stat(pdf_path)
+            except FileNotFoundError:
+                continue
+            # Markdown缓存以PDF内容哈希命名，同一公告换了文件名也能命中；兼容旧的按文件名缓存
+            markdown_name = f"{_pdf_content_key(pdf_path, pdf_stat)}.md"
+            cache_paths[pdf_path] = markdown_dir / markdown_name
+            for candidate in (markdown_name, f"{Path(pdf_path).stem}.md"):
+                entry = cached_md.get(candidate)
+                if entry is not None:
+                    self.logger.info("使用缓存的Markdown: %s", entry.path)
+                    stat = entry.stat()
+                    results[pdf_path] = _load_markdown(entry.path, stat.st_mtime_ns, stat.st_size, max_chars)
+                    break
+            else:
+                need_convert.append(pdf_path)
+
+        if not need_convert:
+            return results
+
+        # PDF解析是CPU密集型任务，子进程各自持有解释器与转换模型，避开GIL；
+        # 进程池在整个运行中共用（多个时间段、多只股票并行时排队提交），转换模型只在子进程启动时加载一次
+        executor = get_converter_process_pool(PDF_CONVERT_WORKERS)
+        self.logger.info(f"并行转换{len(need_convert)}个PDF为Markdown，进程数: {PDF_CONVERT_WORKERS}")
+        futures = {
+            executor.submit(basic_convert, pdf_path): pdf_path
+            for pdf_path in need_convert
+        }
+        for future in as_completed(futures):
+            pdf_path = futures[future]
+            try:
+                markdown_text = future.result()
+            except Exception as e:
+                self.logger.error("PDF转Markdown过程出错: %s, %s", pdf_path, e)
+                continue
+            if not markdown_text:
+                self.logger.error("PDF转Markdown失败: %s", pdf_path)
+                continue
+            cache_paths[pdf_path].write_text(markdown_text, encoding='utf-8')
+            self.logger.info("已保存到: %s", cache_paths[pdf_path])
+            results[pdf_path] = markdown_text
+        return results
+
+    def _gather_announcements_and_news(self, start_date=None, end_date=None):
+        """
+        收集公告并预先转换Markdown的同时，在后台线程中搜索新闻
+
+        新闻搜索主要在等待Gemini流式返回，与公告下载、PDF转换互不依赖，
+        并行后耗时约为两者中较长的一方，而不是两者之和。
+
+        参数:
+            start_date: 开始日期(datetime)，默认使用 self.start_date
+            end_date: 结束日期(datetime)，默认使用 self.end_date
+
+        返回:
+            tuple: (公告PDF路径列表, 新闻文件路径)；新闻搜索抛出的异常在此处重新抛出
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            news_future = executor.submit(self.search_stock_news_with_gemini, start_date, end_date)
+
+            announcement_files = self.collect_stock_announcements(start_date, end_date)
+            self.logger.info(f"共收集到{len(announcement_files)}份公告")
+            if announcement_files:
+                # 转换结果写入Markdown缓存（读取结果也进入内存缓存），生成总结时直接命中
+                markdown_dir = self.base_dir / "markdown_files"
+                self._ensure_dir(markdown_dir)
+                self._convert_pdfs_to_markdown(
+                    announcement_files, markdown_dir, max_chars=SUMMARY_MARKDOWN_READ_CHARS
+                )
+
+            news_file = news_future.result()
+        return announcement_files, news_file
+
+    def _call_gemini_with_retry(self, prompt, model, task_name, max_retries=GEMINI_MAX_RETRIES, retry_on=(Exception,),
+                                stream=False, require_complete=False):
+        """
+        调用Gemini获取完整输出，失败或返回空内容时按指数退避加随机抖动重试
+
+        参数:
+            prompt: 提示词
+            model: 模型名称
+            task_name: 日志中的任务名称，如"生成总结"
+            max_retries: 最大尝试次数
+            retry_on: 需要重试的异常类型，其余异常直接抛出
+            stream: 是否流式获取。总结均为离线批处理、无人实时查看输出，默认一次性获取，省去逐块处理的开销
+            require_complete: 为True时，输出因达到长度上限被截断(finish_reason=MAX_TOKENS)则抛出 ValueError（不重试）
+
+        返回:
+            str: 模型输出文本
+
+        异常:
+            达到最大尝试次数后抛出最后一次的异常；每次都返回空内容或要求完整输出却被截断时抛出 ValueError
+        """
+        for attempt in range(1, max_retries + 1):
+            finish_reason = None
+            try:
+                self.logger.info(f"调用Gemini API{task_name} (尝试 {attempt}/{max_retries})...")
+                if stream:
+                    # 分块写入缓冲区，整段成功后才返回（中途失败不会留下半截结果）
+                    buffer = io.StringIO()
+                    for chunk in self.client.models.generate_content_stream(model=model, contents=prompt):
+                        if chunk.text:
+                            buffer.write(chunk.text)
+                        if chunk.candidates and chunk.candidates[0].finish_reason:
+                            finish_reason = chunk.candidates[0].finish_reason
+                    text = buffer.getvalue()
+                else:
+                    response = self.client.models.generate_content(model=model, contents=prompt)
+                    text = response.text or ""
+                    if response.candidates:
+                        finish_reason = response.candidates[0].finish_reason
+            except retry_on as e:
+                self.logger.warning(f"{task_name}失败 (尝试 {attempt}/{max_retries}): {type(e).__name__}: {e}")
+                if attempt == max_retries:
+                    self.logger.error(f"{task_name}失败，已达最大重试次数: {e}")
+                    raise
+                base = _retry_base_wait(e)
+            else:
+                # 在 try 之外判断截断：相同输入重试只会以同样方式截断，不经过 retry_on
+                if require_complete and finish_reason == FinishReason.MAX_TOKENS:
+                    raise ValueError(f"{task_name}输出达到长度上限被截断，长度: {len(text)} 字符")
+                if text:
+                    self.logger.info(f"成功{task_name}，长度: {len(text)} 字符")
+                    return text
+                self.logger.warning(f"{task_name}返回空内容 (尝试 {attempt}/{max_retries})")
+                base = _RETRY_BASE_WAIT[errors.ServerError]
+
+            if attempt < max_retries:
+                # 指数退避 + 随机抖动，避免多个并发任务同时重试；超时/限流类错误起始等待更长
+                wait_time = min(GEMINI_MAX_BACKOFF_SECONDS, base * 2 ** (attempt - 1)) + random.uniform(0, 2)
+                self.logger.info(f"等待 {wait_time:.1f} 秒后重试...")
+                time.sleep(wait_time)
+        raise ValueError(f"{task_name}失败：{max_retries}次尝试均返回空内容")
+
+    def _cached_response(self, model, prompt):
+        """
+        查询 (模型, 提示词) 对应的缓存输出，崩溃后重跑或重试时相同输入不再重复调用Gemini
+
+        返回:
+            str | None: 命中时返回缓存文本，未命中返回None
+        """
+        content = llm_cache.get(llm_cache.make_key(model, [{"role": "user", "content": prompt}]))
+        if content:
+            self.logger.info(f"命中模型响应缓存，跳过Gemini调用 (模型: {model})")
+            return content
+        return None
+
+    def _store_response(self, model, prompt, content):
+        """把Gemini输出写入响应缓存（空输出不缓存）"""
+        if content:
+            llm_cache.put(llm_cache.make_key(model, [{"role": "user", "content": prompt}]), content)
+
+    def _semantic_cached_response(self, scope, text):
+        """
+        在语义缓存中查找相同作用域下与 text 最相似的已有输出（需设置 PROGRESSIVE_SEMANTIC_CACHE=1）
+
+        新闻由Gemini搜索生成，重跑同一时间段时措辞总有差异，精确缓存无法命中；
+        作用域固定股票、时间段与确定性输入的摘要，只对变化的文本做向量比对。
+
+        参数:
+            scope: 作用域字符串，只在相同作用域内比对
+            text: 参与向量比对的可变文本
+
+        返回:
+            tuple: (查询向量, 命中的缓存文本)；未启用或编码失败时向量为None，未命中时文本为None
+        """
+        if not PROGRESSIVE_SEMANTIC_CACHE or not text:
+            return None, None
+        try:
+            result = self.client.models.embed_content(
+                model=GEMINI_EMBEDDING_MODEL, contents=text[:semantic_cache.EMBED_INPUT_CHARS]
+            )
+            vector = np.asarray(result.embeddings[0].values, dtype=np.float32)
+        except Exception as e:
+            self.logger.warning(f"计算语义缓存向量失败，跳过语义缓存: {e}")
+            return None, None
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+        hit = _get_progressive_semantic_cache().lookup(scope, vector)
+        if hit is None:
+            return vector, None
+        score, item = hit
+        self.logger.info(f"命中总结语义缓存(相似度={score:.3f})，跳过Gemini调用")
+        return vector, item.get("content")
+
+    def _summary_semantic_scope(self, start_date, end_date, pdfs_markdown):
+        """短期总结的语义缓存作用域：股票、时间段与公告Markdown摘要（逐段与批量生成共用）"""
+        return (
+            f"{self.stock_code}:summary:{start_date.strftime('%Y%m%d')}:{end_date.strftime('%Y%m%d')}:"
+            f"{_text_digest(pdfs_markdown)}"
+        )
+
+    def _semantic_store(self, scope, vector, content):
+        """把新生成的输出写入语义缓存并落盘"""
+        if vector is None or not content:
+            return
+        cache = _get_progressive_semantic_cache()
+        cache.insert(scope, vector, {"content": content})
+        cache.flush()
+
+    def _prepare_summary_inputs(self, news_content, announcement_pdfs=None):
+        """
+        把公告PDF转换为摘要用的Markdown，并对公告与新闻做长度限制
+
+        参数:
+            news_content: 新闻内容文本
+            announcement_pdfs: 公告PDF文件路径列表
+
+        返回:
+            tuple: (新闻内容, 公告Markdown)
+        """
+        # 创建Markdown转换输出文件夹
+        markdown_dir = self.base_dir / "markdown_files"
+        self._ensure_dir(markdown_dir)
+        
+        # 将PDF文件转换为Markdown文本（各片段先放入列表，最后一次性拼接）
+        md_parts = []
+        pdf_files_count = 0
+        
+        # 处理公告PDF
+        if announcement_pdfs:
+            self.logger.info(f"处理公告PDF文件，共{len(announcement_pdfs)}个")
+            md_parts.append("\n## 公司公告\n\n")
+            
+            # 结果只包含存在且转换成功的PDF
+            markdown_by_pdf = self._convert_pdfs_to_markdown(
+                announcement_pdfs, markdown_dir, max_chars=SUMMARY_MARKDOWN_READ_CHARS
+            )
+            for pdf_path in announcement_pdfs:
+                markdown_text = markdown_by_pdf.get(pdf_path)
+                if not markdown_text:
+                    continue
+                
+                # 添加公告标题
+                md_parts.append(f"### {Path(pdf_path).name}\n\n")
+                # 添加摘要版本的Markdown内容（最多5000字符）
+                md_parts.append(markdown_text[:5000])
+                if len(markdown_text) > 5000:
+                    md_parts.append(_MARKDOWN_TRUNCATION_MARK)
+                md_parts.append(_MARKDOWN_SECTION_SEP)
+                pdf_files_count += 1
+        
+        # 如果有PDF文件，添加提示说明
+        if pdf_files_count > 0:
+            md_parts.insert(
+                0,
+                f"# {self.stock_name}({self.stock_code}) PDF文档摘要\n\n"
+                f"共{pdf_files_count}个PDF文件转换为Markdown格式\n\n",
+            )
+        all_pdfs_markdown = "".join(md_parts)
+        
+        # 限制公告与新闻的长度，避免输入token过多拖慢首字延迟并抬高成本
+        all_pdfs_markdown, omitted = _truncate_middle(all_pdfs_markdown, MAX_PDF_MARKDOWN_CHARS)
+        if omitted:
+            self.logger.warning(
+                "公告Markdown过长，省略中间%d字符（%.1f%%）", omitted, 100 * omitted / (omitted + MAX_PDF_MARKDOWN_CHARS)
+            )
+        news_content, omitted = _truncate_middle(news_content or "", MAX_NEWS_CONTENT_CHARS)
+        if omitted:
+            self.logger.warning(
+                "新闻内容过长，省略中间%d字符（%.1f%%）", omitted, 100 * omitted / (omitted + MAX_NEWS_CONTENT_CHARS)
+            )
+        return news_content, all_pdfs_markdown
+
+    def generate_progressive_summary(self, news_content, announcement_pdfs=None, research_pdfs=None,
+                                     start_date=None, end_date=None):
         """
         生成短期渐进式总结(Ns,τ)
         
@@ -673,120 +1409,48 @@ class ProgressiveNewsSummarizer:
             news_content: 新闻内容文本
             announcement_pdfs: 公告PDF文件路径列表
             research_pdfs: 研究报告PDF文件路径列表（已不使用）
+            start_date: 开始日期(datetime)，默认使用 self.start_date
+            end_date: 结束日期(datetime)，默认使用 self.end_date
             
         返回:
             生成的短期渐进式总结
         """
+        start_date = start_date or self.start_date
+        end_date = end_date or self.end_date
         # 验证参数
-        if self.start_date is None or self.end_date is None:
+        if start_date is None or end_date is None:
             raise ValueError("请先设置日期范围")
+        start_date_str = start_date.strftime("%Y%m%d")
+        end_date_str = end_date.strftime("%Y%m%d")
+        start_cn = start_date.strftime("%Y年%m月%d日")
+        end_cn = end_date.strftime("%Y年%m月%d日")
             
-        # 创建Markdown转换输出文件夹
-        markdown_dir = self.base_dir / "markdown_files"
-        markdown_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 将PDF文件转换为Markdown文本
-        all_pdfs_markdown = ""
-        pdf_files_count = 0
-        
         try:
-            # 处理公告PDF
-            if announcement_pdfs:
-                self.logger.info(f"处理公告PDF文件，共{len(announcement_pdfs)}个")
-                all_pdfs_markdown += "\n## 公司公告\n\n"
-                
-                for pdf_path in announcement_pdfs:
-                    if os.path.exists(pdf_path):
-                        pdf_name = Path(pdf_path).name
-                        # 构建Markdown缓存文件路径
-                        markdown_file_path = markdown_dir / f"{Path(pdf_path).stem}.md"
-                        
-                        # 检查是否已存在缓存的Markdown文件
-                        if markdown_file_path.exists():
-                            self.logger.info(f"使用缓存的Markdown: {markdown_file_path}")
-                            with open(markdown_file_path, 'r', encoding='utf-8') as f:
-                                markdown_text = f.read()
-                        else:
-                            # 转换PDF为Markdown
-                            self.logger.info(f"将PDF转换为Markdown: {pdf_path}")
-                            try:
-                                markdown_text = basic_convert(pdf_path, output_dir=str(markdown_dir))
-                                if not markdown_text:
-                                    self.logger.error(f"PDF转Markdown失败: {pdf_path}")
-                                    continue
-                            except Exception as e:
-                                self.logger.error(f"PDF转Markdown过程出错: {pdf_path}, {e}")
-                                continue
-                        
-                        # 添加公告标题
-                        all_pdfs_markdown += f"### {pdf_name}\n\n"
-                        # 添加摘要版本的Markdown内容（最多5000字符）
-                        truncated_text = markdown_text[:5000]
-                        if len(markdown_text) > 5000:
-                            truncated_text += "...(内容已截断)"
-                        all_pdfs_markdown += truncated_text + "\n\n---\n\n"
-                        pdf_files_count += 1
+            # 公告转换为Markdown，并对公告与新闻做长度限制
+            news_content, all_pdfs_markdown = self._prepare_summary_inputs(news_content, announcement_pdfs)
             
-            # 如果有PDF文件，添加提示说明
-            if pdf_files_count > 0:
-                all_pdfs_markdown = f"# {self.stock_name}({self.stock_code}) PDF文档摘要\n\n" + \
-                                   f"共{pdf_files_count}个PDF文件转换为Markdown格式\n\n" + \
-                                   all_pdfs_markdown
-            
-            # 构建不同模式下的提示词
+            # 构建不同模式下的提示词：固定的分析要求在前，股票、日期与材料等可变内容在后，
+            # 同一模式下各次调用共享相同的前缀，便于命中服务端的提示词前缀缓存
             if self.is_date_range_mode:
                 # 指定日期范围模式
-                time_description = f"在{self.start_date.strftime('%Y年%m月%d日')}至{self.end_date.strftime('%Y年%m月%d日')}期间"
-                date_span = (self.end_date - self.start_date).days
-                prompt = f"""你是一位专业的股票分析师，需要对{self.stock_name}({self.stock_code}){time_description}的信息进行总结分析。
-
-我将提供这段时间内与该公司相关的公司公告和新闻信息。请详细分析这些信息。
-
-这份总结重点是捕捉这{date_span}天内的关键信息：
-
-1. 公司公告分析：提取公司公告中的关键信息，如财务数据、重大事项、管理层变动、风险提示等；
-2. 新闻舆情分析：总结市场新闻对公司的报道和评价，以及可能对股价产生的影响；
-3. 时间线分析：按时间顺序标注重要事件，突出其对公司发展路径的影响；
-4. 关键指标分析：分析这段时间内关键指标的状况；
-5. 综合评估：基于以上信息，对公司在这段时间内的表现进行全面评估。
-
-请注意：
-- 保持客观，突出这段时间内的关键信息；
-- 提供有据可依的分析，特别关注时间序列上的变化；
-- 突出重点信息和数据，剔除冗余内容；
-- 适当引用原文中的关键数据和观点；
-- 使用专业的金融术语；
-- 详细分析所有文档中的重要数据。
+                date_span = (end_date - start_date).days
+                prompt = DATE_RANGE_SUMMARY_INSTRUCTIONS + f"""
+分析对象：{self.stock_name}({self.stock_code})
+时间范围：{start_cn}至{end_cn}（共{date_span}天）
 
 以下是PDF文档摘要:
-{all_pdfs_markdown}
-
-以下是新闻内容:
-{news_content}
-
-最终形成一份专业、全面的总结，同时你需要保持中文回复。
-"""
-            else:
-                # 默认模式 - 短期渐进式总结
-                prompt = f"""你是一位专业的股票分析师，需要对{self.stock_name}({self.stock_code})在过去{self.days}天内（{self.start_date.strftime('%Y年%m月%d日')}至{self.end_date.strftime('%Y年%m月%d日')}）的信息进行短期渐进式总结(Ns,τ)。
-
-我将提供这段时间内与该公司相关的公司公告和新闻信息。请详细分析这些信息。
-
-这份短期总结(Ns,τ)将作为渐进式总结系统的第一步，重点是捕捉这{self.days}天内的关键信息变化：
-
-1. 公司公告分析：提取公司公告中的关键信息，如财务数据、重大事项、管理层变动、风险提示等；
-2. 新闻舆情分析：总结市场新闻对公司的报道和评价，以及可能对股价产生的影响；
-3. 时间线分析：按时间顺序标注重要事件，突出其对公司发展路径的影响；
-4. 短期关键指标变化：对比分析这{self.days}天内关键指标的变化趋势；
-5. 综合评估：基于以上信息，对公司短期表现进行全面评估。
+{all_pdfs_markdown}
 
-请注意：
-- 保持客观，突出这段时间内的新变化和新信息；
-- 提供有据可依的分析，特别关注时间序列上的变化；
-- 突出重点信息和数据，剔除冗余内容；
-- 适当引用原文中的关键数据和观点；
-- 使用专业的金融术语；
-- 详细分析所有文档中的重要数据。
+以下是新闻内容:
+{news_content}
+
+最终形成一份专业、全面的总结，同时你需要保持中文回复。
+"""
+            else:
+                # 默认模式 - 短期渐进式总结
+                prompt = SHORT_TERM_SUMMARY_INSTRUCTIONS + f"""
+分析对象：{self.stock_name}({self.stock_code})
+时间范围：过去{self.days}天内（{start_cn}至{end_cn}）
 
 以下是PDF文档摘要:
 {all_pdfs_markdown}
@@ -797,56 +1461,30 @@ class ProgressiveNewsSummarizer:
 最终形成一份专业、全面的"短期渐进式新闻总结(Ns,τ)，同时你需要保持中文回复"。
 """
             
-            MODEL = "gemini-2.5-pro"
-            
             # 保存生成的prompt到文件
-            prompt_file = self.base_dir / "prompts" / f"summary_prompt_{self.start_date_str}_{self.end_date_str}.txt"
-            prompt_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(prompt_file, 'w', encoding='utf-8') as f:
-                f.write(prompt)
-            self.logger.info(f"总结提示已保存到: {prompt_file}")
-            
-            # 使用Gemini API生成总结，带重试机制
-            max_retries = 3
-            retry_count = 0
-            summary = ""
-            
-            while retry_count < max_retries and not summary:
+            prompt_file = self.base_dir / "prompts" / f"summary_prompt_{start_date_str}_{end_date_str}.txt"
+            self._ensure_dir(prompt_file.parent)
+            self._save_prompt_async(prompt_file, prompt, "总结提示")
+            
+            # 使用Gemini API生成总结，带重试机制（相同提示词命中缓存时跳过调用）
+            cached_summary = self._cached_response(GEMINI_MODEL, prompt)
+            semantic_scope = self._summary_semantic_scope(start_date, end_date, all_pdfs_markdown)
+            semantic_vector = None
+            if cached_summary is None:
+                semantic_vector, cached_summary = self._semantic_cached_response(semantic_scope, news_content)
+            if cached_summary is not None:
+                summary = cached_summary
+            else:
                 try:
-                    self.logger.info(f"调用Gemini API生成总结 (尝试 {retry_count+1}/{max_retries})...")
-                    # 使用文本提示
-                    for chunk in self.client.models.generate_content_stream(
-                        model=MODEL,
-                        contents=prompt
-                    ):
-                        if chunk.text:
-                            summary += chunk.text
-                    
-                    self.logger.info(f"成功生成总结，长度: {len(summary)} 字符")
-                    
-                except errors.APIError as e:
-                    retry_count += 1
-                    error_msg = e.message
-                    self.logger.warning(f"生成总结失败 (尝试 {retry_count}/{max_retries}): {error_msg}:{e.code}")
-                    
-                    if ("timeout" in error_msg.lower() or 
-                        "timed out" in error_msg.lower() or 
-                        "server disconnected" in error_msg.lower()):
-                        # 超时错误，等待更长时间再重试
-                        wait_time = 15 * retry_count
-                        self.logger.info(f"超时错误，等待 {wait_time} 秒后重试...")
-                    else:
-                        # 其他错误，等待标准时间
-                        wait_time = 8 * retry_count
-                        self.logger.info(f"错误，等待 {wait_time} 秒后重试...")
-                    
-                    if retry_count < max_retries:
-                        time.sleep(wait_time)
-                    else:
-                        # 达到最大重试次数，记录错误
-                        self.logger.error(f"生成总结失败，已达最大重试次数: {e}")
-                        raise ValueError(f"生成总结失败，已达最大重试次数: {e}")
+                    summary = self._call_gemini_with_retry(
+                        prompt, GEMINI_MODEL, "生成总结", retry_on=(errors.APIError, httpx.TransportError)
+                    )
+                except (errors.APIError, httpx.TransportError) as e:
+                    raise ValueError(f"生成总结失败，已达最大重试次数: {e}") from e
             
+            if cached_summary is None:
+                self._store_response(GEMINI_MODEL, prompt, summary)
+                self._semantic_store(semantic_scope, semantic_vector, summary)
             return summary
             
         except Exception as e:
@@ -869,22 +1507,10 @@ class ProgressiveNewsSummarizer:
             self.logger.info("未找到上个月的渐进式总结，将直接使用当前短期总结作为本月渐进式总结")
             return current_summary
         
-        MODEL = "gemini-2.5-pro"
-        # 构建融合提示
-        fusion_prompt = f"""你是一位专业的股票分析师，需要将{self.stock_name}({self.stock_code})的两部分信息融合为一份完整的长期历史渐进式总结：
-
-1. 上个月的渐进式总结：包含截至上个月末的历史累积信息
-2. 当前短期总结：包含近{self.days}天内({self.start_date.strftime('%Y年%m月%d日')}至{self.end_date.strftime('%Y年%m月%d日')})的最新信息
-
-请执行以下渐进式融合任务：
-
-1. 时间序列集成：将不同时间段的信息按照时间顺序组织，形成完整的历史时间线
-2. 趋势分析：识别关键指标和事件在整个时间范围内的长期变化趋势和重要转折点
-3. 信息去重与整合：移除重复信息，合并相似内容，用最新信息更新过时内容，也要重点分析一下近期发生的事件的整体影响。除确定判断已过时信息外，要尽量保证事件描述详细完整，不要省略任何细节。
-4. 事件分析：对关键事件进行深度分析，包括事件发生的时间、原因、影响、影响范围、影响程度、影响后果
-5. 历史关联性分析：分析不同时期事件之间的关联和影响
-6. 完整发展轨迹：展现公司从历史信息到近期的完整发展轨迹
-7. 综合评估：基于完整历史信息，对公司的长期表现和投资价值进行全面评估
+        # 构建融合提示（固定的融合要求在前，可变内容在后）
+        fusion_prompt = FUSION_SUMMARY_INSTRUCTIONS + f"""
+分析对象：{self.stock_name}({self.stock_code})
+当前短期总结的时间范围：近{self.days}天内({self._start_cn}至{self._end_cn})
 
 **===== 上个月的渐进式总结：===== **
 {previous_monthly_summary}
@@ -897,56 +1523,33 @@ class ProgressiveNewsSummarizer:
 """
 
         # 保存融合提示到文件
-        current_month = self.end_date.strftime('%Y%m')
+        current_month = self._month_ym
         prompt_dir = self.base_dir / "prompts"
-        prompt_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(prompt_dir)
         
         fusion_prompt_file = prompt_dir / f"fusion_prompt_{self.stock_code}_{current_month}.txt"
-        with open(fusion_prompt_file, 'w', encoding='utf-8') as f:
-            f.write(fusion_prompt)
-        self.logger.info(f"融合提示已保存到: {fusion_prompt_file}")
+        self._save_prompt_async(fusion_prompt_file, fusion_prompt, "融合提示")
 
-        # 使用Gemini API生成融合总结，带重试机制
-        max_retries = 3
-        retry_count = 0
-        fusion_result = ""
-        
-        while retry_count < max_retries and not fusion_result:
+        # 使用Gemini API生成融合总结，带重试机制（相同提示词命中缓存时跳过调用）
+        cached_result = self._cached_response(GEMINI_MODEL, fusion_prompt)
+        semantic_scope = (
+            f"{self.stock_code}:fusion:{self.start_date_str}:{self.end_date_str}:{_text_digest(previous_monthly_summary)}"
+        )
+        semantic_vector = None
+        if cached_result is None:
+            semantic_vector, cached_result = self._semantic_cached_response(semantic_scope, current_summary)
+        if cached_result is not None:
+            fusion_result = cached_result
+        else:
             try:
-                self.logger.info(f"调用Gemini API生成融合总结 (尝试 {retry_count+1}/{max_retries})...")
-                # 生成内容
-                for chunk in self.client.models.generate_content_stream(
-                    model=MODEL,
-                    contents=fusion_prompt
-                ):
-                    if chunk.text:
-                        fusion_result += chunk.text
-                self.logger.info(f"成功生成融合总结，长度: {len(fusion_result)} 字符")
-                
-            except Exception as e:
-                retry_count += 1
-                error_msg = str(e)
-                self.logger.warning(f"生成融合总结失败 (尝试 {retry_count}/{max_retries}): {error_msg}")
-                
-                if ("timeout" in error_msg.lower() or 
-                    "timed out" in error_msg.lower() or 
-                    "server disconnected" in error_msg.lower()):
-                    # 超时错误，等待更长时间再重试
-                    wait_time = 15 * retry_count
-                    self.logger.info(f"超时错误，等待 {wait_time} 秒后重试...")
-                else:
-                    # 其他错误，等待标准时间
-                    wait_time = 8 * retry_count
-                    self.logger.info(f"错误，等待 {wait_time} 秒后重试...")
-                
-                if retry_count < max_retries:
-                    time.sleep(wait_time)
-                else:
-                    # 达到最大重试次数，记录错误
-                    self.logger.error(f"生成融合总结失败，已达最大重试次数: {e}")
-                    # 出错时返回当前短期总结
-                    return current_summary
-            
+                fusion_result = self._call_gemini_with_retry(fusion_prompt, GEMINI_MODEL, "生成融合总结")
+            except Exception:
+                # 出错时返回当前短期总结
+                return current_summary
+            
+        if cached_result is None:
+            self._store_response(GEMINI_MODEL, fusion_prompt, fusion_result)
+            self._semantic_store(semantic_scope, semantic_vector, fusion_result)
         return fusion_result
     
     def get_previous_monthly_summary(self):
@@ -968,15 +1571,17 @@ class ProgressiveNewsSummarizer:
         # 构建上个月总结文件路径
         previous_monthly_summary_file = self.long_term_summary_dir / f"progressive_summary_{self.stock_code}_{previous_month.strftime('%Y%m')}.md"
         
-        # 尝试读取上个月总结
+        # 先stat检查：首次运行时文件通常不存在；空文件视为此前中断的残留写入
         try:
-            with open(previous_monthly_summary_file, 'r', encoding='utf-8') as f:
-                previous_monthly_summary = f.read()
-            print(f"读取上个月({previous_month.strftime('%Y年%m月')})渐进式总结成功")
-            return previous_monthly_summary
+            size = previous_monthly_summary_file.stat().st_size
         except FileNotFoundError:
+            size = 0
+        if size == 0:
             print(f"未找到上个月({previous_month.strftime('%Y年%m月')})的渐进式总结")
             return None
+        previous_monthly_summary = previous_monthly_summary_file.read_text(encoding='utf-8')
+        print(f"读取上个月({previous_month.strftime('%Y年%m月')})渐进式总结成功")
+        return previous_monthly_summary
     
     def save_monthly_progressive_summary(self, monthly_summary):
         """
@@ -989,85 +1594,88 @@ class ProgressiveNewsSummarizer:
             raise ValueError("请先设置日期范围")
             
         # 确保目录存在
-        self.long_term_summary_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 获取当前月份
-        current_month = self.end_date.strftime('%Y%m')
+        self._ensure_dir(self.long_term_summary_dir)
         
         # 构建保存路径
-        summary_file = self.long_term_summary_dir / f"progressive_summary_{self.stock_code}_{current_month}.md"
-        
-        # 准备要保存的内容，包括融合提示信息
-        # 检查是否存在融合提示文件
-        fusion_prompt_file = self.base_dir / "prompts" / f"fusion_prompt_{self.stock_code}_{current_month}.txt"
-        fusion_prompt_info = ""
-        
-        if fusion_prompt_file.exists():
-            try:
-                with open(fusion_prompt_file, 'r', encoding='utf-8') as f:
-                    fusion_prompt = f.read()
-                
-                # 提取融合提示中的关键信息（不包含长文本内容）
-                prompt_lines = fusion_prompt.split('\n')
-                # 提取前10行和包含"上个月的渐进式总结"和"近期短期总结"行之前的内容
-                cutoff_line = 0
-                for i, line in enumerate(prompt_lines):
-                    if "上个月的渐进式总结(PNs,t-1)：" in line:
-                        cutoff_line = i
-                        break
-                
-                # 只保留关键部分
-                if cutoff_line > 0:
-                    fusion_prompt_info = "\n\n## 融合提示信息\n\n```\n" + "\n".join(prompt_lines[:cutoff_line]) + "\n```\n"
-                    
-            except Exception as e:
-                self.logger.error(f"读取融合提示文件失败: {e}")
-        
-        # 拼接完整内容
-        formatted_summary = f"# {self.stock_name}({self.stock_code}) 月度渐进式总结\n\n"
-        formatted_summary += f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        formatted_summary += f"时间范围: 截至{self.end_date.strftime('%Y年%m月%d日')}\n"
-        
-        # 添加融合提示信息（如果有）
-        if fusion_prompt_info:
-            formatted_summary += fusion_prompt_info
+        summary_file = self._monthly_summary_path()
         
-        # 添加正文内容
-        formatted_summary += "\n\n## 渐进式总结内容\n\n"
-        formatted_summary += monthly_summary
-        
-        # 保存总结
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write(formatted_summary)
+        # 逐段写入标题、元信息与正文
+        with summary_file.open('w', encoding='utf-8') as f:
+            f.write(f"# {self.stock_name}({self.stock_code}) 月度渐进式总结\n\n")
+            f.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"时间范围: 截至{self._end_cn}\n")
+            f.write("\n\n## 渐进式总结内容\n\n")
+            f.write(monthly_summary)
             
-        self.logger.info(f"保存{self.end_date.strftime('%Y年%m月')}渐进式总结到 {summary_file}")
+        self.logger.info(f"保存{self._month_cn}渐进式总结到 {summary_file}")
         return summary_file
     
-    def save_short_term_summary(self, short_term_summary):
+    def _short_term_summary_path(self, start_date=None, end_date=None):
+        """短期总结文件路径（日期默认使用实例的日期范围）"""
+        start_date = start_date or self.start_date
+        end_date = end_date or self.end_date
+        return self.short_term_summary_dir / f"short_term_summary_{self.stock_code}_{start_date:%Y%m%d}_{end_date:%Y%m%d}.md"
+
+    def _monthly_summary_path(self):
+        """本月渐进式总结文件路径"""
+        return self.long_term_summary_dir / f"progressive_summary_{self.stock_code}_{self._month_ym}.md"
+
+    def _announcement_summary_path(self):
+        """当前日期范围的公告专项总结文件路径"""
+        return self.announcement_summary_dir / f"announcement_summary_{self.stock_code}_{self.start_date_str}_{self.end_date_str}.md"
+
+    def _announcement_prompt_path(self):
+        """当前日期范围的公告专项总结提示词文件路径"""
+        return self.base_dir / "prompts" / f"announcement_summary_prompt_{self.start_date_str}_{self.end_date_str}.md"
+
+    def _existing_short_term_path(self):
+        """当前日期范围的短期总结已存在且非空时返回其路径，否则返回None"""
+        path = self._short_term_summary_path()
+        try:
+            return path if path.stat().st_size > 0 else None
+        except FileNotFoundError:
+            return None
+
+    def _existing_monthly_path(self, short_term_path):
+        """
+        本月渐进式总结已由该短期总结融合生成时返回其路径，否则返回None
+
+        月度总结按月份命名，同月内更晚的日期范围需要重新融合，
+        因此只有其修改时间不早于短期总结时才视为已完成。
+        """
+        path = self._monthly_summary_path()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        if stat.st_size == 0 or stat.st_mtime_ns < short_term_path.stat().st_mtime_ns:
+            return None
+        return path
+
+    def save_short_term_summary(self, short_term_summary, start_date=None, end_date=None):
         """
         保存短期总结
         
         参数:
             short_term_summary: 短期总结文本
+            start_date: 开始日期(datetime)，默认使用 self.start_date
+            end_date: 结束日期(datetime)，默认使用 self.end_date
         """
-        if self.start_date is None or self.end_date is None:
+        if (start_date or self.start_date) is None or (end_date or self.end_date) is None:
             raise ValueError("请先设置日期范围")
             
         # 确保目录存在
-        self.short_term_summary_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.short_term_summary_dir)
         
         # 构建保存路径
-        start_date_str = self.start_date.strftime('%Y%m%d')
-        end_date_str = self.end_date.strftime('%Y%m%d')
-        summary_file = self.short_term_summary_dir / f"short_term_summary_{self.stock_code}_{start_date_str}_{end_date_str}.md"
+        summary_file = self._short_term_summary_path(start_date, end_date)
         
         # 保存总结
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write(short_term_summary)
+        summary_file.write_text(short_term_summary, encoding='utf-8')
             
         print(f"保存短期总结到 {summary_file}")
     
-    def process_full_pipeline(self, news_content, announcement_pdfs=None, research_pdfs=None):
+    def process_full_pipeline(self, news_content, announcement_pdfs=None, research_pdfs=None, force=False):
         """
         执行完整的渐进式总结流程
         
@@ -1075,30 +1683,43 @@ class ProgressiveNewsSummarizer:
             news_content: 新闻内容文本
             announcement_pdfs: 公告PDF文件路径列表
             research_pdfs: 研究报告PDF文件路径列表
+            force: 为True时即使已有总结文件也重新生成
             
         返回:
             (短期总结, 月度渐进式总结) 或仅短期总结
         """
-        # 1. 生成短期总结 Ns,τ
-        if self.is_date_range_mode:
-            print(f"开始生成指定日期范围({self.start_date.strftime('%Y-%m-%d')}至{self.end_date.strftime('%Y-%m-%d')})的总结...")
+        # 1. 生成短期总结 Ns,τ（已存在时直接复用，重跑不再重复调用模型）
+        existing_short_term = None if force else self._existing_short_term_path()
+        if existing_short_term:
+            self.logger.info(f"已存在短期总结文件，跳过生成: {existing_short_term}")
+            short_term_summary = existing_short_term.read_text(encoding='utf-8')
         else:
-            print(f"开始生成短期总结(Ns,τ)...")
+            if self.is_date_range_mode:
+                print(f"开始生成指定日期范围({self.start_date.strftime('%Y-%m-%d')}至{self.end_date.strftime('%Y-%m-%d')})的总结...")
+            else:
+                print(f"开始生成短期总结(Ns,τ)...")
+                
+            short_term_summary = self.generate_progressive_summary(
+                news_content, 
+                announcement_pdfs, 
+                research_pdfs
+            )
             
-        short_term_summary = self.generate_progressive_summary(
-            news_content, 
-            announcement_pdfs, 
-            research_pdfs
-        )
-        
-        # 保存短期总结
-        self.save_short_term_summary(short_term_summary)
+            # 保存短期总结
+            self.save_short_term_summary(short_term_summary)
         
         # 如果是指定日期范围模式，则不需要生成月度渐进式总结
         if self.is_date_range_mode:
             print(f"指定日期范围模式，不生成月度渐进式总结")
             return short_term_summary, None
         
+        # 已由同一份短期总结融合生成过本月总结时直接复用
+        existing_monthly = self._existing_monthly_path(existing_short_term) if existing_short_term else None
+        if existing_monthly:
+            self.logger.info(f"已存在本月渐进式总结文件，跳过融合: {existing_monthly}")
+            monthly_text = existing_monthly.read_text(encoding='utf-8')
+            return short_term_summary, monthly_text.split("## 渐进式总结内容\n\n", 1)[-1]
+        
         # 2. 获取上个月的渐进式总结 PNs,t-1
         previous_monthly_summary = self.get_previous_monthly_summary()
         
@@ -1114,30 +1735,34 @@ class ProgressiveNewsSummarizer:
         
         return short_term_summary, monthly_progressive_summary
     
-    def run(self):
-        """执行完整的Progressive News Summarizer流程"""
+    def run(self, force=False):
+        """
+        执行完整的Progressive News Summarizer流程
+
+        参数:
+            force: 为True时即使已有总结文件也重新收集并生成
+        """
         self.logger.info(f"开始为{self.stock_name}({self.stock_code})生成渐进式新闻总结...")
         
         # 1. 收集研报 - 已禁用，只记录日志
         self.logger.info("研报功能已禁用")
         report_files = []
         
-        # 2. 收集公告
-        self.logger.info("正在收集公告...")
-        announcement_files = self.collect_stock_announcements()
-        self.logger.info(f"共收集到{len(announcement_files)}份公告")
-        
-        # 3. 搜索新闻
-        self.logger.info("正在搜索新闻...")
-        news_file = self.search_stock_news_with_gemini()
+        # 2-3. 收集公告并转换Markdown，同时在后台搜索新闻（短期总结已存在时无需收集）
+        announcement_files, news_file = [], None
+        if force or self._existing_short_term_path() is None:
+            self.logger.info("正在收集公告并搜索新闻...")
+            announcement_files, news_file = self._gather_announcements_and_news()
         
         # 读取新闻内容
+        # 直接读取（文件不存在时视为没有新闻），省去先exists再open的两次文件系统访问
         news_content = ""
-        if news_file and os.path.exists(news_file):
+        if news_file:
             try:
-                with open(news_file, 'r', encoding='utf-8') as f:
-                    news_content = f.read()
+                news_content = Path(news_file).read_text(encoding='utf-8')
                 self.logger.info(f"成功读取新闻内容，长度: {len(news_content)} 字符")
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 self.logger.error(f"读取新闻文件时出错: {e}")
         
@@ -1147,7 +1772,8 @@ class ProgressiveNewsSummarizer:
             short_term_summary, monthly_summary = self.process_full_pipeline(
                 news_content=news_content,
                 announcement_pdfs=announcement_files,
-                research_pdfs=report_files  # 传递空列表
+                research_pdfs=report_files,  # 传递空列表
+                force=force
             )
             
             # 5. 打印结果信息
@@ -1162,6 +1788,32 @@ class ProgressiveNewsSummarizer:
         except Exception as e:
             self.logger.error(f"生成渐进式总结时出错: {e}")
             return None
+        finally:
+            self._wait_pending_writes()
+
+    def _read_short_term_summary(self, file_path):
+        """
+        读取一份短期总结，并解析其日期范围（供 merge_multiple_summaries 并发调用）
+
+        参数:
+            file_path: 短期总结文件路径
+
+        返回:
+            tuple: (总结内容, (开始日期, 结束日期))
+        """
+        content = Path(file_path).read_text(encoding='utf-8')
+        
+        # 尝试从文件名获取日期范围
+        file_name = os.path.basename(file_path)
+        # 从文件名中提取日期信息，预期格式如：short_term_summary_000001_20240101_20240131.md
+        match = _DATE_RANGE_FN_RE.search(file_name)
+        if match:
+            return content, (match.group(1), match.group(2))
+        # 如果文件名中没有日期信息，尝试从内容开头提取（日期范围写在标题附近）
+        date_match = _DATE_RANGE_CN_RE.search(content[:DATE_RANGE_SCAN_CHARS])
+        if date_match:
+            return content, (date_match.group(1), date_match.group(2))
+        return content, ("未知日期", "未知日期")
 
     def merge_multiple_summaries(self, summary_file_paths):
         """
@@ -1180,36 +1832,21 @@ class ProgressiveNewsSummarizer:
         # 标记为多短期总结合并模式    
         self.is_multiple_summary_mode = True
         
-        # 读取所有短期总结文件
+        # 并发读取所有短期总结文件，结果按传入顺序收集
         summaries = []
         date_ranges = []
         
-        for file_path in summary_file_paths:
+        with ThreadPoolExecutor(max_workers=min(8, len(summary_file_paths))) as executor:
+            futures = [executor.submit(self._read_short_term_summary, file_path) for file_path in summary_file_paths]
+        for file_path, future in zip(summary_file_paths, futures):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    summaries.append(content)
-                    
-                    # 尝试从文件名获取日期范围
-                    file_name = os.path.basename(file_path)
-                    # 从文件名中提取日期信息，预期格式如：short_term_summary_000001_20240101_20240131.md
-                    match = re.search(r'(\d{8})_(\d{8})', file_name)
-                    if match:
-                        start_date = match.group(1)
-                        end_date = match.group(2)
-                        date_ranges.append((start_date, end_date))
-                    else:
-                        # 如果文件名中没有日期信息，尝试从内容中提取
-                        date_match = re.search(r'(\d{4}年\d{1,2}月\d{1,2}日).*?至.*?(\d{4}年\d{1,2}月\d{1,2}日)', content)
-                        if date_match:
-                            date_ranges.append((date_match.group(1), date_match.group(2)))
-                        else:
-                            date_ranges.append(("未知日期", "未知日期"))
-                            
-                self.logger.info(f"已读取短期总结: {file_path}")
+                content, date_range = future.result()
             except Exception as e:
                 self.logger.error(f"读取短期总结文件失败: {file_path}, 错误: {e}")
                 return None
+            summaries.append(content)
+            date_ranges.append(date_range)
+            self.logger.info(f"已读取短期总结: {file_path}")
         
         self.logger.info(f"共读取 {len(summaries)} 份短期总结")
         
@@ -1229,8 +1866,6 @@ class ProgressiveNewsSummarizer:
                 pass
         
         # 构建合并总结的提示
-        MODEL = "gemini-2.5-pro"
-        
         merge_prompt = f"""你是一位专业的股票分析师，需要将{self.stock_name}({self.stock_code})的多份短期总结合并为一份长期渐进式总结。
 
 这些短期总结涵盖了不同时间段内的信息，你需要将它们整合成一份完整的长期历史渐进式总结(PNs,t-1)。
@@ -1262,102 +1897,249 @@ class ProgressiveNewsSummarizer:
         # 保存合并提示到文件
         timestamp = datetime.now().strftime('%Y%m%d')
         prompt_dir = self.base_dir / "prompts"
-        prompt_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(prompt_dir)
         
         # 保存完整提示文件（用于调试）
         full_prompt_file = prompt_dir / f"merge_prompt_full_{self.stock_code}_{timestamp}.txt"
-        with open(full_prompt_file, 'w', encoding='utf-8') as f:
-            f.write(merge_prompt)
-        self.logger.info(f"完整合并提示已保存到: {full_prompt_file}")
+        self._save_prompt_async(full_prompt_file, merge_prompt, "完整合并提示")
         
         # 保存简化版提示文件（不包含短期总结内容，用于记录）
+        simple_prompt = "将多份短期总结合并为一份长期渐进式总结\n\n"
         simple_prompt_parts = merge_prompt.split("以下是需要合并的")
         if len(simple_prompt_parts) > 1:
             simple_prompt = simple_prompt_parts[0] + f"以下是需要合并的{len(summaries)}份短期总结...\n\n请基于以上所有短期总结，生成一份全面、专业的长期渐进式总结..."
             simple_prompt_file = prompt_dir / f"merge_prompt_{self.stock_code}_{timestamp}.txt"
-            with open(simple_prompt_file, 'w', encoding='utf-8') as f:
-                f.write(simple_prompt)
-            self.logger.info(f"简化合并提示已保存到: {simple_prompt_file}")
+            self._save_prompt_async(simple_prompt_file, simple_prompt, "简化合并提示")
         
         try:
-            # 记录时间范围
-            self.start_date_str = overall_start_date.replace("年", "").replace("月", "").replace("日", "") if "年" in overall_start_date else overall_start_date
-            self.end_date_str = overall_end_date.replace("年", "").replace("月", "").replace("日", "") if "年" in overall_end_date else overall_end_date
-            
-            # 生成合并总结，使用重试机制
-            max_retries = 3
-            retry_count = 0
-            merged_summary = ""
-            
-            while retry_count < max_retries and not merged_summary:
+            # 生成合并总结，使用重试机制（相同提示词命中缓存时跳过调用）
+            cached_merge = self._cached_response(GEMINI_MODEL, merge_prompt)
+            if cached_merge is not None:
+                merged_summary = cached_merge
+            else:
                 try:
-                    self.logger.info(f"调用Gemini API合并多份短期总结 (尝试 {retry_count+1}/{max_retries})...")
-                    # 生成内容
-                    response = self.client.models.generate_content_stream(
-                        model=MODEL,
-                        contents=merge_prompt
-                    )
-                    
-                    # 获取响应文本
-                    for chunk in response:
-                        if chunk.candidates and chunk.candidates[0].content and chunk.candidates[0].content.parts:
-                            for part in chunk.candidates[0].content.parts:
-                                if hasattr(part, 'text') and part.text:
-                                    merged_summary += part.text
-                    
-                    self.logger.info(f"成功生成合并总结，长度: {len(merged_summary)} 字符")
-                    
-                except Exception as e:
-                    retry_count += 1
-                    error_msg = str(e)
-                    self.logger.warning(f"合并总结失败 (尝试 {retry_count}/{max_retries}): {error_msg}")
-                    
-                    if ("timeout" in error_msg.lower() or 
-                        "timed out" in error_msg.lower() or 
-                        "server disconnected" in error_msg.lower()):
-                        # 超时错误，等待更长时间再重试
-                        wait_time = 15 * retry_count
-                        self.logger.info(f"超时错误，等待 {wait_time} 秒后重试...")
-                    else:
-                        # 其他错误，等待标准时间
-                        wait_time = 8 * retry_count
-                        self.logger.info(f"错误，等待 {wait_time} 秒后重试...")
-                    
-                    if retry_count < max_retries:
-                        time.sleep(wait_time)
-                    else:
-                        # 达到最大重试次数，记录错误
-                        self.logger.error(f"合并总结失败，已达最大重试次数: {e}")
-                        return None
-            
-            # 准备要保存的内容
-            formatted_summary = f"# {self.stock_name}({self.stock_code}) 多短期总结合并报告\n\n"
-            formatted_summary += f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            formatted_summary += f"时间范围: {overall_start_date}至{overall_end_date}\n"
-            formatted_summary += f"合并文件数: {len(summaries)}\n\n"
+                    merged_summary = self._call_gemini_with_retry(merge_prompt, GEMINI_MODEL, "合并多份短期总结")
+                except Exception:
+                    return None
             
-            # 添加简化的提示信息
-            formatted_summary += "## 合并任务说明\n\n"
-            formatted_summary += simple_prompt if 'simple_prompt' in locals() else "将多份短期总结合并为一份长期渐进式总结\n\n"
+            if cached_merge is None:
+                self._store_response(GEMINI_MODEL, merge_prompt, merged_summary)
             
-            # 添加正文内容
-            formatted_summary += "\n\n## 合并总结内容\n\n"
-            formatted_summary += merged_summary
-            
-            # 保存合并总结
+            # 保存合并总结：逐段写入文件，不再拼接出完整报告的第二份副本
             merged_file_path = self.long_term_summary_dir / f"merged_summary_{self.stock_code}_{timestamp}.md"
-            self.long_term_summary_dir.mkdir(parents=True, exist_ok=True)
-            with open(merged_file_path, 'w', encoding='utf-8') as f:
-                f.write(formatted_summary)
+            self._ensure_dir(self.long_term_summary_dir)
+            with merged_file_path.open('w', encoding='utf-8') as f:
+                f.write(f"# {self.stock_name}({self.stock_code}) 多短期总结合并报告\n\n")
+                f.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+                f.write(f"时间范围: {overall_start_date}至{overall_end_date}\n")
+                f.write(f"合并文件数: {len(summaries)}\n\n")
+                # 简化的提示信息
+                f.write("## 合并任务说明\n\n")
+                f.write(simple_prompt)
+                # 正文内容
+                f.write("\n\n## 合并总结内容\n\n")
+                f.write(merged_summary)
             
             self.logger.info(f"多份短期总结合并完成，已保存至: {merged_file_path}")
             
-            return formatted_summary
+            return merged_summary
             
         except Exception as e:
             self.logger.error(f"合并多份短期总结时出错: {e}")
             return None
 
+    def _prepare_segment(self, index, total, seg_start, seg_end):
+        """
+        收集单个时间段的公告与新闻（供 process_long_period 并发调用，不修改实例上的日期状态）
+
+        参数:
+            index: 时间段序号（从0开始）
+            total: 时间段总数
+            seg_start: 时间段开始日期(datetime)
+            seg_end: 时间段结束日期(datetime)
+
+        返回:
+            str: 已存在的短期总结文件路径
+            dict: 待生成时间段的材料（start/end/news_content/announcement_files/pdfs_markdown）
+            None: 收集失败
+        """
+        seg_label = f"{seg_start.strftime('%Y-%m-%d')}至{seg_end.strftime('%Y-%m-%d')}"
+        self.logger.info(f"处理第{index+1}/{total}个时间段: {seg_label}")
+
+        # 构建短期总结文件路径
+        summary_file = self._short_term_summary_path(seg_start, seg_end)
+        
+        # 检查是否已存在短期总结文件
+        if summary_file.exists():
+            self.logger.info(f"已存在短期总结文件，跳过处理: {summary_file}")
+            return str(summary_file)
+        
+        # 收集研报 - 已禁用
+        self.logger.info(f"研报功能已禁用")
+        
+        # 收集公告，同时在后台搜索新闻
+        self.logger.info(f"收集{seg_label}的公告与新闻...")
+        announcement_files, news_file = self._gather_announcements_and_news(seg_start, seg_end)
+        
+        # 读取新闻内容（未获取到新闻文件时跳过该时间段）
+        try:
+            if not news_file:
+                raise FileNotFoundError(news_file)
+            news_content = Path(news_file).read_text(encoding='utf-8')
+            self.logger.info(f"成功读取新闻内容，长度: {len(news_content)} 字符")
+        except FileNotFoundError:
+            self.logger.error(f"未能获取新闻，跳过时间段: {seg_label}")
+            return None
+        except Exception as e:
+            self.logger.error(f"读取新闻文件时出错: {e}")
+            return None
+        
+        news_content, pdfs_markdown = self._prepare_summary_inputs(news_content, announcement_files)
+        return {
+            "start": seg_start,
+            "end": seg_end,
+            "news_content": news_content,
+            "announcement_files": announcement_files,
+            "pdfs_markdown": pdfs_markdown,
+        }
+
+    def _abort_on_network_error(self, e):
+        """Gemini API或HTTP连接错误（包括被包装为ValueError的情况）时终止程序"""
+        if isinstance(e, _GEMINI_NETWORK_ERRORS) or isinstance(e.__cause__, _GEMINI_NETWORK_ERRORS):
+            self.logger.critical(f"遇到Gemini API或网络连接错误，程序终止")
+            sys.exit(1)  # 遇到API或网络错误时直接退出
+
+    def _generate_segment(self, segment):
+        """
+        为单个时间段生成并保存短期总结
+
+        参数:
+            segment: _prepare_segment 返回的时间段材料
+
+        返回:
+            str | None: 短期总结文件路径，失败时返回None
+        """
+        seg_start, seg_end = segment["start"], segment["end"]
+        self.logger.info(f"生成{seg_start.strftime('%Y-%m-%d')}至{seg_end.strftime('%Y-%m-%d')}的短期总结...")
+        try:
+            short_term_summary = self.generate_progressive_summary(
+                news_content=segment["news_content"],
+                announcement_pdfs=segment["announcement_files"],
+                research_pdfs=[],
+                start_date=seg_start,
+                end_date=seg_end
+            )
+        except Exception as e:
+            self.logger.error(f"生成短期总结时出错: {e}")
+            self._abort_on_network_error(e)
+            return None
+        return self._save_segment_summary(segment, short_term_summary)
+
+    def _save_segment_summary(self, segment, short_term_summary):
+        """保存单个时间段的短期总结，返回文件路径"""
+        summary_file = self._short_term_summary_path(segment["start"], segment["end"])
+        summary_file.write_text(short_term_summary, encoding='utf-8')
+        self.logger.info(f"短期总结已保存至: {summary_file}")
+        return str(summary_file)
+
+    def _generate_segment_batch(self, segments):
+        """
+        在一次Gemini调用中为多个互不重叠的时间段生成短期总结
+
+        参数:
+            segments: _prepare_segment 返回的时间段材料列表（按时间顺序）
+
+        返回:
+            list[str] | None: 与 segments 一一对应的总结文本；输出无法按时间段拆分时返回None
+        """
+        keys = [(seg["start"].strftime("%Y%m%d"), seg["end"].strftime("%Y%m%d")) for seg in segments]
+        instructions = DATE_RANGE_SUMMARY_INSTRUCTIONS if self.is_date_range_mode else SHORT_TERM_SUMMARY_INSTRUCTIONS
+        prompt_parts = [instructions, f"""
+分析对象：{self.stock_name}({self.stock_code})
+以下材料涵盖{len(segments)}个互不重叠的时间段。请对每个时间段分别、独立地完成上述分析，不要混用其他时间段的信息。
+每个时间段的总结必须以单独一行的标题开头，格式为“## Segment 开始日期-结束日期”（8位数字日期，与下方材料标题一致），按时间顺序输出；除这些标题外不要输出以“## Segment”开头的行。
+"""]
+        for seg, (start_str, end_str) in zip(segments, keys):
+            prompt_parts.append(f"""
+===== Segment {start_str}-{end_str}（{seg['start'].strftime('%Y年%m月%d日')}至{seg['end'].strftime('%Y年%m月%d日')}） =====
+
+以下是PDF文档摘要:
+{seg['pdfs_markdown']}
+
+以下是新闻内容:
+{seg['news_content']}
+""")
+        prompt_parts.append("\n最终为每个时间段分别形成一份专业、全面的总结，同时你需要保持中文回复。\n")
+        prompt = "".join(prompt_parts)
+
+        prompt_file = self.base_dir / "prompts" / f"summary_prompt_batch_{keys[0][0]}_{keys[-1][1]}.txt"
+        self._ensure_dir(prompt_file.parent)
+        self._save_prompt_async(prompt_file, prompt, "批量总结提示")
+
+        response = self._cached_response(GEMINI_MODEL, prompt)
+        cached = response is not None
+        if not cached:
+            try:
+                # 输出被截断时最后一个时间段只有半截，不能当作完整总结保存
+                response = self._call_gemini_with_retry(
+                    prompt, GEMINI_MODEL, f"批量生成{len(segments)}个时间段的总结",
+                    retry_on=(errors.APIError, httpx.TransportError), require_complete=True
+                )
+            except (errors.APIError, httpx.TransportError) as e:
+                raise ValueError(f"批量生成总结失败，已达最大重试次数: {e}") from e
+
+        # re.split 结果为 [前言, 开始1, 结束1, 正文1, 开始2, 结束2, 正文2, ...]
+        pieces = _SEGMENT_HEADER_RE.split(response)
+        sections = {(pieces[i], pieces[i + 1]): pieces[i + 2].strip() for i in range(1, len(pieces) - 2, 3)}
+        summaries = [sections.get(key) for key in keys]
+        if not all(summaries):
+            return None
+        if not cached:
+            self._store_response(GEMINI_MODEL, prompt, response)
+        return summaries
+
+    def _summarize_segment_group(self, segments):
+        """
+        生成一组相邻时间段的短期总结：先逐段查语义缓存，其余时间段合并为一次调用，失败或无法拆分时逐段生成
+
+        参数:
+            segments: _prepare_segment 返回的时间段材料列表
+
+        返回:
+            list: 与 segments 一一对应的短期总结文件路径（失败为None）
+        """
+        if len(segments) == 1:
+            return [self._generate_segment(segments[0])]
+
+        paths = [None] * len(segments)
+        scopes = [self._summary_semantic_scope(seg["start"], seg["end"], seg["pdfs_markdown"]) for seg in segments]
+        vectors = {}
+        remaining = []
+        for i, seg in enumerate(segments):
+            vector, cached = self._semantic_cached_response(scopes[i], seg["news_content"])
+            if cached is not None:
+                paths[i] = self._save_segment_summary(seg, cached)
+                continue
+            vectors[i] = vector
+            remaining.append(i)
+
+        if len(remaining) > 1:
+            try:
+                summaries = self._generate_segment_batch([segments[i] for i in remaining])
+            except Exception as e:
+                self.logger.error(f"批量生成短期总结时出错: {e}")
+                self._abort_on_network_error(e)
+                summaries = None
+            if summaries is not None:
+                for i, text in zip(remaining, summaries):
+                    self._semantic_store(scopes[i], vectors[i], text)
+                    paths[i] = self._save_segment_summary(segments[i], text)
+                return paths
+            self.logger.warning(f"{len(remaining)}个时间段的合并输出无法按时间段拆分，改为逐段生成")
+        for i in remaining:
+            paths[i] = self._generate_segment(segments[i])
+        return paths
+
     def process_long_period(self, interval_days=90):
         """
         将长时期分成多个间隔，生成多个短期总结后合并为一个长期渐进式总结
@@ -1388,94 +2170,40 @@ class ProgressiveNewsSummarizer:
             
         self.logger.info(f"共分成{len(segments)}个时间段进行处理")
         
-        # 生成每个时间段的短期总结
-        summary_files = []
-        
-        for i, (seg_start, seg_end) in enumerate(segments):
-            self.logger.info(f"处理第{i+1}/{len(segments)}个时间段: {seg_start.strftime('%Y-%m-%d')}至{seg_end.strftime('%Y-%m-%d')}")
-            
-            # 保存原始日期设置
-            orig_start = self.start_date
-            orig_end = self.end_date
-            orig_start_str = self.start_date_str
-            orig_end_str = self.end_date_str
-            
+        # 各时间段互不依赖：先并发收集材料，再把相邻的小时间段打包为一次调用，并发生成
+        workers = min(LONG_PERIOD_SEGMENT_WORKERS, len(segments)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             try:
-                # 设置新的日期范围
-                self.start_date = seg_start
-                self.end_date = seg_end
-                self.start_date_str = seg_start.strftime("%Y%m%d")
-                self.end_date_str = seg_end.strftime("%Y%m%d")
-                
-                # 构建短期总结文件路径
-                summary_file = self.short_term_summary_dir / f"short_term_summary_{self.stock_code}_{self.start_date_str}_{self.end_date_str}.md"
-                
-                # 检查是否已存在短期总结文件
-                if summary_file.exists():
-                    self.logger.info(f"已存在短期总结文件，跳过处理: {summary_file}")
-                    summary_files.append(str(summary_file))
-                    continue
-                
-                # 收集研报 - 已禁用
-                self.logger.info(f"研报功能已禁用")
-                report_files = []
-                
-                # 收集公告
-                self.logger.info(f"收集{seg_start.strftime('%Y-%m-%d')}至{seg_end.strftime('%Y-%m-%d')}的公告...")
-                announcement_files = self.collect_stock_announcements()
-                self.logger.info(f"共收集到{len(announcement_files)}份公告")
-                
-                # 搜索新闻
-                self.logger.info(f"搜索{seg_start.strftime('%Y-%m-%d')}至{seg_end.strftime('%Y-%m-%d')}的新闻...")
-                news_file = self.search_stock_news_with_gemini()
-                
-                # 检查是否成功获取新闻
-                if not news_file or not os.path.exists(news_file):
-                    self.logger.error(f"未能获取新闻，跳过当前时间段")
-                    continue
+                prepared = list(executor.map(
+                    lambda item: self._prepare_segment(item[0], len(segments), *item[1]), enumerate(segments)
+                ))
                 
-                # 读取新闻内容
-                news_content = ""
-                try:
-                    with open(news_file, 'r', encoding='utf-8') as f:
-                        news_content = f.read()
-                    self.logger.info(f"成功读取新闻内容，长度: {len(news_content)} 字符")
-                except Exception as e:
-                    self.logger.error(f"读取新闻文件时出错: {e}")
-                    continue
-                
-                # 生成短期总结
-                self.logger.info(f"生成{seg_start.strftime('%Y-%m-%d')}至{seg_end.strftime('%Y-%m-%d')}的短期总结...")
+                # 贪心打包：累计材料长度不超过 SEGMENT_BATCH_MAX_CHARS 的相邻时间段合为一组
+                pending = [item for item in prepared if isinstance(item, dict)]
+                groups, group_chars = [], 0
+                for item in pending:
+                    item_chars = len(item["news_content"]) + len(item["pdfs_markdown"])
+                    if (groups and len(groups[-1]) < SEGMENT_BATCH_MAX_SEGMENTS
+                            and group_chars + item_chars <= SEGMENT_BATCH_MAX_CHARS):
+                        groups[-1].append(item)
+                        group_chars += item_chars
+                    else:
+                        groups.append([item])
+                        group_chars = item_chars
+                if groups:
+                    self.logger.info(f"{len(pending)}个待生成时间段打包为{len(groups)}次调用")
                 
-                try:
-                    short_term_summary = self.generate_progressive_summary(
-                        news_content=news_content,
-                        announcement_pdfs=announcement_files,
-                        research_pdfs=report_files
-                    )
-                    
-                    # 保存短期总结
-                    with open(summary_file, 'w', encoding='utf-8') as f:
-                        f.write(short_term_summary)
-                    
-                    self.logger.info(f"短期总结已保存至: {summary_file}")
-                    summary_files.append(str(summary_file))
-                    
-                except Exception as e:
-                    self.logger.error(f"生成短期总结时出错: {e}")
-                    # 检查是否为Gemini API错误或HTTP连接错误
-                    error_str = str(e).lower()
-                    if "server disconnected" in error_str or "api" in error_str or "http" in error_str or "timeout" in error_str or "connection" in error_str or "The read operation timed out" in error_str:
-                        self.logger.critical(f"遇到Gemini API或网络连接错误，程序终止")
-                        sys.exit(1)  # 遇到API或网络错误时直接退出
-                    continue
-                    
-            finally:
-                # 恢复原始日期设置
-                self.start_date = orig_start
-                self.end_date = orig_end
-                self.start_date_str = orig_start_str
-                self.end_date_str = orig_end_str
+                futures = [executor.submit(self._summarize_segment_group, group) for group in groups]
+                generated = iter([path for future in futures for path in future.result()])
+            except SystemExit:
+                # 某个时间段遇到API或网络错误要求终止，不再启动尚未开始的时间段
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        
+        # 按时间顺序收集结果（已存在的文件与新生成的文件交错）
+        summary_files = [
+            path for path in (next(generated) if isinstance(item, dict) else item for item in prepared) if path
+        ]
         
         # 检查是否有足够的短期总结
         if len(summary_files) == 0:
@@ -1505,7 +2233,7 @@ class ProgressiveNewsSummarizer:
             announcement_pdfs: 公告PDF文件路径列表
             
         返回:
-            生成的公告总结
+            生成的公告总结；模型调用当前已停用，只保存提示词文件，此时返回None
         """
         # 验证参数
         if self.start_date is None or self.end_date is None:
@@ -1513,153 +2241,71 @@ class ProgressiveNewsSummarizer:
             
         # 创建Markdown转换输出文件夹
         markdown_dir = self.base_dir / "markdown_files"
-        markdown_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(markdown_dir)
         
-        # 将PDF文件转换为Markdown文本
-        all_pdfs_markdown = ""
-        pdf_files_count = 0
+        # 将PDF文件转换为Markdown文本（各片段先放入列表，最后一次性拼接）
+        md_parts = []
+        processed_pdfs = []  # 成功转换并写入提示词的公告文件名
         
         try:
             # 处理公告PDF
             if announcement_pdfs:
                 self.logger.info(f"处理公告PDF文件，共{len(announcement_pdfs)}个")
-                all_pdfs_markdown += "\n## 公司公告\n\n"
+                md_parts.append("\n## 公司公告\n\n")
                 
+                # 缓存命中的直接读取，其余在进程池中并行转换；结果只包含存在且转换成功的PDF
+                markdown_by_pdf = self._convert_pdfs_to_markdown(
+                    announcement_pdfs, markdown_dir, max_chars=ANNOUNCEMENT_SUMMARY_READ_CHARS
+                )
+                # 按输入顺序拼接
                 for pdf_path in announcement_pdfs:
-                    if os.path.exists(pdf_path):
-                        pdf_name = Path(pdf_path).name
-                        # 构建Markdown缓存文件路径
-                        markdown_file_path = markdown_dir / f"{Path(pdf_path).stem}.md"
-                        
-                        # 检查是否已存在缓存的Markdown文件
-                        if markdown_file_path.exists():
-                            self.logger.info(f"使用缓存的Markdown: {markdown_file_path}")
-                            with open(markdown_file_path, 'r', encoding='utf-8') as f:
-                                markdown_text = f.read()
-                        else:
-                            # 转换PDF为Markdown
-                            self.logger.info(f"将PDF转换为Markdown: {pdf_path}")
-                            try:
-                                markdown_text = basic_convert(pdf_path, output_dir=str(markdown_dir))
-                                if not markdown_text:
-                                    self.logger.error(f"PDF转Markdown失败: {pdf_path}")
-                                    continue
-                            except Exception as e:
-                                self.logger.error(f"PDF转Markdown过程出错: {pdf_path}, {e}")
-                                continue
-                        
-                        # 添加公告标题
-                        all_pdfs_markdown += f"### {pdf_name}\n\n"
-                        # 添加摘要版本的Markdown内容（最多5000字符）
-                        truncated_text = markdown_text[:50000]
-                        if len(markdown_text) > 50000:
-                            truncated_text += "...(内容已截断)"
-                        all_pdfs_markdown += truncated_text + "\n\n---\n\n"
-                        pdf_files_count += 1
+                    markdown_text = markdown_by_pdf.get(pdf_path)
+                    if not markdown_text:
+                        continue
+                    
+                    # 添加公告标题
+                    pdf_name = Path(pdf_path).name
+                    processed_pdfs.append(pdf_name)
+                    md_parts.append(f"### {pdf_name}\n\n")
+                    # 添加摘要版本的Markdown内容（最多50000字符）
+                    md_parts.append(markdown_text[:50000])
+                    if len(markdown_text) > 50000:
+                        md_parts.append(_MARKDOWN_TRUNCATION_MARK)
+                    md_parts.append(_MARKDOWN_SECTION_SEP)
             
             # 如果有PDF文件，添加提示说明
-            if pdf_files_count > 0:
-                all_pdfs_markdown = f"# {self.stock_name}({self.stock_code}) 公司公告摘要\n\n" + \
-                                   f"共{pdf_files_count}个公告PDF文件转换为Markdown格式\n\n" + \
-                                   all_pdfs_markdown
+            if processed_pdfs:
+                header = [
+                    f"# {self.stock_name}({self.stock_code}) 公司公告摘要\n\n",
+                    f"共{len(processed_pdfs)}个公告PDF文件转换为Markdown格式\n\n",
+                ]
             else:
                 self.logger.warning(f"未找到任何公告PDF文件")
                 return "未找到指定日期范围内的公司公告文件。"
             
             # 构建提示词
-            time_description = f"在{self.start_date.strftime('%Y年%m月%d日')}至{self.end_date.strftime('%Y年%m月%d日')}期间"
-            # 公告分类处理prompt
-            prompt = f"""
-            下述内容是{self.stock_name}({self.stock_code}){time_description}发布公告Markdown内容：
-            
-            ===========================================公告内容开始==========================================
-            {all_pdfs_markdown}
-            ===========================================公告内容结束==========================================
-            
-            请将上述公告内容，按以下规则处理：
-
-            【分类处理规则】
-            1. 常规公告（分红/日常交易）：
-               - 提取：执行日期、金额基准、对比往期变化率
-               - 模板：■ 年度分红预案：每股X元（同比+Y%），股权登记日date
-
-            2. 重大事项公告（并购/诉讼/重组）：
-               - 必须解析：
-                 a. 事项进展阶段（筹划/实施/完成）
-                 b. 对资产负债表的具体影响科目
-                 c. 风险提示中的关键参数（如赔偿上限）
-               - 模板：⚠️ 重大诉讼进展：涉诉金额amount（占Q3净利润ratio%），预计计提负债科目"account"
-
-            3. 财务报告公告：
-               - 联动财报模块分析结果，仅保留：
-                 a. 关键指标超预期幅度（vs 分析师共识预期）
-                 b. 管理层指引变化（用diff算法比对往期表述）
-                 c. 审计意见类型变更
-
-            【输出要求】
-            - 按时间倒序排列
-            - 每条公告添加影响系数标签：
-               🔵 短期操作影响（涉及交易日期） 
-               🟠 中期财务影响（影响未来1-2季报）
-               🔴 长期战略影响（改变业务模式）
-                
-            【示例】
-            🔴 **长期战略影响**
-                *   **公告日期:** 2021-02-02
-                *   **事项:** 子公司xxxIPO申请进展。
-                *   **摘要:** ⚠️ 子公司IPO进展：控股子公司xx首发申请获上海证券交易所科创板上市委员会审议通过（实施阶段）。此举可能影响公司资产结构和估值，但尚需证监会注册，存在不确定性。
-            """
-            
-            MODEL = "gemini-2.5-pro"
+            time_description = f"在{self._start_cn}至{self._end_cn}期间"
+            # 公告分类处理prompt：公告内容很大，不拼成一整个字符串，而是与前后的固定文本依次写入文件
+            prompt_head = _ANNOUNCEMENT_PROMPT_HEAD_TEMPLATE.format(
+                stock_name=self.stock_name, stock_code=self.stock_code, time_description=time_description
+            )
             
             # 保存生成的prompt到文件
-            prompt_file = self.base_dir / "prompts" / f"announcement_summary_prompt_{self.start_date_str}_{self.end_date_str}.md"
-            prompt_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(prompt_file, 'w', encoding='utf-8') as f:
-                f.write(prompt)
+            prompt_file = self._announcement_prompt_path()
+            self._ensure_dir(prompt_file.parent)
+            with prompt_file.open('w', encoding='utf-8') as f:
+                f.write(prompt_head)
+                f.writelines(header)
+                f.writelines(md_parts)
+                f.write(ANNOUNCEMENT_SUMMARY_RULES)
             self.logger.info(f"公告总结提示已保存到: {prompt_file}")
             
-        #     # 使用Gemini API生成总结，带重试机制
-        #     max_retries = 3
-        #     retry_count = 0
-        #     summary = ""
-            
-        #     while retry_count < max_retries and not summary:
-        #         try:
-        #             self.logger.info(f"调用Gemini API生成公告总结 (尝试 {retry_count+1}/{max_retries})...")
-        #             # 使用文本提示
-        #             for chunk in self.client.models.generate_content_stream(
-        #                 model=MODEL,
-        #                 contents=prompt
-        #             ):
-        #                 if chunk.text:
-        #                     summary += chunk.text
-                    
-        #             self.logger.info(f"成功生成公告总结，长度: {len(summary)} 字符")
-                    
-        #         except errors.APIError as e:
-        #             retry_count += 1
-        #             error_msg = e.message
-        #             self.logger.warning(f"生成公告总结失败 (尝试 {retry_count}/{max_retries}): {error_msg}:{e.code}")
-                    
-        #             if ("timeout" in error_msg.lower() or 
-        #                 "timed out" in error_msg.lower() or 
-        #                 "server disconnected" in error_msg.lower()):
-        #                 # 超时错误，等待更长时间再重试
-        #                 wait_time = 15 * retry_count
-        #                 self.logger.info(f"超时错误，等待 {wait_time} 秒后重试...")
-        #             else:
-        #                 # 其他错误，等待标准时间
-        #                 wait_time = 8 * retry_count
-        #                 self.logger.info(f"错误，等待 {wait_time} 秒后重试...")
-                    
-        #             if retry_count < max_retries:
-        #                 time.sleep(wait_time)
-        #             else:
-        #                 # 达到最大重试次数，记录错误
-        #                 self.logger.error(f"生成公告总结失败，已达最大重试次数: {e}")
-        #                 raise ValueError(f"生成公告总结失败，已达最大重试次数: {e}")
-            
+        #     # 使用Gemini API生成总结：走统一的重试辅助函数，流式输出写入StringIO缓冲区（不做 summary += chunk.text 的反复拼接）
+        #     prompt = "".join([prompt_head, *header, *md_parts, ANNOUNCEMENT_SUMMARY_RULES])
+        #     try:
+        #         summary = self._call_gemini_with_retry(prompt, GEMINI_MODEL, "生成公告总结", retry_on=(errors.APIError,))
+        #     except errors.APIError as e:
+        #         raise ValueError(f"生成公告总结失败，已达最大重试次数: {e}") from e
         #     return summary
             
         except Exception as e:
@@ -1671,26 +2317,59 @@ class ProgressiveNewsSummarizer:
         保存公告专项总结
         
         参数:
-            announcement_summary: 公告总结文本
+            announcement_summary: 公告总结文本；为None时（只生成了提示词）不写文件
+
+        返回:
+            Path | None: 总结文件路径，未保存时返回None
         """
         if self.start_date is None or self.end_date is None:
             raise ValueError("请先设置日期范围")
+
+        if announcement_summary is None:
+            self.logger.warning(
+                f"公告总结的模型调用已停用，未生成总结，仅保存了提示词: {self._announcement_prompt_path()}"
+            )
+            return None
             
         # 确保目录存在
-        self.announcement_summary_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.announcement_summary_dir)
         
         # 构建保存路径
-        start_date_str = self.start_date.strftime('%Y%m%d')
-        end_date_str = self.end_date.strftime('%Y%m%d')
-        summary_file = self.announcement_summary_dir / f"announcement_summary_{self.stock_code}_{start_date_str}_{end_date_str}.md"
+        summary_file = self._announcement_summary_path()
         
         # 保存总结
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write(announcement_summary)
+        summary_file.write_bytes(announcement_summary.encode('utf-8'))
             
         self.logger.info(f"保存公告专项总结到 {summary_file}")
         return summary_file
 
+def _run_batch_stock(stock, args):
+    """
+    批量模式下处理单只股票（供 main 的线程池调用）
+
+    参数:
+        stock: 包含 code/name/market 的字典
+        args: 命令行参数
+
+    返回:
+        tuple: (股票代码, run() 的结果)
+    """
+    summarizer = ProgressiveNewsSummarizer(
+        stock["code"], stock["name"], stock["market"], days=args.days,
+        start_date=args.start_date, end_date=args.end_date
+    )
+    summarizer.logger.info(f"开始处理: {stock['name']}({stock['code']})...")
+    try:
+        result = summarizer.run(force=args.force)
+    finally:
+        summarizer.close()
+    if result:
+        summarizer.logger.info(f"{stock['name']}({stock['code']})处理完成")
+    else:
+        summarizer.logger.error(f"{stock['name']}({stock['code']})处理失败")
+    return stock["code"], result
+
+
 def main():
     """主函数"""
     # 创建命令行参数解析器
@@ -1724,6 +2403,9 @@ def main():
     # 添加只获取新闻的模式
     parser.add_argument("--news_only", action="store_true", help="只获取指定时间内的新闻，不生成总结")
     
+    # 强制重新生成
+    parser.add_argument("--force", action="store_true", help="即使已存在短期/月度总结文件也重新生成")
+    
     args = parser.parse_args()
     
     # 初始化日志记录器
@@ -1767,7 +2449,8 @@ def main():
             # 保存公告专项总结
             summary_file = summarizer.save_announcement_summary(announcement_summary)
             
-            logger.info(f"公告专项总结生成完成，已保存至: {summary_file}")
+            if summary_file is not None:
+                logger.info(f"公告专项总结生成完成，已保存至: {summary_file}")
             return
             
         except Exception as e:
@@ -1813,11 +2496,9 @@ def main():
         
         # 读取文件内容
         try:
-            with open(args.current_summary_file, 'r', encoding='utf-8') as f:
-                current_summary = f.read()
+            current_summary = Path(args.current_summary_file).read_text(encoding='utf-8')
                 
-            with open(args.previous_summary_file, 'r', encoding='utf-8') as f:
-                previous_summary = f.read()
+            previous_summary = Path(args.previous_summary_file).read_text(encoding='utf-8')
                 
             # 创建ProgressiveNewsSummarizer实例
             summarizer = ProgressiveNewsSummarizer(
@@ -1835,8 +2516,7 @@ def main():
             current_date = datetime.now().strftime('%Y%m%d')
             fusion_file = summarizer.long_term_summary_dir / f"fusion_summary_{args.code}_{current_date}.md"
             
-            with open(fusion_file, 'w', encoding='utf-8') as f:
-                f.write(fusion_result)
+            fusion_file.write_text(fusion_result, encoding='utf-8')
                 
             logger.info(f"融合完成，结果已保存至: {fusion_file}")
             return
@@ -1906,21 +2586,15 @@ def main():
             {"code": "002027", "name": "分众传媒", "market": "A股"},
         ]
         
+        # 各股票互不依赖，耗时主要在Gemini与巨潮的网络请求上，用线程池并发处理
+        # （共享的Gemini客户端可跨线程复用；每只股票使用各自的日志记录器）
         results = {}
-        for stock in stocks:
-            # 为每只股票创建新的日志记录器
-            stock_logger = setup_logging(stock["code"], stock["name"], args.start_date, args.end_date)
-            stock_logger.info(f"开始处理: {stock['name']}({stock['code']})...")
-            summarizer = ProgressiveNewsSummarizer(
-                stock["code"], stock["name"], stock["market"], days=args.days,
-                start_date=args.start_date, end_date=args.end_date
-            )
-            result = summarizer.run()
-            if result:
-                results[stock["code"]] = result
-                stock_logger.info(f"{stock['name']}({stock['code']})处理完成")
-            else:
-                stock_logger.error(f"{stock['name']}({stock['code']})处理失败")
+        with ThreadPoolExecutor(max_workers=BATCH_STOCK_WORKERS) as executor:
+            futures = [executor.submit(_run_batch_stock, stock, args) for stock in stocks]
+            for future in as_completed(futures):
+                code, result = future.result()
+                if result:
+                    results[code] = result
             
         logger.info(f"批量处理完成，共处理{len(results)}/{len(stocks)}只股票")
     else:
@@ -1930,7 +2604,7 @@ def main():
             args.code, args.name, args.market, days=args.days,
             start_date=args.start_date, end_date=args.end_date
         )
-        result = summarizer.run()
+        result = summarizer.run(force=args.force)
         if result:
             logger.info(f"{args.name}({args.code})处理成功")
         else:
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+公告摘要的语义近似缓存。
+
+回购进展、质押变动等模板化公告的正文高度相似，仅日期/金额不同。本模块对截断后的
+公告 Markdown 计算向量，按股票维度做余弦相似检索；相似度超过阈值时，调用方可用
+廉价模型只改写缓存摘要中的数字与日期，而不必重新调用长文档模型。
+
+向量矩阵保存在 `CacheKind.LLM_RESPONSES` 目录下的 semantic/embeddings.npy，
+对应的摘要与元信息保存在 semantic/entries.json。通过环境变量
+DISCLOSURE_SEMANTIC_CACHE=1 开启。
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from news.llm_cache import cache_dir
+
+EMBEDDING_MODEL = "text-embedding-v3"
+REWRITE_MODEL = "qwen-turbo"
+SIMILARITY_THRESHOLD = 0.95
+MAX_ENTRIES = 10000
+EMBED_INPUT_CHARS = 4000
+
+_CACHE: Optional["SemanticSummaryCache"] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return os.getenv("DISCLOSURE_SEMANTIC_CACHE", "").strip().lower() in {"1", "true", "yes"}
+
+
+def embed_text(client: Any, text: str) -> np.ndarray:
+    """
+    摘要: 调用 OpenAI 兼容 embeddings 接口，返回 L2 归一化后的向量
+    Args:
+        client: OpenAI 兼容客户端
+        text: 待编码文本（仅取前 EMBED_INPUT_CHARS 个字符）
+    Returns:
+        float32 一维向量
+    """
+    resp = client.embeddings.create(model=EMBEDDING_MODEL, input=text[:EMBED_INPUT_CHARS])
+    vec = np.asarray(resp.data[0].embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm > 0 else vec
+
+
+class SemanticSummaryCache:
+    """按股票隔离的向量近似缓存（内积检索 + 最近使用淘汰）。"""
+
+    def __init__(self, root: Path, threshold: float = SIMILARITY_THRESHOLD, max_entries: int = MAX_ENTRIES) -> None:
+        self.root = root
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Dict[str, Any]] = []
+        self._load()
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.root / "embeddings.npy"
+
+    @property
+    def _entries_path(self) -> Path:
+        return self.root / "entries.json"
+
+    def _load(self) -> None:
+        if not (self._vectors_path.exists() and self._entries_path.exists()):
+            return
+        try:
+            vectors = np.load(self._vectors_path)
+            entries = json.loads(self._entries_path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if isinstance(entries, list) and len(entries) == len(vectors):
+            self._vectors = vectors.astype(np.float32, copy=False)
+            self._entries = entries
+
+    def lookup(self, symbol: str, vector: np.ndarray) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        摘要: 检索同一股票下最相似的已缓存摘要
+        Args:
+            symbol: 股票代码
+            vector: 归一化后的查询向量
+        Returns:
+            (相似度, 缓存摘要)；未达到阈值时返回 None
+        """
+        with self._lock:
+            if self._vectors is None or not self._entries or self._vectors.shape[1] != vector.shape[0]:
+                return None
+            scores = self._vectors @ vector
+            mask = np.fromiter((e.get("symbol") == symbol for e in self._entries), dtype=bool, count=len(self._entries))
+            if not mask.any():
+                return None
+            scores = np.where(mask, scores, -np.inf)
+            best = int(np.argmax(scores))
+            score = float(scores[best])
+            if score < self.threshold:
+                return None
+            entry = self._entries[best]
+            entry["last_used"] = time.time()
+            self._dirty = True
+            return score, entry["item"]
+
+    def insert(self, symbol: str, vector: np.ndarray, item: Dict[str, Any]) -> None:
+        """
+        摘要: 写入新的 (向量, 摘要)，超过容量时淘汰最久未使用的条目
+        Args:
+            symbol: 股票代码
+            vector: 归一化后的向量
+            item: 模型新生成的结构化摘要
+        Returns:
+            None
+        """
+        with self._lock:
+            row = vector.astype(np.float32, copy=False)[None, :]
+            if self._vectors is None or self._vectors.shape[1] != row.shape[1]:
+                self._vectors = row
+                self._entries = []
+            else:
+                self._vectors = np.vstack([self._vectors, row])
+            self._entries.append({"symbol": symbol, "item": item, "last_used": time.time()})
+            if len(self._entries) > self.max_entries:
+                keep = np.argsort([-e["last_used"] for e in self._entries], kind="stable")[: self.max_entries]
+                keep.sort()
+                self._vectors = self._vectors[keep]
+                self._entries = [self._entries[i] for i in keep]
+            self._dirty = True
+
+    def flush(self) -> None:
+        """把内存中的变更写回磁盘（无变更时跳过）。"""
+        with self._lock:
+            if not self._dirty or self._vectors is None:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_vectors = self._vectors_path.with_name("embeddings.tmp.npy")
+            tmp_entries = self._entries_path.with_name("entries.json.tmp")
+            np.save(tmp_vectors, self._vectors)
+            tmp_entries.write_text(json.dumps(self._entries, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_vectors, self._vectors_path)
+            os.replace(tmp_entries, self._entries_path)
+            self._dirty = False
+
+
+def get_semantic_cache() -> SemanticSummaryCache:
+    """返回进程内共享的语义缓存实例（懒加载）。"""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = SemanticSummaryCache(cache_dir() / "semantic")
+    return _CACHE
@@ -213,6 +213,7 @@ class CacheKind(str, Enum):
     BASIC_INFO = "basic_info_cache"
     DISCLOSURES = "disclosures"
     SHARE_INFO = "share_info"
+    LLM_RESPONSES = "llm_cache"
 
 
 @dataclass(frozen=True)
@@ -221,6 +222,7 @@ class CacheSpec:
     subdir: str
     description: str
     ttl_days: Optional[int] = None
+    # 每项可用 "|" 分隔多个候选文件名，任一存在即视为满足
     required_files: tuple[str, ...] = ()
     optional_files: tuple[str, ...] = ()
     per_stock: bool = True
@@ -275,7 +277,7 @@ BASE_REGISTRY: Dict[CacheKind, CacheSpec] = {
         description="上市公司公告 PDF/Markdown/索引缓存",
         ttl_days=1,
         required_files=(
-            "index.json",
+            "index.db|index.json",
             "cninfo_list.csv"
         ),
     ),
@@ -285,6 +287,13 @@ BASE_REGISTRY: Dict[CacheKind, CacheSpec] = {
         description="股本和流通股本数据 CSV 缓存",
         ttl_days=7,
     ),
+    CacheKind.LLM_RESPONSES: CacheSpec(
+        kind=CacheKind.LLM_RESPONSES,
+        subdir="llm_cache",
+        description="按 (模型, messages, prompt版本) 哈希缓存的大模型响应文本",
+        ttl_days=7,
+        per_stock=False,
+    ),
 }
 
 
@@ -426,7 +435,7 @@ def check_cache(cache_dir: Path, kind: CacheKind) -> CacheCheckResult:
     # 检查必需文件是否缺失
     missing: list[str] = []
     for rel in spec.required_files:
-        if not (cache_dir / rel).exists():
+        if not any((cache_dir / name).exists() for name in rel.split("|")):
             missing.append(rel)
 
     # 尝试从元数据文件加载最后更新时间